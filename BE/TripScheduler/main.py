@@ -4,6 +4,8 @@ import json
 
 from tripscheduler.cli.controller import execute_full_pipeline
 from tripscheduler.cli.utils import display_results
+from tripscheduler.combinations import MEAL_ASSIGNMENTS, CombinationReport, rank_results
+from tripscheduler.core.routing.profiles import PROFILES, DEFAULT_PROFILE
 from tests.utils.run_all_test_cases_in import run_all_test_cases_in
 
 def main():
@@ -24,6 +26,18 @@ def main():
         default="./tests/data/directions_raw_data.json",
         help="모의 raw 응답 파일"
     )
+    parser.add_argument(
+        "--profile",
+        choices=list(PROFILES),
+        default=DEFAULT_PROFILE,
+        help="solver 탐색 프로파일"
+    )
+    parser.add_argument(
+        "--meal-assignment",
+        choices=list(MEAL_ASSIGNMENTS),
+        default="enumerate",
+        help="식사 배정 방식 (enumerate: 조합별 풀이, model: 단일 모델)"
+    )
 
     # 폴더 전체 실행용 옵션 추가
     parser.add_argument(
@@ -52,22 +66,29 @@ def main():
         run_all_test_cases_in(
             folder_path=args.json_dir,
             use_mock=args.mock,
-            mock_raw_path=args.mock_raw
+            mock_raw_path=args.mock_raw,
+            profile=args.profile
         )
     else:
         # 개별 테스트 실행
+        report = CombinationReport()
         results, windows = execute_full_pipeline(
             json_path=args.json_path,
             use_mock=args.mock,
-            mock_raw_path=args.mock_raw
+            mock_raw_path=args.mock_raw,
+            profile=args.profile,
+            meal_assignment=args.meal_assignment,
+            report=report
         )
         display_results(results, windows)
+        logger.info("조합 집계: %s", report.counts())
 
-        # 첫 번째(혹은 유일한) 결과만 저장
-        first_value = next(iter(results.values()))
+        # objective가 가장 작은 결과만 저장
+        ranked = rank_results(results)
+        best = ranked[0][1] if ranked else {}
         data_to_save = {
-            'visits': first_value.get('visits', []),
-            'path':   first_value.get('path', [])
+            'visits': best.get('visits', []),
+            'path':   best.get('path', [])
         }
         with open("./tests/data/results.json", "w", encoding="utf-8") as f:
             json.dump(data_to_save, f, indent=4, ensure_ascii=False)
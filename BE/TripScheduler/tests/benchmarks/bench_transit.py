@@ -0,0 +1,107 @@
+"""
+transit 등록 방식별 탐색 속도 비교 (시나리오 전체)
+- callback: 기존 Python 클로저 (RegisterTransitCallback)
+- matrix:   정수 행렬 (register_transit → RegisterTransitMatrix)
+
+같은 시간 제한의 Guided Local Search에서 solver 분기(branch) 수를 초당 반복으로 비교한다.
+사용법: python -m tests.benchmarks.bench_transit [--dir tests/scenarios/base] [--time-limit 1]
+"""
+import os
+import time
+import logging
+import argparse
+
+from ortools.constraint_solver import routing_enums_pb2
+from tripscheduler.cli.utils import load_test_case, generate_valid_combinations, build_selection_inputs
+from tripscheduler.core.indexing.handlers import determine_start_end_indices
+from tripscheduler.core.preprocessing.timewindow import calculate_effective_time_windows
+from tripscheduler.core.preprocessing.restaurant import split_restaurant_nodes
+from tripscheduler.core.routing.components import (
+    create_routing_model,
+    register_transit,
+    add_disjunctions,
+    add_time_constraints,
+    get_default_search_parameters
+)
+from tripscheduler.core.routing.dummy import add_dummy_node, is_dummy_node
+from tripscheduler.scheduler import build_day_matrices
+from tripscheduler.utils.time import time_to_minutes
+
+def register_transit_callback(routing, mgr, matrix, service_times, places):
+    """변경 전 방식: 탐색 중 매 호출마다 Python으로 재진입"""
+    def transit_callback(i, j):
+        u = mgr.IndexToNode(i)
+        v = mgr.IndexToNode(j)
+        if is_dummy_node(places[u]['name']) or is_dummy_node(places[v]['name']):
+            return 0
+        return matrix[u][v] + service_times[u]
+    return routing.RegisterTransitCallback(transit_callback)
+
+def solve_once(register, places, windows, time_matrix, user, day_info, time_limit):
+    places, windows = list(places), list(windows)
+    start_idx, end_idx = determine_start_end_indices(places, day_info)
+    gs, ge = time_to_minutes(user["start_time"]), time_to_minutes(user["end_time"])
+    if start_idx is None:
+        start_idx = add_dummy_node(places, windows, "start", gs, ge)
+    if end_idx is None:
+        end_idx = add_dummy_node(places, windows, "end", gs, ge)
+    svc_times = [p.get("service_time", 0) for p in places]
+
+    mgr, routing = create_routing_model(len(places), start_idx, end_idx)
+    transit_cb = register(routing, mgr, time_matrix, svc_times, places)
+    add_disjunctions(routing, mgr, places, start_idx, end_idx)
+    add_time_constraints(routing, transit_cb, gs, ge, windows, mgr, start_idx, end_idx)
+
+    params = get_default_search_parameters(time_limit)
+    params.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+    started = time.perf_counter()
+    solution = routing.SolveWithParameters(params)
+    elapsed = time.perf_counter() - started
+    return routing.solver().Branches(), elapsed, solution.ObjectiveValue() if solution else None
+
+def iter_cases(folder):
+    for root, _, files in os.walk(folder):
+        for file in sorted(files):
+            if file.endswith(".json"):
+                yield os.path.join(root, file)
+
+def main():
+    parser = argparse.ArgumentParser(description="transit callback vs matrix 벤치마크")
+    parser.add_argument("--dir", default="./tests/scenarios/base")
+    parser.add_argument("--time-limit", type=int, default=1)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    modes = {"callback": register_transit_callback, "matrix": register_transit}
+    totals = {name: [0, 0.0] for name in modes}
+
+    print(f"{'case':<40} {'n':>3} " + " ".join(f"{name + ' it/s':>14}" for name in modes))
+    for path in iter_cases(args.dir):
+        data = load_test_case(path)
+        places, user, day_info = data["places"], data["user"], data["day_info"]
+        windows_map = calculate_effective_time_windows(places, user)
+        new_places, new_windows = split_restaurant_nodes(places, windows_map)
+        selections = generate_valid_combinations(new_places, new_windows)
+        if not selections:
+            continue
+        day_matrices = build_day_matrices(new_places, use_mock=True, windows=new_windows)
+        sel_places, sel_windows, _ = build_selection_inputs(new_places, new_windows, selections[0])
+        time_matrix, _, _ = day_matrices.slice(sel_places)
+
+        row = []
+        for name, register in modes.items():
+            branches, elapsed, _ = solve_once(
+                register, sel_places, sel_windows, time_matrix, user, day_info, args.time_limit
+            )
+            totals[name][0] += branches
+            totals[name][1] += elapsed
+            row.append(f"{branches / elapsed:>14.0f}")
+        print(f"{os.path.relpath(path, args.dir):<40} {len(sel_places):>3} " + " ".join(row))
+
+    rates = {name: b / t for name, (b, t) in totals.items() if t}
+    print(f"{'TOTAL':<44} " + " ".join(f"{rates[name]:>14.0f}" for name in modes))
+    if "callback" in rates and rates["callback"]:
+        print(f"speedup: {rates['matrix'] / rates['callback']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+from tripscheduler.api.cache import RouteCache, make_route_key
+from tripscheduler.api import directions
+from tests.utils.factory import make_fake_place
+
+def make_entry(ms: int):
+    return {"route": {"traoptimal": [{"summary": {"duration": ms}, "path": [[126.5, 33.2], [126.6, 33.3]]}]}}
+
+def test_route_key_rounds_coordinates():
+    assert make_route_key("126.1234561,33.1", "126.2,33.2") == make_route_key("126.1234558,33.1", "126.2,33.2")
+
+def test_cache_hit_and_miss(tmp_path):
+    cache = RouteCache(str(tmp_path / "routes.db"))
+    assert cache.get("126.1,33.1", "126.2,33.2") is None
+    cache.put("126.1,33.1", "126.2,33.2", make_entry(600000))
+    assert cache.get("126.1,33.1", "126.2,33.2") == make_entry(600000)
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+def test_cache_skips_empty_entries(tmp_path):
+    cache = RouteCache(str(tmp_path / "routes.db"))
+    cache.put("126.1,33.1", "126.2,33.2", {})
+    assert len(cache) == 0
+
+def test_cache_ttl_expiry(tmp_path):
+    now = [1000.0]
+    cache = RouteCache(str(tmp_path / "routes.db"), ttl_sec=60, clock=lambda: now[0])
+    cache.put("126.1,33.1", "126.2,33.2", make_entry(600000))
+    now[0] += 61
+    assert cache.get("126.1,33.1", "126.2,33.2") is None
+    assert len(cache) == 0
+
+def test_cache_size_cap_evicts_oldest(tmp_path):
+    now = [0.0]
+    cache = RouteCache(str(tmp_path / "routes.db"), max_entries=2, clock=lambda: now[0])
+    for k in range(3):
+        now[0] += 1
+        cache.put(f"126.{k},33.1", "126.9,33.9", make_entry(60000 * k))
+    assert len(cache) == 2
+    assert cache.get("126.0,33.1", "126.9,33.9") is None
+
+def test_create_matrices_uses_cache(tmp_path, monkeypatch):
+    calls = []
+    def fake_fetch(start, goal, headers, timeout=5, session=None):
+        calls.append((start, goal))
+        return make_entry(600000)
+    monkeypatch.setattr(directions, "fetch_route", fake_fetch)
+
+    places = [make_fake_place(i, "landmark") for i in range(3)]
+    cache = RouteCache(str(tmp_path / "routes.db"))
+
+    cold, _, _ = directions.create_matrices(places, "id", "key", route_cache=cache)
+    warm, _, _ = directions.create_matrices(places, "id", "key", route_cache=cache)
+
+    assert len(calls) == 3
+    assert cold == warm
+    assert cache.hits == 3
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from tripscheduler.api import directions
+from tripscheduler.api.catalogue import CatalogueMatrix, build_catalogue_matrix
+from tripscheduler.api.prepare import prepare_matrices
+from tests.utils.factory import make_fake_place
+
+def route_entry(minutes):
+    return {"route": {"traoptimal": [{"summary": {"duration": minutes * 60000},
+                                      "path": [[126.5, 33.2], [126.6, 33.3]]}]}}
+
+def place_at(id_, x, y):
+    p = make_fake_place(id_, "landmark")
+    p["x_cord"], p["y_cord"] = x, y
+    return p
+
+@pytest.fixture
+def catalogue_places():
+    # 0~3은 서로 가깝고, 4는 100km 이상 떨어져 있다
+    coords = [(126.50, 33.25), (126.52, 33.26), (126.55, 33.30), (126.60, 33.35), (127.70, 33.30)]
+    return [place_at(k, x, y) for k, (x, y) in enumerate(coords)]
+
+@pytest.fixture
+def counted_fetch(monkeypatch):
+    calls = []
+    def fake_fetch(start, goal, headers, timeout=5, session=None):
+        calls.append((start, goal))
+        return route_entry(7)
+    monkeypatch.setattr(directions, "fetch_route", fake_fetch)
+    return calls
+
+def test_build_catalogue_only_plausible_pairs(tmp_path, catalogue_places, counted_fetch):
+    out = str(tmp_path / "catalogue.npz")
+    stored = build_catalogue_matrix(catalogue_places, out, "id", "key", max_km=30, block_size=2)
+
+    assert stored == 2 * 6            # 가까운 4개 장소의 6쌍 × 양방향
+    assert len(counted_fetch) == 6
+    catalogue = CatalogueMatrix.load(out)
+    assert catalogue.keys[4] == "landmark:4"
+    assert catalogue.matrices(catalogue_places[:4]) is not None
+    assert catalogue.matrices(catalogue_places) is None
+
+def test_prepare_matrices_uses_catalogue(tmp_path, catalogue_places, counted_fetch):
+    out = str(tmp_path / "catalogue.npz")
+    build_catalogue_matrix(catalogue_places, out, "id", "key", max_km=30)
+    counted_fetch.clear()
+
+    known = [catalogue_places[2], catalogue_places[0], catalogue_places[3]]
+    time_matrix, _, path_matrix = prepare_matrices(known, "id", "key", catalogue_path=out)
+    assert counted_fetch == []
+    assert time_matrix[0][1] == time_matrix[1][0] == 7
+    assert path_matrix[0][1].dtype == np.float32
+
+    # 카탈로그에 없는 쌍만 온라인 조회
+    report = directions.MatrixBuildReport()
+    prepare_matrices(catalogue_places[:2] + catalogue_places[4:], "id", "key", catalogue_path=out, report=report)
+    assert len(counted_fetch) == 2
+    assert report.counts() == {directions.OUTCOME_CATALOGUE: 1, directions.OUTCOME_FETCHED: 2}
+
+def test_split_meal_nodes_and_exported_categories_hit_catalogue(tmp_path, counted_fetch):
+    from tripscheduler.core.preprocessing.restaurant import split_restaurant_nodes
+
+    # 내보내기 형식(hotel/tour/restaurant 테이블 구분)으로 배치 생성
+    exported = [
+        {"category": "hotel", "id": 1, "x_cord": 126.50, "y_cord": 33.25},
+        {"category": "tour", "id": 2, "x_cord": 126.52, "y_cord": 33.26},
+        {"category": "restaurant", "id": 3, "x_cord": 126.55, "y_cord": 33.30},
+    ]
+    out = str(tmp_path / "catalogue.npz")
+    build_catalogue_matrix(exported, out, "id", "key", max_km=30)
+    counted_fetch.clear()
+
+    hotel = dict(make_fake_place(1, "accommodation"), x_cord=126.50, y_cord=33.25)
+    tour = dict(make_fake_place(2, "landmark"), x_cord=126.52, y_cord=33.26)
+    rest = dict(make_fake_place(3, "restaurant"), x_cord=126.55, y_cord=33.30)
+    windows = {1: [(480, 1260, None)], 2: [(540, 1080, None)], 3: [(690, 780, "lunch"), (1050, 1140, "dinner")]}
+    places, _ = split_restaurant_nodes([hotel, tour, rest], windows)
+    assert [p["id"] for p in places][2:] == ["3_lunch", "3_dinner"]
+
+    report = directions.MatrixBuildReport()
+    prepare_matrices(places, "id", "key", catalogue_path=out, report=report)
+    assert counted_fetch == []
+    assert report.counts().get(directions.OUTCOME_FETCHED, 0) == 0
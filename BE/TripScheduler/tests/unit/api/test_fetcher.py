@@ -0,0 +1,127 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from tripscheduler.api import directions
+from tripscheduler.api.fetcher import TokenBucket, fetch_concurrently
+from tests.utils.factory import make_fake_place
+
+LATENCY_SEC = 0.2
+
+class SlowDirectionsHandler(BaseHTTPRequestHandler):
+    """지연을 주입한 Directions API 대역 서버"""
+
+    def do_GET(self):
+        time.sleep(LATENCY_SEC)
+        body = json.dumps({
+            "route": {"traoptimal": [{"summary": {"duration": 600000}, "path": [[126.5, 33.2]]}]}
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class DirectionsServer(ThreadingHTTPServer):
+    request_queue_size = 64
+
+@pytest.fixture
+def directions_server(monkeypatch):
+    server = DirectionsServer(("127.0.0.1", 0), SlowDirectionsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(directions, "DIRECTIONS_URL", f"http://127.0.0.1:{server.server_port}/driving")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_token_bucket_limits_rate():
+    now = [0.0]
+    def sleep(sec):
+        now[0] += sec
+    bucket = TokenBucket(5, capacity=1, clock=lambda: now[0], sleep=sleep)
+    for _ in range(6):
+        bucket.acquire()
+    assert now[0] == pytest.approx(1.0)
+
+def test_fetch_concurrently_keeps_order():
+    pairs = [(str(k), str(k + 1)) for k in range(10)]
+    results = fetch_concurrently(pairs, lambda s, g: {"s": s, "g": g}, max_workers=4)
+    assert [r["s"] for r in results] == [p[0] for p in pairs]
+
+def test_on_complete_runs_after_in_flight_calls_finish():
+    in_flight = []
+    lock = threading.Lock()
+    closed = threading.Event()
+    seen_in_flight = []
+
+    def slow(start, goal):
+        with lock:
+            in_flight.append(start)
+        time.sleep(0.3)
+        with lock:
+            in_flight.remove(start)
+        return {"s": start}
+
+    def on_complete():
+        with lock:
+            seen_in_flight.append(len(in_flight))
+        closed.set()
+
+    started = time.monotonic()
+    results = fetch_concurrently(
+        [("a", "b"), ("c", "d")], slow, max_workers=2,
+        deadline=started + 0.05, on_complete=on_complete
+    )
+    assert results == [None, None]
+    # 마감으로 먼저 반환하지만 Session 정리는 진행 중인 호출이 끝난 뒤
+    assert not closed.is_set()
+    assert closed.wait(timeout=5)
+    assert seen_in_flight == [0]
+
+def test_create_matrices_concurrent_against_local_server(directions_server):
+    places = [make_fake_place(i, "landmark") for i in range(5)]  # 10쌍
+
+    started = time.monotonic()
+    dur, _, _ = directions.create_matrices(places, "id", "key", max_workers=10, rate_per_sec=100)
+    elapsed = time.monotonic() - started
+
+    assert all(dur[i][j] == 10 for i in range(5) for j in range(5) if i != j)
+    assert elapsed < 10 * LATENCY_SEC / 2
+
+def test_create_matrices_respects_latency_budget(directions_server):
+    places = [make_fake_place(i, "landmark") for i in range(5)]  # 10쌍
+    report = directions.MatrixBuildReport()
+
+    started = time.monotonic()
+    dur, raw, path = directions.create_matrices(
+        places, "id", "key", max_workers=2, rate_per_sec=100,
+        latency_budget_sec=0.3, report=report
+    )
+    elapsed = time.monotonic() - started
+
+    counts = report.counts()
+    assert elapsed < 0.3 + LATENCY_SEC
+    assert counts.get(directions.OUTCOME_FETCHED, 0) >= 2
+    assert counts.get(directions.OUTCOME_TIMEOUT, 0) >= 1
+    assert sum(counts.values()) == 10
+    for i, j in report.estimated_pairs:
+        assert raw[i][j]["estimated"] is True
+        assert dur[i][j] == dur[j][i] > 0
+        assert len(path[i][j]) == 2
+
+def test_create_matrices_estimates_failed_pairs(monkeypatch):
+    monkeypatch.setattr(directions, "fetch_route", lambda *args, **kwargs: {})
+    places = [make_fake_place(i, "landmark") for i in range(3)]
+    report = directions.MatrixBuildReport()
+
+    dur, raw, _ = directions.create_matrices(places, "id", "key", report=report)
+
+    assert report.counts() == {directions.OUTCOME_FAILED: 3}
+    assert all(dur[i][j] > 0 for i in range(3) for j in range(3) if i != j)
+    assert raw[0][1]["outcome"] == directions.OUTCOME_FAILED
@@ -0,0 +1,49 @@
+import json
+import numpy as np
+from tripscheduler.api.directions import create_matrices
+from tripscheduler.api.fixture import LazyPathMatrix, convert_raw_fixture, is_matrix_fixture, load_matrix_fixture
+from tripscheduler.api.prepare import prepare_matrices
+
+RAW_PATH = "tests/data/directions_raw_data.json"
+TC_PATH = "tests/data/tc.json"
+
+def load_places():
+    with open(TC_PATH, encoding="utf-8") as f:
+        return json.load(f)["places"]
+
+def test_fixture_matches_json_mock(tmp_path):
+    out_dir = str(tmp_path / "directions.matrix")
+    convert_raw_fixture(RAW_PATH, out_dir)
+    assert is_matrix_fixture(out_dir)
+    assert not is_matrix_fixture(RAW_PATH)
+
+    places = load_places()
+    with open(RAW_PATH, encoding="utf-8") as f:
+        expected_time, _, expected_path = create_matrices(
+            places, None, None, is_mock_enabled=True, mock_api_response=json.load(f)
+        )
+
+    time_matrix, _, path_matrix = prepare_matrices(places, None, None, use_mock=True, mock_raw_path=out_dir)
+
+    assert time_matrix == expected_time
+    for i in range(len(places)):
+        for j in range(len(places)):
+            if expected_path[i][j] is None:
+                assert path_matrix[i][j] is None
+            else:
+                assert np.array_equal(path_matrix[i][j], expected_path[i][j])
+
+def test_fixture_is_memory_mapped_and_cached(tmp_path):
+    out_dir = str(tmp_path / "directions.matrix")
+    convert_raw_fixture(RAW_PATH, out_dir)
+
+    fixture = load_matrix_fixture(out_dir)
+    assert isinstance(fixture.points, np.memmap)
+    assert load_matrix_fixture(out_dir) is fixture
+
+def test_lazy_path_rows_stop_at_n():
+    class Source:
+        def path(self, i, j):
+            return None
+
+    assert [list(row) for row in LazyPathMatrix(Source(), 2)] == [[None, None], [None, None]]
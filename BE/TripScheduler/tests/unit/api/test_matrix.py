@@ -0,0 +1,100 @@
+import tripscheduler.api.matrix as matrix_mod
+from tripscheduler.api import directions
+from tripscheduler.api.matrix import prepare_day_matrices, node_key
+from tripscheduler.core.preprocessing.restaurant import split_restaurant_nodes
+from tests.utils.factory import make_fake_place
+
+def make_split_places():
+    places = [
+        make_fake_place("a", "accommodation"),
+        make_fake_place("r", "restaurant"),
+        make_fake_place("l", "landmark"),
+    ]
+    wins = {
+        "a": [(480, 1260, None)],
+        "r": [(690, 780, "lunch"), (1050, 1140, "dinner")],
+        "l": [(540, 1080, None)],
+    }
+    return split_restaurant_nodes(places, wins)[0]
+
+def test_split_nodes_share_one_row():
+    new_places = make_split_places()
+    day = prepare_day_matrices(new_places, None, None, use_mock=True)
+
+    assert day.keys == ["accommodation:a", "restaurant:r", "landmark:l"]
+    assert len(day.time_matrix) == 3
+    assert day.rows_for(new_places) == [0, 1, 1, 2]
+
+def test_slice_matches_selected_nodes():
+    new_places = make_split_places()
+    day = prepare_day_matrices(new_places, None, None, use_mock=True)
+
+    sel = [new_places[0], new_places[2], new_places[3]]  # 숙소, 저녁, 관광지
+    time_matrix, raw, path_matrix = day.slice(sel)
+
+    assert [node_key(p) for p in sel] == ["accommodation:a", "restaurant:r", "landmark:l"]
+    assert time_matrix == day.time_matrix
+    assert len(raw) == len(path_matrix) == 3
+
+def test_same_id_in_different_categories_gets_own_row():
+    hotel, restaurant = make_fake_place("1", "accommodation"), make_fake_place("1", "restaurant")
+    tour = dict(make_fake_place("2", "landmark"), category="tour")
+    day = prepare_day_matrices([hotel, restaurant, tour], None, None, use_mock=True)
+
+    assert day.keys == ["accommodation:1", "restaurant:1", "landmark:2"]
+    assert day.time_matrix[0][1] > 0
+    assert day.time_matrix[0] != day.time_matrix[1]
+
+def test_colocated_places_share_one_row():
+    new_places = make_split_places()
+    twin = dict(make_fake_place("l2", "landmark"), x_cord=new_places[3]["x_cord"], y_cord=new_places[3]["y_cord"])
+    places = new_places + [twin]
+    day = prepare_day_matrices(places, None, None, use_mock=True)
+
+    assert day.keys == ["accommodation:a", "restaurant:r", "landmark:l"]
+    assert day.aliases == {"landmark:l2": "landmark:l"}
+    assert day.rows_for(places) == [0, 1, 1, 2, 2]
+    time_matrix, _, _ = day.slice([places[0], places[3], places[4]])
+    assert time_matrix[1][2] == 0 and time_matrix[0][2] == time_matrix[0][1]
+
+    sub = day.subset([places[0], places[4]])
+    assert sub.keys == ["accommodation:a", "landmark:l"] and sub.rows_for([places[4]]) == [1]
+
+def test_known_pairs_are_merged_from_several_previous(monkeypatch):
+    a, b, c, d = (make_fake_place(k, "landmark") for k in "abcd")
+    left = prepare_day_matrices([a, b], None, None, use_mock=True)
+    right = prepare_day_matrices([c, d], None, None, use_mock=True)
+
+    # 한 매트릭스에 모든 장소가 있으면 그 매트릭스에서 잘라 쓴다
+    assert prepare_day_matrices([b, a], None, None, use_mock=True, previous=[right, left]).keys == ["landmark:b", "landmark:a"]
+
+    calls = []
+    original = matrix_mod.prepare_matrices
+
+    def spy(places, *args, known_pairs=None, **kwargs):
+        calls.append(known_pairs)
+        return original(places, *args, known_pairs=known_pairs, **kwargs)
+
+    monkeypatch.setattr(matrix_mod, "prepare_matrices", spy)
+    prepare_day_matrices([a, b, c, d], None, None, use_mock=True, previous=[left, right])
+    assert set(calls[0]) == {(0, 1), (2, 3)}
+
+def test_skipped_pairs_are_recomputed_after_windows_widen(monkeypatch):
+    route = {"route": {"traoptimal": [{"summary": {"duration": 7 * 60000}, "path": [[126.5, 33.2], [126.6, 33.3]]}]}}
+    monkeypatch.setattr(directions, "fetch_route", lambda *args, **kwargs: route)
+    a = dict(make_fake_place("a", "landmark"), x_cord=126.50, y_cord=33.25)
+    b = dict(make_fake_place("b", "landmark"), x_cord=126.52, y_cord=33.26)
+
+    # 둘 다 08:00~08:20에만 방문 가능: 서로 인접할 수 없어 조회 생략
+    narrow = prepare_day_matrices([a, b], "id", "key", windows=[(480, 500, None), (480, 500, None)])
+    assert narrow.time_matrix == [[0, 10000], [10000, 0]]
+
+    widened = prepare_day_matrices([a, b], "id", "key", windows=[(480, 500, None), (480, 900, None)], previous=narrow)
+    assert widened.time_matrix == [[0, 7], [7, 0]]
+    assert widened.report.counts() == {directions.OUTCOME_FETCHED: 1}
+
+    # 실제로 조회한 쌍은 그대로 재사용하고, subset의 report도 새 인덱스를 따른다
+    c = dict(make_fake_place("c", "landmark"), x_cord=126.55, y_cord=33.30)
+    added = prepare_day_matrices([c, a, b], "id", "key", previous=widened)
+    assert added.report.counts() == {directions.OUTCOME_CATALOGUE: 1, directions.OUTCOME_FETCHED: 2}
+    assert widened.subset([b, a]).report.counts() == {directions.OUTCOME_FETCHED: 1}
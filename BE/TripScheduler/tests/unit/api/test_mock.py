@@ -0,0 +1,31 @@
+import json
+import pytest
+from tripscheduler.api.mock import (
+    DEFAULT_ROAD_TIME_MODEL, create_distance_matrix, fit_road_time_model,
+    haversine_km, haversine_matrix_km
+)
+from tests.utils.factory import make_fake_place
+
+def test_haversine_matrix_matches_scalar():
+    lats, lons = [33.25, 33.50, 33.30], [126.56, 126.49, 126.90]
+    mat = haversine_matrix_km(lats, lons)
+    assert mat.shape == (3, 3)
+    assert mat[0, 2] == pytest.approx(haversine_km(lats[0], lons[0], lats[2], lons[2]))
+    assert mat[1, 1] == 0
+
+def test_create_distance_matrix_symmetric_with_zero_diagonal():
+    places = [make_fake_place(i, "landmark") for i in range(4)]
+    mat = create_distance_matrix(places)
+    assert all(mat[i][i] == 0 for i in range(4))
+    assert all(mat[i][j] == mat[j][i] for i in range(4) for j in range(4))
+    assert isinstance(mat[0][1], int)
+
+def test_fit_road_time_model_from_stored_responses():
+    with open("tests/data/directions_raw_data.json", encoding="utf-8") as f:
+        model = fit_road_time_model(json.load(f))
+    assert model.intercept == pytest.approx(DEFAULT_ROAD_TIME_MODEL.intercept, abs=0.01)
+    assert model.slope == pytest.approx(DEFAULT_ROAD_TIME_MODEL.slope, abs=0.01)
+
+def test_fit_road_time_model_requires_samples():
+    with pytest.raises(ValueError):
+        fit_road_time_model([[None, {}]])
@@ -0,0 +1,51 @@
+from tripscheduler.api import directions
+from tripscheduler.api.pruning import UNREACHABLE_MINUTES, find_unusable_pairs
+from tests.utils.factory import make_fake_place
+
+def place_at(id_, category, x, y):
+    p = make_fake_place(id_, category)
+    p["x_cord"], p["y_cord"] = x, y
+    return p
+
+def test_window_bridging_between_restaurants():
+    places = [
+        place_at("b", "restaurant", 126.50, 33.50),
+        place_at("d", "restaurant", 126.90, 33.30),
+        place_at("l", "landmark", 126.60, 33.40),
+    ]
+    windows = [
+        [(450, 570, "breakfast")],
+        [(1050, 1170, "dinner")],
+        [(540, 1080, None)],
+    ]
+    # 아침 식당에서 저녁 식당까지는 충분히 이어질 수 있음
+    assert find_unusable_pairs(places, windows) == set()
+
+    # 같은 시간대에 닫히는 먼 두 식당은 어느 방향으로도 이어질 수 없음
+    windows[0] = [(600, 620, "brunch")]
+    windows[1] = [(600, 620, "lunch")]
+    assert (0, 1) in find_unusable_pairs(places, windows)
+
+def test_same_meal_restaurants_are_unusable():
+    places = [place_at("r1", "restaurant", 126.5, 33.5), place_at("r2", "restaurant", 126.5, 33.5)]
+    windows = [[(690, 780, "lunch")], [(690, 780, "lunch")]]
+    assert find_unusable_pairs(places, windows) == {(0, 1)}
+
+def test_anchor_windows_are_ignored():
+    places = [place_at("h", "accommodation", 126.5, 33.5), place_at("l", "landmark", 126.5, 33.5)]
+    windows = [[(900, 1260, None)], [(480, 540, None)]]
+    assert find_unusable_pairs(places, windows) == set()
+
+def test_create_matrices_skips_pairs(monkeypatch):
+    calls = []
+    def fake_fetch(start, goal, headers, timeout=5, session=None):
+        calls.append((start, goal))
+        return {"route": {"traoptimal": [{"summary": {"duration": 600000}, "path": []}]}}
+    monkeypatch.setattr(directions, "fetch_route", fake_fetch)
+
+    places = [make_fake_place(i, "landmark") for i in range(3)]
+    dur, _, _ = directions.create_matrices(places, "id", "key", skip_pairs={(0, 2)})
+
+    assert len(calls) == 2
+    assert dur[0][2] == dur[2][0] == UNREACHABLE_MINUTES
+    assert dur[0][1] == 10
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from tripscheduler.api.prepare import prepare_matrices
+from tripscheduler.api.pruning import UNREACHABLE_MINUTES
+from tripscheduler.api.roadnet import RoadGraph, dijkstra_to_targets, preprocess_road_graph, save_road_graph
+from tests.utils.factory import make_fake_place
+
+def make_line_graph(path):
+    """0 — 1 — 2 — 3 직선 도로 (각 구간 5분), 3→4는 일방통행"""
+    lons = [126.50, 126.51, 126.52, 126.53, 126.54]
+    lats = [33.25] * 5
+    edges = [(0, 1, 300, False), (1, 2, 300, False), (2, 3, 300, False), (3, 4, 300, True)]
+    save_road_graph(path, lons, lats, edges)
+    return lons, lats
+
+def place_at(id_, x, y):
+    p = make_fake_place(id_, "landmark")
+    p["x_cord"], p["y_cord"] = x, y
+    return p
+
+def test_dijkstra_to_targets_and_oneway(tmp_path):
+    path = str(tmp_path / "jeju.npz")
+    make_line_graph(path)
+    graph = RoadGraph.load(path)
+
+    settled, pred = dijkstra_to_targets(graph, 0, {3, 4})
+    assert settled[3] == pytest.approx(900)
+    assert settled[4] == pytest.approx(1200)
+
+    settled, _ = dijkstra_to_targets(graph, 4, {0})
+    assert 0 not in settled
+
+def test_prepare_matrices_with_road_graph(tmp_path):
+    path = str(tmp_path / "jeju.npz")
+    lons, lats = make_line_graph(path)
+    places = [place_at("a", lons[0], lats[0]), place_at("b", lons[3], lats[3]), place_at("c", lons[4], lats[4])]
+
+    time_matrix, raw, path_matrix = prepare_matrices(places, None, None, road_graph_path=path)
+
+    assert time_matrix[0][1] == time_matrix[1][0] == 15
+    assert time_matrix[0][2] == 20
+    assert time_matrix[2][0] == UNREACHABLE_MINUTES
+    assert path_matrix[0][1].dtype == np.float32
+    assert len(path_matrix[0][1]) == 4
+    assert raw[0][1] is None
+
+def test_contraction_hierarchy_matches_dijkstra(tmp_path):
+    rng = np.random.default_rng(3)
+    side = 6
+    lons = [126.5 + 0.01 * (k % side) for k in range(side * side)]
+    lats = [33.3 + 0.01 * (k // side) for k in range(side * side)]
+    edges = []
+    for k in range(side * side):
+        if k % side < side - 1:
+            edges.append((k, k + 1, float(rng.integers(60, 300)), bool(rng.random() < 0.2)))
+        if k // side < side - 1:
+            edges.append((k, k + side, float(rng.integers(60, 300)), False))
+    raw_path, ch_path = str(tmp_path / "grid.npz"), str(tmp_path / "grid.ch.npz")
+    save_road_graph(raw_path, lons, lats, edges)
+    preprocess_road_graph(raw_path, ch_path)
+
+    plain, ch = RoadGraph.load(raw_path), RoadGraph.load(ch_path)
+    nodes = list(range(0, side * side, 5))
+    q_plain, q_ch = plain.many_to_many(nodes, nodes), ch.many_to_many(nodes, nodes)
+
+    assert np.allclose(q_plain.seconds, q_ch.seconds)
+    for si in range(len(nodes)):
+        for ti in range(len(nodes)):
+            chain = q_ch.node_chain(si, ti)
+            if chain is None:
+                continue
+            cost = sum(w for a, b in zip(chain, chain[1:]) for v, w in plain.adjacency()[a] if v == b)
+            assert chain[0] == nodes[si] and chain[-1] == nodes[ti]
+            assert cost == pytest.approx(q_plain.seconds[si, ti])
@@ -0,0 +1,35 @@
+import pytest
+from tripscheduler.core.preprocessing.closed_days import filter_closed_places, day_keys, open_days
+from tests.utils.factory import make_fake_place, make_fake_day_info
+
+def closed(id_, days, mandatory=False):
+    place = make_fake_place(id_, "landmark", name=f"장소{id_}", is_mandatory=mandatory)
+    place["휴무일"] = days
+    return place
+
+def test_day_keys_from_weekday_or_date():
+    assert day_keys(make_fake_day_info()) == {"목요일", "2025-04-10"}
+    assert day_keys({"date": "2025-04-14"}) == {"월요일", "2025-04-14"}
+
+def test_optional_closed_place_is_dropped():
+    places = [closed(1, []), closed(2, ["목"]), closed(3, ["2025-04-10"]), closed(4, ["월요일"])]
+    kept, dropped = filter_closed_places(places, make_fake_day_info())
+    assert [p["id"] for p in kept] == [1, 4]
+    assert dropped == ["장소2", "장소3"]
+
+def test_mandatory_closed_place_raises_with_name_and_day():
+    places = [closed(1, ["목요일"], mandatory=True)]
+    with pytest.raises(ValueError, match=r"장소1\(목요일\)"):
+        filter_closed_places(places, make_fake_day_info())
+
+def test_closed_days_alias_field():
+    place = make_fake_place(1, "landmark")
+    del place["휴무일"]
+    place["closed_days"] = ["목요일"]
+    assert filter_closed_places([place], make_fake_day_info()) == ([], [place["name"]])
+
+def test_open_days_across_trip():
+    days = [{"weekday": "목요일"}, {"weekday": "금요일"}]
+    assert open_days(closed(1, []), days) is None
+    assert open_days(closed(1, ["목요일"]), days) == [1]
+    assert open_days(closed(1, ["목", "금"]), days) == []
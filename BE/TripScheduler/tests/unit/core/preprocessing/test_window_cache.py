@@ -0,0 +1,43 @@
+from tripscheduler.core.preprocessing.window_cache import (
+    PlaceWindowCache,
+    compile_place_window,
+    overlapping_breaks,
+    intersect_meals
+)
+from tests.utils.factory import make_fake_place
+
+def test_compile_adjusts_midnight_and_breaks():
+    place = make_fake_place("p1", "restaurant", open_time="22:00", close_time="02:00", break_time=["23:30", "00:30"])
+    compiled = compile_place_window(place)
+    assert (compiled.open, compiled.close) == (1320, 1560)
+    assert compiled.breaks.tolist() == [[1410, 1470]]
+
+def test_compile_skips_unparsable_break():
+    place = make_fake_place("p1", "landmark", break_time=["12:00", "bad", "15:00", "15:30"])
+    assert compile_place_window(place).breaks.tolist() == [[900, 930]]
+
+def test_cache_reuses_and_recompiles_on_change():
+    cache = PlaceWindowCache()
+    place = make_fake_place("p1", "landmark", open_time="09:00", close_time="18:00")
+    first = cache.get(place)
+    assert cache.get(dict(place)) is first
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    changed = cache.get({**place, "close_time": "17:00"})
+    assert changed.close == 1020
+    assert len(cache) == 1
+
+def test_cache_evicts_least_recent():
+    cache = PlaceWindowCache(max_entries=2)
+    cache.precompile([make_fake_place(f"p{i}", "landmark") for i in range(3)])
+    assert len(cache) == 2
+
+def test_overlapping_breaks_clips_to_window():
+    compiled = compile_place_window(make_fake_place("p1", "landmark", break_time=["07:00", "09:00", "12:00", "13:00"]))
+    assert overlapping_breaks(480, 1080, compiled.breaks) == [(480, 540), (720, 780)]
+
+def test_intersect_meals_keeps_segment_then_meal_order():
+    meals = {"dinner": (1050, 1140), "lunch": (690, 780)}
+    windows = intersect_meals([(660, 720), (1020, 1200)], meals)
+    assert windows == [(690, 720, "lunch"), (1050, 1140, "dinner")]
+    assert intersect_meals([(800, 900)], meals) == []
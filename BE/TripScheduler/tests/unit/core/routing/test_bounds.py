@@ -0,0 +1,51 @@
+import pytest
+from tripscheduler.api.pruning import UNREACHABLE_MINUTES
+from tripscheduler.core.routing.bounds import (
+    INFEASIBLE, combination_lower_bound, minimum_spanning_weight, shortest_transit
+)
+
+def node(name, category="landmark", service_time=0, **extra):
+    return {"id": name, "name": name, "category": category, "service_time": service_time, **extra}
+
+def test_shortest_transit_routes_around_pruned_pair():
+    matrix = [
+        [0, UNREACHABLE_MINUTES, 10],
+        [UNREACHABLE_MINUTES, 0, 10],
+        [10, 10, 0],
+    ]
+    dist = shortest_transit(matrix, [0, 0, 5])
+    # 0 → 2 → 1: 이동 10 + 2번 서비스 5 + 이동 10
+    assert dist[0, 1] == 25
+
+def test_minimum_spanning_weight():
+    matrix = [[0, 1, 5], [1, 0, 2], [5, 2, 0]]
+    assert minimum_spanning_weight(shortest_transit(matrix, [0, 0, 0]), [0, 1, 2]) == 3
+    assert minimum_spanning_weight(shortest_transit(matrix, [0, 0, 0]), [2]) == 0
+
+def test_unreachable_optional_adds_penalty_and_mandatory_is_infeasible():
+    places = [node("start"), node("far", is_mandatory=False), node("end")]
+    windows = [(0, 600, None), (0, 30, None), (0, 600, None)]
+    matrix = [[0, 100, 10], [100, 0, 100], [10, 100, 0]]
+    # 출발 후 100분 뒤 도착 → 윈도우(30+10) 밖
+    assert combination_lower_bound(places, windows, matrix, 0, 2, 0, 600) == 1000
+
+    places[1]["is_mandatory"] = True
+    assert combination_lower_bound(places, windows, matrix, 0, 2, 0, 600) == INFEASIBLE
+
+def test_mandatory_nodes_exceeding_day_are_infeasible():
+    places = [node("a", service_time=120), node("b", service_time=120), node("c", service_time=120)]
+    windows = [(0, 600, None)] * 3
+    matrix = [[0, 60, 60], [60, 0, 60], [60, 60, 0]]
+    # 더미 시작/종료: 서비스 360 + 최소 이동 120 = 480
+    assert combination_lower_bound(places, windows, matrix, None, None, 0, 600) == 0
+    assert combination_lower_bound(places, windows, matrix, None, None, 0, 400) == INFEASIBLE
+
+def test_unreachable_meal_group_counts_once():
+    places = [
+        node("start"),
+        node("r1 (lunch)", "restaurant", id="r1_lunch", org_id="r1", is_mandatory=False),
+        node("end"),
+    ]
+    windows = [(0, 600, None), (0, 10, "lunch"), (0, 600, None)]
+    matrix = [[0, 100, 0], [100, 0, 100], [0, 100, 0]]
+    assert combination_lower_bound(places, windows, matrix, 0, 2, 0, 600) == pytest.approx(1000)
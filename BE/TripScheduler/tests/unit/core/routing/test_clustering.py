@@ -0,0 +1,21 @@
+import numpy as np
+
+from tripscheduler.core.routing.clustering import kmeans, place_features
+
+def test_kmeans_separates_distant_groups_deterministically():
+    rng = np.random.default_rng(0)
+    features = np.vstack([rng.normal(0, 1, (10, 3)), rng.normal(50, 1, (10, 3))])
+    labels = kmeans(features, 2)
+    assert len(set(labels[:10])) == 1 and len(set(labels[10:])) == 1
+    assert labels[0] != labels[10]
+    assert np.array_equal(labels, kmeans(features, 2))
+
+def test_kmeans_caps_cluster_count_at_point_count():
+    assert set(kmeans(np.zeros((3, 3)), 10)) <= {0, 1, 2}
+
+def test_place_features_scale_time_window_midpoint():
+    places = [{"x_cord": 126.5, "y_cord": 33.4}, {"x_cord": 126.5, "y_cord": 33.4}]
+    windows = [(540, 600, None), (0, 1440, None)]
+    features = place_features(places, windows, 480, 1200, km_per_minute=1.0)
+    assert features[0, 0] == features[1, 0]
+    assert features[0, 2] == 570 and features[1, 2] == 840
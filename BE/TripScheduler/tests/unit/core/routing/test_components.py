@@ -0,0 +1,24 @@
+from tripscheduler.core.routing.components import build_transit_matrix, create_routing_model, register_transit
+from tripscheduler.core.routing.dummy import add_dummy_node
+
+def test_build_transit_matrix_adds_service_and_zeroes_dummies():
+    places = [{"name": "A"}, {"name": "B"}]
+    wins = [(0, 100, None), (0, 100, None)]
+    matrix = [[0, 5], [7, 0]]
+    add_dummy_node(places, wins, "start", 0, 100)
+
+    transit = build_transit_matrix(matrix, [30, 10, 0], places)
+
+    assert transit == [[30, 35, 0], [17, 10, 0], [0, 0, 0]]
+
+def test_register_transit_matches_matrix():
+    places = [{"name": "A"}, {"name": "B"}, {"name": "C"}]
+    matrix = [[0, 5, 9], [5, 0, 4], [9, 4, 0]]
+    mgr, routing = create_routing_model(3, 0, 2)
+
+    cb = register_transit(routing, mgr, matrix, [20, 10, 0], places)
+    routing.SetArcCostEvaluatorOfAllVehicles(cb)
+    routing.CloseModel()
+
+    assert routing.GetArcCostForVehicle(mgr.NodeToIndex(0), mgr.NodeToIndex(1), 0) == 25
+    assert routing.GetArcCostForVehicle(mgr.NodeToIndex(1), routing.End(0), 0) == 14
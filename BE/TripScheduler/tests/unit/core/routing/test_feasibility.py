@@ -0,0 +1,96 @@
+import pickle
+import time
+import pytest
+from tripscheduler.core.routing.dummy import add_dummy_node
+from tripscheduler.core.routing.feasibility import (
+    InfeasibleScheduleError, check_feasibility, find_infeasibility,
+    UNREACHABLE_FROM_START, CANNOT_REACH_END, NO_MEAL_WINDOW,
+    WINDOW_CONFLICT, WINDOW_OVERLOAD, TOTAL_TIME_EXCEEDED, DAY_WINDOW
+)
+from tripscheduler.scheduler_api import schedule_trip
+from tests.utils.factory import make_sample_data
+
+def node(name, category="landmark", service_time=0, **extra):
+    return {"id": name, "name": name, "category": category, "service_time": service_time, **extra}
+
+def line(n, step=10):
+    """0..n-1 노드가 일직선 위에 step 간격으로 놓인 이동 시간"""
+    return [[abs(i - j) * step for j in range(n)] for i in range(n)]
+
+def test_feasible_day_passes():
+    places = [node("start"), node("a", service_time=60), node("end")]
+    windows = [(0, 600, None), (100, 300, None), (0, 600, None)]
+    assert find_infeasibility(places, windows, line(3), 0, 2, 0, 600) is None
+
+def test_unreachable_from_start():
+    places = [node("start"), node("a"), node("end")]
+    windows = [(0, 600, None), (0, 30, None), (0, 600, None)]
+    error = find_infeasibility(places, windows, line(3, step=100), 0, 2, 0, 600)
+    assert error.reason == UNREACHABLE_FROM_START
+    assert error.places == ["a"]
+    assert error.detail == {"earliest_arrival": 100, "latest_arrival": 40}
+
+def test_cannot_reach_end():
+    places = [node("start"), node("a", service_time=100), node("end")]
+    windows = [(0, 600, None), (500, 600, None), (0, 600, None)]
+    assert find_infeasibility(places, windows, line(3, step=50), 0, 2, 0, 600).reason == CANNOT_REACH_END
+
+def test_mandatory_restaurant_without_reachable_meal():
+    places = [
+        node("start"),
+        node("식당 (lunch)", "restaurant", org_id="r"),
+        node("식당 (dinner)", "restaurant", org_id="r"),
+        node("end"),
+    ]
+    windows = [(0, 600, None), (0, 20, "lunch"), (580, 590, "dinner"), (0, 600, None)]
+    error = find_infeasibility(places, windows, line(4, step=100), 0, 3, 0, 600)
+    assert error.reason == NO_MEAL_WINDOW
+    assert error.places == ["식당"]
+
+    places[1]["is_mandatory"] = places[2]["is_mandatory"] = False
+    assert find_infeasibility(places, windows, line(4, step=100), 0, 3, 0, 600) is None
+
+def test_window_conflict_between_mandatory_places():
+    places = [node("a", service_time=60), node("b", service_time=60)]
+    windows = [(100, 110, None), (120, 130, None)]
+    add_dummy_node(places, windows, "start", 0, 600)
+    add_dummy_node(places, windows, "end", 0, 600)
+    error = find_infeasibility(places, windows, line(2), 2, 3, 0, 600)
+    assert error.reason == WINDOW_CONFLICT
+    assert sorted(error.places) == ["a", "b"]
+
+def test_window_overload():
+    places = [node("start")] + [node(f"p{i}", service_time=50) for i in range(3)] + [node("end")]
+    windows = [(0, 600, None)] + [(100, 160, None)] * 3 + [(0, 600, None)]
+    matrix = [[0] * 5 for _ in range(5)]
+    error = find_infeasibility(places, windows, matrix, 0, 4, 0, 600)
+    assert error.reason == WINDOW_OVERLOAD
+    assert error.detail["service"] == 150
+
+def test_total_time_exceeded():
+    places = [node("start")] + [node(f"p{i}", service_time=150) for i in range(3)] + [node("end")]
+    windows = [(0, 600, None)] * 5
+    # 시작/종료와 장소 사이 50분, 장소끼리 100분: 서비스 450 + 최소 이동 200 > 600
+    matrix = [[0 if i == j else 50 if 0 in (i % 4, j % 4) else 100 for j in range(5)] for i in range(5)]
+    error = find_infeasibility(places, windows, matrix, 0, 4, 0, 600)
+    assert error.reason == TOTAL_TIME_EXCEEDED
+    assert error.detail == {"service": 450, "travel": 200, "available": 600}
+
+def test_day_window_and_check_raises_picklable_error():
+    places = [node("start"), node("end")]
+    windows = [(0, 600, None)] * 2
+    with pytest.raises(InfeasibleScheduleError) as info:
+        check_feasibility(places, windows, line(2), 0, 1, 600, 500)
+    assert info.value.reason == DAY_WINDOW
+    copy = pickle.loads(pickle.dumps(info.value))
+    assert copy.to_dict() == info.value.to_dict()
+
+def test_schedule_trip_fails_fast_with_reason():
+    data = make_sample_data()
+    data["places"][2].update(is_mandatory=True, open_time="05:00", close_time="06:00")
+    data["places"][2]["name"] = "새벽시장"
+    started = time.perf_counter()
+    with pytest.raises(InfeasibleScheduleError) as info:
+        schedule_trip(data, use_mock=True)
+    assert time.perf_counter() - started < 2
+    assert info.value.places == ["새벽시장"]
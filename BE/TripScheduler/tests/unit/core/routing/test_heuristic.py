@@ -0,0 +1,60 @@
+import time
+
+from tripscheduler.core.routing.heuristic import heuristic_route
+
+def node(name, category="landmark", service_time=30, **extra):
+    return {"id": name, "name": name, "category": category, "service_time": service_time, **extra}
+
+def test_respects_windows_and_orders_by_time():
+    places = [node("start", service_time=0), node("late"), node("early"), node("end", service_time=0)]
+    windows = [(0, 600, None), (300, 320, None), (60, 80, None), (0, 600, None)]
+    matrix = [[10] * 4 for _ in range(4)]
+    sequence, objective = heuristic_route(places, windows, matrix, [0, 30, 30, 0], 0, 3, 0, 600)
+
+    assert [n for n, _ in sequence] == [0, 2, 1, 3]
+    arrivals = dict(sequence)
+    assert 50 <= arrivals[2] <= 90 and 290 <= arrivals[1] <= 330
+    assert objective == 0
+
+def test_meals_are_assigned_once_and_unreachable_optional_is_penalised():
+    places = [
+        node("start", service_time=0),
+        node("r1 (lunch)", "restaurant", id="r1_lunch", org_id="r1", is_mandatory=False),
+        node("r1 (dinner)", "restaurant", id="r1_dinner", org_id="r1", is_mandatory=False),
+        node("r2 (dinner)", "restaurant", id="r2_dinner", org_id="r2", is_mandatory=False),
+        node("far", is_mandatory=False),
+        node("end", service_time=0),
+    ]
+    windows = [(0, 600, None), (100, 200, "lunch"), (400, 500, "dinner"), (400, 500, "dinner"),
+               (0, 20, None), (0, 600, None)]
+    matrix = [[0 if i == j else 10 for j in range(6)] for i in range(6)]
+    matrix[0][4] = 100
+    sequence, objective = heuristic_route(places, windows, matrix, [p["service_time"] for p in places], 0, 5, 0, 600)
+
+    visited = [places[n]["name"] for n, _ in sequence]
+    assert visited == ["start", "r1 (lunch)", "r2 (dinner)", "end"]
+    assert objective == 1000
+
+def test_missing_mandatory_place_is_reported():
+    places = [node("start", service_time=0), node("closed"), node("end", service_time=0)]
+    windows = [(0, 600, None), (0, 5, None), (0, 600, None)]
+    matrix = [[0, 100, 10], [100, 0, 10], [10, 10, 0]]
+    assert heuristic_route(places, windows, matrix, [0, 30, 0], 0, 2, 0, 600) == (None, None)
+
+def test_large_instance_within_budget():
+    n = 40
+    places = [node(f"p{i}", is_mandatory=False) for i in range(n)]
+    windows = [(0, 1440, None)] * n
+    matrix = [[abs(i - j) * 3 for j in range(n)] for i in range(n)]
+    started = time.perf_counter()
+    sequence, _ = heuristic_route(places, windows, matrix, [30] * n, 0, n - 1, 0, 1440)
+    assert time.perf_counter() - started < 0.1
+    assert sequence[0][0] == 0 and sequence[-1][0] == n - 1
+
+def test_initial_route_is_inserted_before_remaining_candidates():
+    places = [node("start", service_time=0)] + [node(f"p{i}", is_mandatory=False) for i in range(4)] + [node("end", service_time=0)]
+    windows = [(0, 200, None)] * 6
+    matrix = [[0 if i == j else 10 for j in range(6)] for i in range(6)]
+    # 두 곳만 들어가는 하루: 초기 경로의 p3, p2가 먼저 자리를 차지
+    sequence, _ = heuristic_route(places, windows, matrix, [0, 60, 60, 60, 60, 0], 0, 5, 0, 150, initial_route=[4, 3])
+    assert sorted(n for n, _ in sequence[1:-1]) == [3, 4]
@@ -0,0 +1,15 @@
+from tripscheduler.core.routing.parser import append_segment
+from tripscheduler.utils.geometry import to_path_array
+
+def test_append_segment_removes_duplicate_joint():
+    full_path = []
+    append_segment(full_path, to_path_array([[126.5, 33.2], [126.6, 33.3]]))
+    append_segment(full_path, to_path_array([[126.6, 33.3], [126.7, 33.4]]))
+    assert len(full_path) == 2
+    assert len(full_path[1]) == 1
+
+def test_append_segment_ignores_empty():
+    full_path = []
+    append_segment(full_path, None)
+    append_segment(full_path, to_path_array([]))
+    assert full_path == []
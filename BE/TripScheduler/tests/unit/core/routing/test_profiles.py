@@ -0,0 +1,46 @@
+import pytest
+from tripscheduler.core.routing.profiles import (
+    FSS, LSM, PROFILES, build_search_parameters, search_parameters_for, window_tightness
+)
+
+def test_window_tightness():
+    assert window_tightness([(0, 100, None)], 0, 100) == 0.0
+    assert window_tightness([(0, 100, None), (40, 40, None)], 0, 100) == pytest.approx(0.5)
+    # 전역 범위 밖은 잘라서 계산
+    assert window_tightness([(-50, 50, None)], 0, 100) == pytest.approx(0.5)
+
+def test_time_limit_scales_with_size_and_is_capped():
+    small = build_search_parameters("balanced", 4)
+    large = build_search_parameters("balanced", 20, tightness=0.8)
+    huge = build_search_parameters("balanced", 500)
+    assert small.time_limit.ToMilliseconds() < large.time_limit.ToMilliseconds()
+    assert huge.time_limit.ToMilliseconds() == PROFILES["balanced"].max_sec * 1000
+
+def test_metaheuristic_and_first_solution_selection():
+    assert build_search_parameters("balanced", 4).local_search_metaheuristic == LSM.GREEDY_DESCENT
+    assert build_search_parameters("balanced", 12).local_search_metaheuristic == LSM.GUIDED_LOCAL_SEARCH
+    assert build_search_parameters("fast", 50).local_search_metaheuristic == LSM.GREEDY_DESCENT
+    assert build_search_parameters("quality", 5, tightness=0.9).first_solution_strategy == FSS.PARALLEL_CHEAPEST_INSERTION
+    assert build_search_parameters("quality", 12).improvement_limit_parameters.improvement_rate_solutions_distance > 0
+
+def test_time_limit_override_and_unknown_profile():
+    assert build_search_parameters("quality", 30, time_limit_sec=1.5).time_limit.ToMilliseconds() == 1500
+    with pytest.raises(ValueError):
+        build_search_parameters("turbo", 5)
+
+def test_search_parameters_ignore_dummy_windows():
+    places = [{"name": "A"}, {"name": "dummy_start"}]
+    windows = [(0, 10, None), (0, 100, None)]
+    params = search_parameters_for(places, windows, 0, 100, "quality")
+    assert params.first_solution_strategy == FSS.PARALLEL_CHEAPEST_INSERTION
+
+def test_search_parameters_count_only_visit_nodes():
+    # 방문 노드 6곳 + 시작/종료 + 더미 2개: balanced의 메타휴리스틱 기준(8곳) 미만
+    places = [{"name": "숙소"}] + [{"name": f"P{i}"} for i in range(6)] + [
+        {"name": "숙소"}, {"name": "dummy_start"}, {"name": "dummy_end"}
+    ]
+    windows = [(0, 100, None)] * len(places)
+    params = search_parameters_for(places, windows, 0, 100, "balanced", depots=(0, 7))
+    assert params.local_search_metaheuristic == LSM.GREEDY_DESCENT
+    assert params.time_limit.ToMilliseconds() == build_search_parameters("balanced", 6).time_limit.ToMilliseconds()
+    assert search_parameters_for(places, windows, 0, 100, "balanced").local_search_metaheuristic == LSM.GUIDED_LOCAL_SEARCH
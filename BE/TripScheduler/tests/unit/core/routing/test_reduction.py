@@ -0,0 +1,62 @@
+from tripscheduler.core.routing.reduction import DUPLICATE, UNREACHABLE, reduce_nodes
+
+def node(name, category="landmark", service_time=30, **extra):
+    return {"id": name, "name": name, "category": category, "service_time": service_time, **extra}
+
+def make_day():
+    places = [
+        node("start", service_time=0),
+        node("museum", is_mandatory=False),
+        node("museum again", id="museum", is_mandatory=False),
+        node("far", is_mandatory=False),
+        node("r (lunch)", "restaurant", id="r_lunch", org_id="r", is_mandatory=False),
+        node("end", service_time=0),
+    ]
+    windows = [(0, 600, None), (0, 600, None), (100, 200, None), (0, 20, None), (100, 200, "lunch"), (0, 600, None)]
+    matrix = [[0 if i == j else 10 for j in range(6)] for i in range(6)]
+    for k in range(6):
+        if k != 3:
+            matrix[k][3] = 100
+    return places, windows, matrix, [p["service_time"] for p in places]
+
+def test_drops_unreachable_and_dominated_duplicate():
+    places, windows, matrix, svc = make_day()
+    reduction = reduce_nodes(places, windows, matrix, svc, 0, 5, 0, 600)
+
+    assert reduction.dropped == {2: DUPLICATE, 3: UNREACHABLE}
+    assert reduction.kept == [0, 1, 4, 5]
+    assert reduction.index_of(5) == 3
+
+    m_places, m_windows, m_matrix, m_svc = reduction.apply(places, windows, matrix, svc)
+    assert [p["name"] for p in m_places] == ["start", "museum", "r (lunch)", "end"]
+    assert len(m_matrix) == 4 and m_svc == [0, 30, 30, 0]
+    assert reduction.expand([(0, 0), (1, 50), (3, 90)]) == [(0, 0), (1, 50), (5, 90)]
+
+def test_mandatory_copy_wins_and_dummy_nodes_stay_last():
+    places, windows, matrix, svc = make_day()
+    places[2]["is_mandatory"] = True
+    places = places[1:5] + [node("dummy_start", service_time=0), node("dummy_end", service_time=0)]
+    windows = windows[1:5] + [(0, 600, None), (0, 600, None)]
+    matrix = [row[1:5] for row in matrix[1:5]]
+    svc = [p["service_time"] for p in places]
+    reduction = reduce_nodes(places, windows, matrix, svc, 4, 5, 0, 600)
+
+    # 필수 노드(윈도우가 좁음)가 남고 같은 장소의 선택 노드는 지배되지 않아 그대로 둔다
+    assert 1 not in reduction.dropped and reduction.dropped.get(0) is None
+    assert reduction.kept[-2:] == [4, 5]
+    _, _, m_matrix, _ = reduction.apply(places, windows, matrix, svc)
+    assert len(m_matrix) == len(reduction.kept) - 2
+
+def test_same_id_in_different_categories_is_not_a_duplicate():
+    places = [
+        node("start", service_time=0),
+        node("cafe", "cafe", id=3, is_mandatory=False),
+        node("landmark", id=3, is_mandatory=False),
+        node("end", service_time=0),
+    ]
+    windows = [(0, 600, None)] * 4
+    matrix = [[0 if i == j else 10 for j in range(4)] for i in range(4)]
+    reduction = reduce_nodes(places, windows, matrix, [p["service_time"] for p in places], 0, 3, 0, 600)
+
+    assert not reduction.reduced
+    assert reduction.kept == [0, 1, 2, 3]
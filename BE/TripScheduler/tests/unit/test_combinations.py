@@ -0,0 +1,140 @@
+import time
+
+from tripscheduler import combinations
+from tripscheduler.cli.utils import load_test_case, generate_valid_combinations
+from tripscheduler.combinations import PRUNED, TIMED_OUT, CombinationReport, rank_results, solve_combinations, solve_day
+from tripscheduler.core.preprocessing.restaurant import split_restaurant_nodes
+from tripscheduler.core.preprocessing.timewindow import calculate_effective_time_windows
+from tripscheduler.scheduler import build_day_matrices
+from tripscheduler.scheduler_api import schedule_trip
+
+SCENARIO = "tests/scenarios/base/tc5_too_many_restaurants.json"
+
+def prepare(path):
+    data = load_test_case(path)
+    places, user, day_info = data["places"], data["user"], data["day_info"]
+    new_places, new_windows = split_restaurant_nodes(places, calculate_effective_time_windows(places, user))
+    selections = generate_valid_combinations(new_places, new_windows)
+    day_matrices = build_day_matrices(new_places, use_mock=True, windows=new_windows)
+    return new_places, new_windows, selections, user, day_info, day_matrices
+
+def test_rank_results_orders_by_cost_and_skips_failures():
+    results = {
+        (1,): {"cost": 30, "visits": [{}], "path": []},
+        (2,): None,
+        (3,): {"cost": 10, "visits": [{}], "path": []},
+        (4,): {"cost": None, "visits": [], "path": []},
+    }
+    assert [sel for sel, _ in rank_results(results)] == [(3,), (1,)]
+
+def test_parallel_matches_sequential():
+    args = prepare(SCENARIO)
+    assert len(args[2]) > 1
+
+    # keep = 조합 수: 하한 가지치기 없이 전체 조합 비교
+    keep = len(args[2])
+    sequential = solve_combinations(*args, use_mock=True, profile="fast", max_workers=1, keep=keep)
+    parallel = solve_combinations(
+        *args, use_mock=True, profile="fast", max_workers=2, deadline_sec=30, keep=keep
+    )
+
+    assert list(parallel) == list(sequential)
+    assert {sel: out and out["cost"] for sel, out in parallel.items()} == \
+           {sel: out and out["cost"] for sel, out in sequential.items()}
+
+def test_bound_pruning_skips_combinations_that_cannot_improve():
+    args = prepare(SCENARIO)
+    report = CombinationReport()
+    pruned = solve_combinations(*args, use_mock=True, profile="fast", max_workers=1, report=report)
+    full = solve_combinations(*args, use_mock=True, profile="fast", max_workers=1, keep=len(args[2]))
+
+    assert sum(report.counts().values()) == len(args[2])
+    assert report.pruned > 0
+    # 가지치기한 조합은 해 없음(None)과 구분된다
+    skipped = [out for out in pruned.values() if out and out.get("status") == PRUNED]
+    assert len(skipped) == report.pruned and all("bound" in out for out in skipped)
+    assert rank_results(pruned)[0][1]["cost"] == rank_results(full)[0][1]["cost"]
+
+def test_schedule_trip_returns_best_and_alternatives():
+    data = load_test_case(SCENARIO)
+    out = schedule_trip(data, use_mock=True, profile="fast", top_k=2, max_workers=2)
+
+    assert out["visits"]
+    costs = [alt["cost"] for alt in out["alternatives"]]
+    assert costs == sorted(costs)
+    assert all(alt["meals"] for alt in out["alternatives"])
+    assert out["combinations"]["solved"] >= 3
+
+def test_meal_model_solves_all_restaurants_in_one_model():
+    places, windows, selections, user, day_info, day_matrices = prepare(SCENARIO)
+    assert len(selections) > 1
+
+    results = solve_day(
+        places, windows, user, day_info, day_matrices, meal_assignment="model", use_mock=True, profile="fast"
+    )
+    # 기본값은 조합별 풀이 (model은 선택)
+    enumerated = solve_day(places, windows, user, day_info, day_matrices, use_mock=True, profile="fast", max_workers=1)
+
+    assert len(enumerated) == len(selections)
+    assert len(results) == 1
+    (sel, out), = results.items()
+    meals = [windows[i][2] for i in sel]
+    orgs = [places[i].get("org_id", places[i]["id"]) for i in sel]
+    assert len(meals) == len(set(meals))
+    assert len(orgs) == len(set(orgs))
+    assert out["cost"] <= rank_results(enumerated)[0][1]["cost"]
+
+def test_meal_model_uses_restaurant_once_when_it_fits_two_meals():
+    # 필수 식당 하나가 아침/점심 윈도우를 모두 가져 조합 열거로는 해가 없던 경우
+    places, windows, selections, user, day_info, day_matrices = prepare(
+        "tests/scenarios/base/day-main/tc2-day-main-4.json"
+    )
+    assert selections == []
+
+    (sel, out), = solve_day(
+        places, windows, user, day_info, day_matrices, meal_assignment="model", use_mock=True
+    ).items()
+    assert len(sel) == 1
+    assert out["visits"]
+
+def test_display_results_does_not_report_pruned_as_unsolvable(capsys):
+    from tripscheduler.cli.utils import display_results
+    windows = [(0, 600, "lunch"), (0, 600, "dinner")]
+    display_results({(0,): {"status": PRUNED, "bound": 3000}, (1,): None}, windows)
+    out = capsys.readouterr().out
+    assert "가지치기" in out and out.count("해결 불가") == 1
+
+def never_finishes(*args, **kwargs):
+    time.sleep(60)
+
+def test_pool_is_reused_and_stragglers_are_stopped_at_deadline(monkeypatch):
+    args = prepare(SCENARIO)
+    keep = len(args[2])
+    combinations.shutdown_combination_executor()
+    solve_combinations(*args, use_mock=True, profile="fast", max_workers=2, keep=keep)
+    pool = combinations._pool
+    solve_combinations(*args, use_mock=True, profile="fast", max_workers=2, keep=keep)
+    assert combinations._pool is pool
+
+    # 마감까지 끝나지 않는 조합: 워커를 종료하고 마감 초과로 기록
+    combinations.shutdown_combination_executor()
+    monkeypatch.setattr(combinations, "_solve_selection", never_finishes)
+    monkeypatch.setattr(combinations, "DEADLINE_GRACE_SEC", 0.1)
+    workers = []
+    terminate = combinations.terminate_combination_executor
+
+    def record_workers():
+        workers.extend(combinations._pool._processes.values())
+        terminate()
+
+    monkeypatch.setattr(combinations, "terminate_combination_executor", record_workers)
+    report = CombinationReport()
+    started = time.perf_counter()
+    results = solve_combinations(
+        *args, use_mock=True, profile="fast", max_workers=2, deadline_sec=0.5, keep=keep, report=report
+    )
+    assert time.perf_counter() - started < 10
+    assert combinations._pool is None
+    assert workers and not any(process.is_alive() for process in workers)
+    assert report.timed_out == len(results) - report.infeasible
+    assert all(out is None or out["status"] == TIMED_OUT for out in results.values())
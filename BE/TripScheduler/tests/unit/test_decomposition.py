@@ -0,0 +1,62 @@
+import tripscheduler.api.matrix as matrix_mod
+from tripscheduler import combinations
+from tripscheduler.api.matrix import node_key
+from tripscheduler.cli.utils import load_test_case
+from tripscheduler.decomposition import schedule_decomposed
+from tripscheduler.scheduler_api import schedule_trip
+
+CASE = "tests/scenarios/base/tc10_too_many_places.json"
+
+def test_clusters_are_solved_and_stitched_between_start_and_end():
+    data = load_test_case(CASE)
+    output = schedule_decomposed(data, use_mock=True, cluster_size=4, max_workers=1)
+
+    assert output["clusters"] >= 2
+    names = [v["place"] for v in output["visits"]]
+    mandatory = {p["name"] for p in data["places"] if p.get("is_mandatory", True)}
+    assert mandatory <= set(names)
+    assert len(names) == len(set(names[1:-1])) + 2
+    assert output["cost"] is not None
+    assert any(t["name"] == "improve" for t in output["timings"])
+
+def test_unstitched_clusters_are_reported_and_pool_is_shared():
+    data = load_test_case(CASE)
+    output = schedule_decomposed(data, use_mock=True, cluster_size=3, stitch_clusters=1, max_workers=2)
+    pool = combinations._pool
+
+    assert output["clusters"] >= 2
+    assert len(output["unstitched"]) == output["clusters"] - 1
+    visited = {v["place"] for v in output["visits"]}
+    assert all(not visited & set(u["places"]) for u in output["unstitched"])
+
+    schedule_decomposed(data, use_mock=True, cluster_size=3, stitch_clusters=1, max_workers=2)
+    assert pool is not None and combinations._pool is pool
+    combinations.shutdown_combination_executor()
+
+def test_shared_pairs_are_built_once_and_passed_as_known_pairs(monkeypatch):
+    data = load_test_case(CASE)
+    original = matrix_mod.prepare_matrices
+    calls = []
+
+    def spy(places, *args, known_pairs=None, **kwargs):
+        calls.append(([node_key(p) for p in places], known_pairs))
+        return original(places, *args, known_pairs=known_pairs, **kwargs)
+
+    monkeypatch.setattr(matrix_mod, "prepare_matrices", spy)
+    output = schedule_decomposed(data, use_mock=True, cluster_size=4, max_workers=1)
+
+    # 첫 호출은 공통 노드(시작/종료, 필수 장소, 식당 후보), 이후 클러스터마다 한 번
+    shared_keys, first_known = calls[0]
+    assert first_known is None
+    for keys, known in calls[1:1 + output["clusters"]]:
+        common = [i for i, k in enumerate(keys) if k in shared_keys]
+        expected = {(i, j) for a, i in enumerate(common) for j in common[a + 1:]}
+        assert expected and expected <= set(known)
+
+def test_schedule_trip_delegates_above_threshold():
+    data = load_test_case(CASE)
+    output = schedule_trip(data, use_mock=True, profile="fast", decompose_above=len(data["places"]) - 1)
+    assert "clusters" in output and output["visits"]
+
+    direct = schedule_trip(data, use_mock=True, profile="fast", decompose_above=len(data["places"]))
+    assert "clusters" not in direct
@@ -0,0 +1,80 @@
+import pytest
+from tripscheduler.multiday import plan_trip
+
+USER = {
+    "start_time": "08:00", "end_time": "21:00", "travel_style": "relaxed",
+    "meal_time_preferences": {"lunch": ["12:00", "13:00"], "dinner": ["18:00", "19:00"]}
+}
+
+def place(id, name, x, y, category, open_time="09:00", close_time="18:00", service_time=60, **extra):
+    return {
+        "id": id, "name": name, "x_cord": x, "y_cord": y, "category": category,
+        "open_time": open_time, "close_time": close_time, "service_time": service_time,
+        "휴무일": [], "break_time": [], **extra
+    }
+
+AIRPORT_IN = place(1, "제주공항", 126.492153, 33.505413, "transport", "08:00", "08:00", 0)
+AIRPORT_OUT = place(2, "제주공항", 126.492153, 33.505413, "transport", "17:00", "17:00", 0)
+HOTEL_IN = place(3, "호텔 난타", 126.532199, 33.500633, "accommodation", "15:00", "23:00", 0)
+HOTEL_OUT = place(3, "호텔 난타", 126.532199, 33.500633, "accommodation", "07:00", "12:00", 0)
+
+def trip(free_places):
+    return {
+        "user": USER,
+        "days": [
+            {"day_info": {"is_first_day": True, "is_last_day": False}, "places": [AIRPORT_IN, HOTEL_IN]},
+            {"day_info": {"is_first_day": False, "is_last_day": True}, "places": [HOTEL_OUT, AIRPORT_OUT]},
+        ],
+        "places": free_places,
+    }
+
+def test_plan_trip_assigns_places_to_days_in_one_solve():
+    free = [
+        place(10, "오설록 티뮤지엄", 126.284, 33.305, "landmark", is_mandatory=False),
+        place(11, "카페 델문도", 126.56, 33.48, "cafe", is_mandatory=False),
+        place(12, "용두암", 126.512, 33.516, "landmark", is_mandatory=True),
+        place(20, "중식당", 126.541, 33.37, "restaurant", "11:00", "20:00", is_mandatory=False),
+        place(21, "석식당", 126.5, 33.51, "restaurant", "11:00", "20:00", is_mandatory=False),
+    ]
+    out = plan_trip(trip(free), use_mock=True, profile="fast")
+
+    assert len(out["days"]) == 2
+    first, last = out["days"]
+    assert first["visits"][0]["place"] == "제주공항" and first["visits"][-1]["place"] == "호텔 난타"
+    assert last["visits"][0]["place"] == "호텔 난타" and last["visits"][-1]["place"] == "제주공항"
+
+    names = [v["place"] for day in out["days"] for v in day["visits"]]
+    assert names.count("용두암") == 1
+    # 식당은 여행 전체에서 한 번, 같은 날 같은 식사는 한 곳
+    for rest in ("중식당", "석식당"):
+        assert sum(n.startswith(rest) for n in names) <= 1
+    for day in out["days"]:
+        meals = [v["place"].rsplit(" (", 1)[-1] for v in day["visits"] if v["place"].endswith(")")]
+        assert len(meals) == len(set(meals))
+    assert set(out["unassigned"]).isdisjoint(names)
+
+def test_plan_trip_keeps_pinned_place_on_its_day():
+    museum = place(10, "오설록 티뮤지엄", 126.284, 33.305, "landmark", is_mandatory=True)
+    data = trip([])
+    data["days"][1]["places"].insert(1, museum)
+    out = plan_trip(data, use_mock=True, profile="fast")
+
+    assert "오설록 티뮤지엄" in [v["place"] for v in out["days"][1]["visits"]]
+    assert "오설록 티뮤지엄" not in [v["place"] for v in out["days"][0]["visits"]]
+
+def test_plan_trip_skips_closed_days():
+    data = trip([
+        place(10, "오설록 티뮤지엄", 126.284, 33.305, "landmark", is_mandatory=True, 휴무일=["금요일"]),
+        place(11, "카페 델문도", 126.56, 33.48, "cafe", is_mandatory=False, 휴무일=["목요일", "금요일"]),
+    ])
+    data["days"][0]["day_info"]["weekday"] = "목요일"
+    data["days"][1]["day_info"]["weekday"] = "금요일"
+    out = plan_trip(data, use_mock=True, profile="fast")
+
+    assert "오설록 티뮤지엄" in [v["place"] for v in out["days"][0]["visits"]]
+    names = [v["place"] for day in out["days"] for v in day["visits"]]
+    assert "카페 델문도" not in names
+
+    data["places"][0]["휴무일"] = ["목요일", "금요일"]
+    with pytest.raises(ValueError, match="오설록 티뮤지엄"):
+        plan_trip(data, use_mock=True, profile="fast")
@@ -0,0 +1,38 @@
+import time
+import threading
+
+from tripscheduler.cli.utils import load_test_case
+from tripscheduler import scheduler_api
+from tripscheduler.scheduler_api import schedule_trip_preview, shutdown_refine_executor
+
+def test_preview_returns_heuristic_then_refines_in_background(tmp_path):
+    data = load_test_case("tests/scenarios/base/day-main/tc2-day-main-6.json")
+    output = tmp_path / "results.json"
+    refined = []
+    notified = threading.Event()
+
+    def on_refined(result):
+        refined.append(result)
+        notified.set()
+
+    started = time.perf_counter()
+    preview, future = schedule_trip_preview(
+        data, use_mock=True, profile="fast", output_path=str(output), on_refined=on_refined
+    )
+    assert time.perf_counter() - started < 1.0
+    assert preview["preview"] and preview["visits"]
+
+    final = future.result(timeout=30)
+    assert notified.wait(timeout=5)
+    assert len(refined) == 1 and refined[0] == final
+    assert final["visits"]
+    assert output.exists()
+    # 미리보기 경로를 초기해로 보정하므로 필수 장소는 그대로 유지
+    assert {v["place"] for v in preview["visits"]} & {v["place"] for v in final["visits"]}
+
+def test_refine_executor_shuts_down():
+    pool = scheduler_api._refine_executor()
+    shutdown_refine_executor()
+    assert scheduler_api._refine_pool is None
+    assert scheduler_api._refine_executor() is not pool
+    shutdown_refine_executor()
@@ -0,0 +1,65 @@
+import copy
+
+from tripscheduler.api import matrix as matrix_mod
+from tripscheduler.cli.utils import load_test_case
+from tripscheduler.core.routing.solver import order_to_route
+from tripscheduler.replan import replan_day
+
+SCENARIO = "tests/scenarios/base/tc5_too_many_restaurants.json"
+
+NEW_PLACE = {
+    "id": 9, "name": "용두암", "x_cord": 126.512, "y_cord": 33.516, "category": "tourist_spot",
+    "open_time": "09:00", "close_time": "18:00", "service_time": 40,
+    "tags": ["관광"], "휴무일": [], "is_mandatory": True
+}
+
+def test_order_to_route_drops_removed_and_inserts_new_mandatory():
+    places = [
+        {"name": "A", "is_mandatory": True},
+        {"name": "B", "is_mandatory": True},
+        {"name": "C", "is_mandatory": True},
+        {"name": "R (lunch)", "category": "restaurant", "is_mandatory": True},
+        {"name": "E", "is_mandatory": True},
+    ]
+    # A → B 사이가 C를 끼우기에 가장 싸다
+    matrix = [
+        [0, 10, 1, 5, 10],
+        [10, 0, 1, 5, 10],
+        [1, 1, 0, 5, 50],
+        [5, 5, 5, 0, 5],
+        [10, 10, 50, 5, 0],
+    ]
+    route = order_to_route(places, ["A", "삭제된 장소", "B", "E"], matrix, start_idx=0, end_idx=4)
+    assert route == [2, 1]
+
+def test_replan_reuses_matrices_and_previous_order(monkeypatch, caplog):
+    data = load_test_case(SCENARIO)
+    first, day_matrices = replan_day(data, [], use_mock=True)
+    assert first["visits"]
+
+    # 같은 장소 집합이면 매트릭스를 다시 만들지 않는다
+    def fail(*args, **kwargs):
+        raise AssertionError("매트릭스를 다시 계산함")
+
+    original = matrix_mod.prepare_matrices
+    monkeypatch.setattr(matrix_mod, "prepare_matrices", fail)
+    same, reused = replan_day(data, first["visits"], day_matrices, use_mock=True)
+    assert same["cost"] <= first["cost"]
+    assert reused.keys == day_matrices.keys
+
+    # 장소 추가: 기존 쌍은 known_pairs로 넘겨 새 쌍만 계산
+    edited = copy.deepcopy(data)
+    edited["places"].append(NEW_PLACE)
+    calls = []
+
+    def spy(places, *args, known_pairs=None, **kwargs):
+        calls.append(known_pairs)
+        return original(places, *args, known_pairs=known_pairs, **kwargs)
+
+    monkeypatch.setattr(matrix_mod, "prepare_matrices", spy)
+    added, _ = replan_day(edited, first["visits"], day_matrices, use_mock=True)
+    n_old = len(day_matrices.keys)
+    assert len(calls[0]) == n_old * (n_old - 1) // 2
+    assert "용두암" in [v["place"] for v in added["visits"]]
+    # 새 장소를 끼운 이전 순서가 그대로 초기해로 쓰였다
+    assert "처음부터 탐색" not in caplog.text
@@ -0,0 +1,119 @@
+import time
+
+from tripscheduler import scheduler, solution_cache
+from tripscheduler.api import directions
+from tripscheduler.api.catalogue import build_catalogue_matrix
+from tripscheduler.cli.utils import all_meal_nodes, build_selection_inputs, load_test_case
+from tripscheduler.core.preprocessing.restaurant import split_restaurant_nodes
+from tripscheduler.core.preprocessing.timewindow import calculate_effective_time_windows
+from tripscheduler.scheduler import build_day_matrices, run_scheduler
+from tripscheduler.solution_cache import SolutionCache, canonical_problem_key
+
+PLACES = [{"id": 1, "name": "a", "service_time": 30}, {"id": 2, "name": "b", "service_time": 0}]
+WINDOWS = [(0, 600, None), (0, 600, None)]
+MATRIX = [[0, 10], [10, 0]]
+
+def key(**overrides):
+    args = dict(
+        places=PLACES, windows=WINDOWS, time_matrix=MATRIX, start_idx=0, end_idx=1,
+        global_start=0, global_end=600, profile=None
+    )
+    args.update(overrides)
+    return canonical_problem_key(**args)
+
+def test_key_is_canonical():
+    assert key() == key(profile="balanced")
+    assert key() != key(profile="fast")
+    assert key() != key(time_matrix=[[0, 11], [10, 0]])
+    assert key() != key(windows=[(0, 600, None), (0, 500, None)])
+    assert key() != key(path_format="polyline")
+
+def test_lru_evicts_least_recently_used():
+    cache = SolutionCache(max_entries=2)
+    cache.put("a", ([{"place": "a"}], 0, []))
+    cache.put("b", ([], 0, []))
+    assert cache.get("a") == ([{"place": "a"}], 0, [])
+    cache.put("c", ([], 0, []))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats() == {"hits": 2, "misses": 1, "size": 2}
+
+def test_failures_are_not_cached_and_values_are_copies():
+    cache = SolutionCache()
+    cache.put("x", ([], None, []))
+    assert cache.get("x") is None
+
+    cache.put("y", ([{"place": "a"}], 0, []))
+    cache.get("y")[0].append({"place": "b"})
+    assert cache.get("y")[0] == [{"place": "a"}]
+
+def test_disk_tier_survives_new_cache(tmp_path):
+    path = str(tmp_path / "solutions.db")
+    SolutionCache(max_entries=1, path=path).put("k", ([{"place": "a"}], 1000, [[1.0, 2.0]]))
+    assert SolutionCache(max_entries=1, path=path).get("k") == ([{"place": "a"}], 1000, [[1.0, 2.0]])
+
+def test_run_scheduler_repeat_is_served_from_cache(monkeypatch):
+    cache = SolutionCache()
+    monkeypatch.setattr(scheduler, "load_solution_cache_from_env", lambda: cache)
+
+    data = load_test_case("tests/scenarios/base/tc5_too_many_restaurants.json")
+    places, user, day_info = data["places"], data["user"], data["day_info"]
+    new_places, new_windows = split_restaurant_nodes(places, calculate_effective_time_windows(places, user))
+    day_matrices = build_day_matrices(new_places, use_mock=True, windows=new_windows)
+
+    def solve(deadline=None):
+        sel_places, sel_windows, _ = build_selection_inputs(
+            new_places, new_windows, all_meal_nodes(new_places, new_windows)
+        )
+        return run_scheduler(
+            sel_places, sel_windows, user, day_info, use_mock=True, matrices=day_matrices, deadline=deadline
+        )
+
+    # 마감으로 잘릴 수 있는 풀이는 저장하지 않는다
+    solve(deadline=time.time() + 30)
+    assert len(cache) == 0
+
+    first = solve()
+    started = time.perf_counter()
+    second = solve()
+    assert time.perf_counter() - started < 0.5
+    assert second == first
+    assert cache.stats()["hits"] == 1
+
+def test_cache_is_opt_in(monkeypatch):
+    monkeypatch.delenv("SOLUTION_CACHE_MAX_ENTRIES", raising=False)
+    monkeypatch.delenv("SOLUTION_CACHE_PATH", raising=False)
+    assert solution_cache.load_solution_cache_from_env() is None
+    monkeypatch.setenv("SOLUTION_CACHE_MAX_ENTRIES", "0")
+    assert solution_cache.load_solution_cache_from_env() is None
+    monkeypatch.setenv("SOLUTION_CACHE_MAX_ENTRIES", "8")
+    assert solution_cache.load_solution_cache_from_env().max_entries == 8
+
+def test_disk_connection_is_opened_per_process(tmp_path, monkeypatch):
+    cache = SolutionCache(path=str(tmp_path / "solutions.db"))
+    cache.put("k", ([], 0, []))
+    parent = cache._conn
+    # fork된 워커처럼 pid가 바뀌면 새 연결을 연다
+    monkeypatch.setattr(solution_cache.os, "getpid", lambda: -1)
+    cache._memory.clear()
+    assert cache.get("k") == ([], 0, [])
+    assert cache._conn is not parent
+
+def test_lazy_catalogue_paths_are_not_read_for_the_key(tmp_path, monkeypatch):
+    # 카탈로그 경로(LazyPathMatrix)가 그대로 넘어오는 경우에도 키 계산이 끝나야 한다
+    data = load_test_case("tests/scenarios/base/tc5_too_many_restaurants.json")
+    places, user, day_info = data["places"], data["user"], data["day_info"]
+    route = {"route": {"traoptimal": [{"summary": {"duration": 10 * 60000}, "path": [[126.5, 33.2], [126.6, 33.3]]}]}}
+    monkeypatch.setattr(directions, "fetch_route", lambda *args, **kwargs: route)
+    out = str(tmp_path / "catalogue.npz")
+    build_catalogue_matrix(places, out, "id", "key", max_km=1000)
+
+    monkeypatch.setenv("CATALOGUE_MATRIX_PATH", out)
+    cache = SolutionCache()
+    monkeypatch.setattr(scheduler, "load_solution_cache_from_env", lambda: cache)
+    new_places, new_windows = split_restaurant_nodes(places, calculate_effective_time_windows(places, user))
+    sel_places, sel_windows, _ = build_selection_inputs(
+        new_places, new_windows, all_meal_nodes(new_places, new_windows)
+    )
+    visits, _, _ = run_scheduler(sel_places, sel_windows, user, day_info, use_mock=False)
+    assert visits and len(cache) == 1
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from tripscheduler.utils.geometry import (
+    encode_polyline, format_path, simplify_path, to_path_array
+)
+
+def test_to_path_array_is_float32():
+    arr = to_path_array([[126.5, 33.2], [126.6, 33.3]])
+    assert arr.dtype == np.float32
+    assert arr.shape == (2, 2)
+    assert to_path_array([]) is None
+    assert to_path_array(None) is None
+
+def test_simplify_path_drops_collinear_points():
+    line = to_path_array([[126.5 + k * 0.001, 33.2] for k in range(10)])
+    simplified = simplify_path(line, tolerance_m=1.0)
+    assert len(simplified) == 2
+    assert np.array_equal(simplified[0], line[0])
+    assert np.array_equal(simplified[-1], line[-1])
+
+def test_simplify_path_keeps_corners():
+    corner = to_path_array([[126.5, 33.2], [126.51, 33.2], [126.51, 33.21]])
+    assert len(simplify_path(corner, tolerance_m=5.0)) == 3
+
+def test_encode_polyline_reference_value():
+    # Google 문서 예시: (38.5,-120.2), (40.7,-120.95), (43.252,-126.453)
+    points = np.array([[-120.2, 38.5], [-120.95, 40.7], [-126.453, 43.252]])
+    assert encode_polyline(points) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+def test_format_path_coords_and_polyline():
+    segments = [to_path_array([[126.5, 33.2], [126.6, 33.3]])]
+    coords = format_path(segments)
+    assert coords == [[[126.5, 33.2], [126.6, 33.3]]]
+    assert isinstance(format_path(segments, path_format="polyline")[0], str)
+    with pytest.raises(ValueError):
+        format_path(segments, path_format="geojson")
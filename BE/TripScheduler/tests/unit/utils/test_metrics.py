@@ -0,0 +1,93 @@
+import json
+import time
+
+from tripscheduler.cli.utils import load_test_case
+from tripscheduler.scheduler_api import schedule_trip
+from tripscheduler.utils.metrics import (
+    MetricsHook, collect_spans, merge_spans, set_metrics_hook, span, timed
+)
+
+class RecordingHook(MetricsHook):
+    def __init__(self):
+        self.records = []
+
+    def record(self, name, seconds, attrs):
+        self.records.append((name, seconds, dict(attrs)))
+
+def test_spans_are_collected_with_attributes():
+    with collect_spans() as spans:
+        with span("outer", size=3) as attrs:
+            with collect_spans() as inner:
+                with span("inner"):
+                    pass
+            merge_spans(inner)
+            attrs["done"] = True
+
+    assert [s["name"] for s in spans] == ["inner", "outer"]
+    assert spans[1]["size"] == 3 and spans[1]["done"] is True
+    assert all(s["ms"] >= 0 for s in spans)
+
+def test_hook_receives_spans_and_can_be_reset():
+    hook = RecordingHook()
+    set_metrics_hook(hook)
+    try:
+        timed("step")(lambda: None)()
+    finally:
+        set_metrics_hook(None)
+    timed("step")(lambda: None)()
+
+    assert [name for name, _, _ in hook.records] == ["step"]
+
+def test_noop_span_is_cheap():
+    started = time.perf_counter()
+    for _ in range(10000):
+        with span("noop"):
+            pass
+    assert (time.perf_counter() - started) / 10000 < 20e-6
+
+def test_schedule_trip_returns_phase_timings(monkeypatch, tmp_path):
+    # 해 캐시 적중 시 solver 단계가 생략되므로 끈다
+    monkeypatch.setenv("SOLUTION_CACHE_MAX_ENTRIES", "0")
+    data = load_test_case("tests/scenarios/base/tc5_too_many_restaurants.json")
+    hook = RecordingHook()
+    set_metrics_hook(hook)
+    try:
+        out = schedule_trip(
+            data, use_mock=True, profile="fast", top_k=1, max_workers=2, output_path=str(tmp_path / "results.json")
+        )
+    finally:
+        set_metrics_hook(None)
+
+    names = {s["name"] for s in out["timings"]}
+    assert {
+        "calculate_effective_time_windows", "split_restaurant_nodes", "generate_valid_combinations",
+        "prepare_matrices", "build_model", "solve", "parse_solution", "schedule_trip",
+    } <= names
+    assert out["timings"][-1]["name"] == "schedule_trip"
+    matrices = next(s for s in out["timings"] if s["name"] == "prepare_matrices")
+    assert "pairs" in matrices
+    assert {name for name, _, _ in hook.records} >= {"prepare_matrices", "schedule_trip"}
+    # 워커 프로세스의 조합별 solve도 훅에 한 번씩 전달된다
+    solves = [s for s in out["timings"] if s["name"] == "solve"]
+    assert solves and len([r for r in hook.records if r[0] == "solve"]) == len(solves)
+    # 저장 파일 형식은 그대로 (timings 제외)
+    saved = json.loads((tmp_path / "results.json").read_text(encoding="utf-8"))
+    assert "timings" not in saved and saved["visits"] == out["visits"]
+
+def test_merged_worker_spans_reach_hook_once():
+    hook = RecordingHook()
+    set_metrics_hook(hook)
+    try:
+        with collect_spans() as spans:
+            with collect_spans() as local:
+                with span("local"):
+                    pass
+            merge_spans(local)
+            merge_spans([{"name": "remote", "ms": 1500.0, "nodes": 4}], from_worker=True)
+    finally:
+        set_metrics_hook(None)
+
+    assert [s["name"] for s in spans] == ["local", "remote"]
+    assert [(name, seconds, attrs) for name, seconds, attrs in hook.records] == [
+        ("local", hook.records[0][1], {}), ("remote", 1.5, {"nodes": 4})
+    ]
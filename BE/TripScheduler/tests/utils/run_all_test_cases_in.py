@@ -2,7 +2,7 @@ import os
 from tripscheduler.cli.controller import execute_full_pipeline
 from tripscheduler.cli.utils import display_results
 
-def run_all_test_cases_in(folder_path: str, use_mock: bool, mock_matrix_path: str, mock_raw_path: str):
+def run_all_test_cases_in(folder_path: str, use_mock: bool, mock_raw_path: str, profile: str = None):
     print(f"\n=== [INFO] 폴더 실행 시작: {folder_path} ===\n")
 
     found = False  # <-- 추가
@@ -23,8 +23,8 @@ def run_all_test_cases_in(folder_path: str, use_mock: bool, mock_matrix_path: st
                 results, windows = execute_full_pipeline(
                     json_path=json_path,
                     use_mock=use_mock,
-                    mock_matrix_path=mock_matrix_path,
-                    mock_raw_path=mock_raw_path
+                    mock_raw_path=mock_raw_path,
+                    profile=profile
                 )
                 display_results(results, windows)
             except Exception as e:
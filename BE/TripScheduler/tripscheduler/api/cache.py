@@ -0,0 +1,120 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+def make_route_key(start: str, goal: str, precision: int = 5) -> str:
+    """
+    "x,y" 형식의 출발/도착 좌표를 precision 자리로 반올림해 캐시 키를 만든다.
+    (소수 5자리 ≒ 1m 오차)
+    """
+    def _round(coord: str) -> str:
+        x, y = coord.split(",")
+        return f"{round(float(x), precision):.{precision}f},{round(float(y), precision):.{precision}f}"
+    return f"{_round(start)}|{_round(goal)}"
+
+class RouteCache:
+    """
+    Directions API 응답을 좌표쌍 키로 저장하는 SQLite 기반 영구 캐시.
+    - ttl_sec: 저장 후 유효 시간(초). None이면 만료 없음
+    - max_entries: 최대 보관 건수. 초과 시 오래된 항목부터 삭제
+    - hits / misses: 조회 적중/실패 횟수
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_sec: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.path = path
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS routes ("
+            " key TEXT PRIMARY KEY,"
+            " payload TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_routes_created ON routes(created_at)")
+        self._conn.commit()
+
+    def get(self, start: str, goal: str) -> Optional[Dict]:
+        """캐시된 응답을 반환. 없거나 만료되었으면 None"""
+        key = make_route_key(start, goal)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM routes WHERE key = ?", (key,)
+            ).fetchone()
+            if row and self.ttl_sec is not None and self._clock() - row[1] > self.ttl_sec:
+                self._conn.execute("DELETE FROM routes WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, start: str, goal: str, entry: Dict) -> None:
+        """유효한 경로가 있는 응답만 저장"""
+        if not entry.get("route"):
+            return
+        key = make_route_key(start, goal)
+        payload = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO routes (key, payload, created_at) VALUES (?, ?, ?)",
+                (key, payload, self._clock())
+            )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM routes WHERE key IN ("
+                    " SELECT key FROM routes ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM routes").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+_default_cache: Optional[RouteCache] = None
+
+def load_route_cache_from_env() -> Optional[RouteCache]:
+    """
+    ROUTE_CACHE_PATH 환경변수가 있으면 프로세스 공용 RouteCache를 생성해 반환.
+    - ROUTE_CACHE_TTL_SEC, ROUTE_CACHE_MAX_ENTRIES로 TTL/용량 설정
+    """
+    global _default_cache
+    path = os.environ.get("ROUTE_CACHE_PATH")
+    if not path:
+        return None
+    if _default_cache is None or _default_cache.path != path:
+        ttl = os.environ.get("ROUTE_CACHE_TTL_SEC")
+        cap = os.environ.get("ROUTE_CACHE_MAX_ENTRIES")
+        _default_cache = RouteCache(
+            path,
+            ttl_sec=float(ttl) if ttl else None,
+            max_entries=int(cap) if cap else None
+        )
+        logger.info("경로 캐시 사용: %s", path)
+    return _default_cache
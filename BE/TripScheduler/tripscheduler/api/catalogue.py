@@ -0,0 +1,268 @@
+import os
+import json
+import logging
+import argparse
+import numpy as np
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from tripscheduler.api.cache import RouteCache, load_route_cache_from_env
+from tripscheduler.api.directions import MatrixBuildReport, ESTIMATED_OUTCOMES, create_matrices
+from tripscheduler.api.fixture import LazyPathMatrix
+from tripscheduler.api.mock import haversine_matrix_km
+from tripscheduler.api.pruning import UNREACHABLE_MINUTES
+from tripscheduler.api.roadnet import create_roadnet_matrices, load_road_graph
+
+logger = logging.getLogger(__name__)
+
+# 이 거리(km)보다 먼 장소 쌍은 하루 일정에서 인접할 가능성이 낮아 미리 계산하지 않는다
+DEFAULT_MAX_PAIR_KM = 30.0
+DEFAULT_BLOCK_SIZE = 200
+
+Entry = Tuple[int, Optional[np.ndarray]]  # (분, 경로 좌표)
+
+# BE 카탈로그 테이블 구분(app.core.catalogue 내보내기) → 스케줄러 장소 category
+CATEGORY_ALIASES = {"hotel": "accommodation", "tour": "landmark"}
+
+def catalogue_key(place: Dict) -> str:
+    """
+    카탈로그 키 "category:원본 id". place에 catalogue_key가 있으면 그대로 사용.
+    분할 식당 노드는 org_id(원본 장소 id)를 쓰고, category는 배치 입력과 스케줄러 입력 모두
+    스케줄러 이름으로 맞춘다 (hotel → accommodation, tour → landmark).
+    """
+    if place.get("catalogue_key"):
+        return place["catalogue_key"]
+    category = CATEGORY_ALIASES.get(place["category"], place["category"])
+    return f"{category}:{place.get('org_id', place['id'])}"
+
+class CatalogueMatrix:
+    """
+    카탈로그 장소 간 이동 시간을 담은 희소(CSR) 행렬.
+    indices[indptr[i]:indptr[i+1]]는 정렬되어 있으며, 같은 위치의 minutes/offsets가 i→j 값이다.
+    """
+
+    def __init__(self, keys, indptr, indices, minutes, offsets, points, max_km: float):
+        self.keys = [str(k) for k in keys]
+        self.indptr, self.indices, self.minutes = indptr, indices, minutes
+        self.offsets, self.points = offsets, points
+        self.max_km = max_km
+        self.index = {k: i for i, k in enumerate(self.keys)}
+
+    @classmethod
+    def load(cls, path: str) -> "CatalogueMatrix":
+        data = np.load(path)
+        return cls(
+            data["keys"], data["indptr"], data["indices"], data["minutes"],
+            data["offsets"], data["points"], float(data["max_km"])
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self.keys)
+
+    def _entry(self, i: int, j: int) -> int:
+        """i→j 항목의 위치, 없으면 -1"""
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        pos = lo + int(np.searchsorted(self.indices[lo:hi], j))
+        return pos if pos < hi and self.indices[pos] == j else -1
+
+    def _path(self, pos: int) -> Optional[np.ndarray]:
+        start, count = self.offsets[pos]
+        return self.points[start:start + count] if count else None
+
+    def lookup(self, places: List[Dict]) -> Dict[Tuple[int, int], Tuple[Entry, Entry]]:
+        """
+        places 인덱스 쌍 (i, j), i < j 중 카탈로그에 양방향 값이 모두 있는 쌍을
+        {(i, j): ((분, 경로) i→j, (분, 경로) j→i)}로 반환.
+        """
+        rows = [self.index.get(catalogue_key(p)) for p in places]
+        found = {}
+        for i, ri in enumerate(rows):
+            if ri is None:
+                continue
+            for j in range(i + 1, len(rows)):
+                rj = rows[j]
+                if rj is None:
+                    continue
+                if ri == rj:
+                    # 같은 원본 장소의 분할 노드 (점심/저녁)
+                    found[(i, j)] = ((0, None), (0, None))
+                    continue
+                fwd, back = self._entry(ri, rj), self._entry(rj, ri)
+                if fwd < 0 or back < 0:
+                    continue
+                found[(i, j)] = (
+                    (int(self.minutes[fwd]), self._path(fwd)),
+                    (int(self.minutes[back]), self._path(back)),
+                )
+        return found
+
+    def matrices(self, places: List[Dict], found: Optional[Dict] = None):
+        """
+        모든 쌍이 카탈로그에 있으면 (time_matrix, raw, path_matrix), 하나라도 없으면 None
+        (found: 이미 조회한 lookup 결과)
+        """
+        n = len(places)
+        found = self.lookup(places) if found is None else found
+        if len(found) < n * (n - 1) // 2:
+            return None
+        time_matrix = [[0] * n for _ in range(n)]
+        paths: Dict[Tuple[int, int], Optional[np.ndarray]] = {}
+        for (i, j), ((m_ij, p_ij), (m_ji, p_ji)) in found.items():
+            time_matrix[i][j], time_matrix[j][i] = m_ij, m_ji
+            paths[(i, j)], paths[(j, i)] = p_ij, p_ji
+        return time_matrix, [[None] * n for _ in range(n)], LazyPathMatrix(_CataloguePaths(paths), n)
+
+class _CataloguePaths:
+    def __init__(self, paths: Dict[Tuple[int, int], Optional[np.ndarray]]):
+        self._paths = paths
+
+    def path(self, i: int, j: int) -> Optional[np.ndarray]:
+        return self._paths.get((i, j))
+
+@lru_cache(maxsize=2)
+def load_catalogue_matrix(path: str) -> CatalogueMatrix:
+    logger.info("카탈로그 매트릭스 로드: %s", path)
+    return CatalogueMatrix.load(path)
+
+def plausible_pairs(places: List[Dict], max_km: float = DEFAULT_MAX_PAIR_KM) -> np.ndarray:
+    """직선거리가 max_km 이하인 (i, j), i < j 쌍 배열"""
+    dist = haversine_matrix_km([p["y_cord"] for p in places], [p["x_cord"] for p in places])
+    i, j = np.nonzero(np.triu(dist <= max_km, k=1))
+    return np.column_stack((i, j))
+
+def _block_entries(
+    block: List[Dict],
+    wanted: Set[Tuple[int, int]],
+    api_key_id: Optional[str],
+    api_key: Optional[str],
+    road_graph_path: Optional[str],
+    route_cache: Optional[RouteCache]
+) -> Dict[Tuple[int, int], Entry]:
+    """block 내 wanted 쌍(i < j)의 양방향 (분, 경로). 실패/추정/도달 불가 쌍은 제외"""
+    if road_graph_path:
+        time_matrix, _, path_matrix = create_roadnet_matrices(block, load_road_graph(road_graph_path))
+        failed = set()
+    else:
+        n = len(block)
+        skip = {(i, j) for i in range(n) for j in range(i + 1, n)} - wanted
+        report = MatrixBuildReport()
+        time_matrix, _, path_matrix = create_matrices(
+            block, api_key_id, api_key, route_cache=route_cache, skip_pairs=skip, report=report
+        )
+        failed = {pair for pair, outcome in report.outcomes.items() if outcome in ESTIMATED_OUTCOMES}
+
+    entries = {}
+    for i, j in wanted - failed:
+        for a, b in ((i, j), (j, i)):
+            if time_matrix[a][b] >= UNREACHABLE_MINUTES:
+                continue
+            entries[(a, b)] = (time_matrix[a][b], path_matrix[a][b])
+    return entries
+
+def build_catalogue_matrix(
+    places: List[Dict],
+    out_path: str,
+    api_key_id: Optional[str] = None,
+    api_key: Optional[str] = None,
+    road_graph_path: Optional[str] = None,
+    route_cache: Optional[RouteCache] = None,
+    max_km: float = DEFAULT_MAX_PAIR_KM,
+    block_size: int = DEFAULT_BLOCK_SIZE
+) -> int:
+    """
+    카탈로그 장소 전체에 대해 직선거리 max_km 이하인 쌍의 이동 시간/경로를 계산해
+    압축 npz(CSR)로 저장하는 배치 작업. 저장한 방향별 항목 수를 반환한다.
+    road_graph_path가 있으면 로컬 도로 그래프, 없으면 Directions API(route_cache 우선)를 사용한다.
+    장소를 block_size개씩 나눠 블록 쌍 단위로 계산하므로 전체 n×n 행렬을 만들지 않는다.
+    """
+    keys = [catalogue_key(p) for p in places]
+    if len(set(keys)) != len(keys):
+        raise ValueError("카탈로그 키가 중복되었습니다.")
+
+    n = len(places)
+    n_blocks = (n + block_size - 1) // block_size
+    logger.info("카탈로그 매트릭스 배치: 장소 %d개, 블록 %d개 (≤ %.1fkm)", n, n_blocks, max_km)
+
+    entries: Dict[Tuple[int, int], Entry] = {}
+    for bi in range(n_blocks):
+        for bj in range(bi, n_blocks):
+            members = list(range(bi * block_size, min(n, (bi + 1) * block_size)))
+            head = len(members)
+            if bj != bi:
+                members += list(range(bj * block_size, min(n, (bj + 1) * block_size)))
+            block = [places[g] for g in members]
+
+            # 블록이 다르면 서로 다른 블록에 속한 쌍만 계산 (같은 블록 쌍은 대각 블록에서 처리)
+            wanted = {
+                (i, j) for i, j in plausible_pairs(block, max_km).tolist()
+                if bj == bi or (i < head <= j)
+            }
+            if not wanted:
+                continue
+
+            block_entries = _block_entries(block, wanted, api_key_id, api_key, road_graph_path, route_cache)
+            for (a, b), entry in block_entries.items():
+                entries[(members[a], members[b])] = entry
+            logger.info("블록 (%d, %d) 완료: %d쌍", bi, bj, len(wanted))
+
+    save_catalogue_matrix(out_path, keys, entries, max_km)
+    return len(entries)
+
+def save_catalogue_matrix(
+    out_path: str,
+    keys: List[str],
+    entries: Dict[Tuple[int, int], Entry],
+    max_km: float = DEFAULT_MAX_PAIR_KM
+) -> None:
+    """{(i, j): (분, 경로)}를 CSR 배열로 정렬해 압축 저장"""
+    order = sorted(entries)
+    rows = np.array([i for i, _ in order], dtype=np.int64)
+    indptr = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.add.at(indptr, rows + 1, 1)
+    np.cumsum(indptr, out=indptr)
+
+    offsets = np.zeros((len(order), 2), dtype=np.int64)
+    chunks, cursor = [], 0
+    for k, pair in enumerate(order):
+        path = entries[pair][1]
+        if path is not None and len(path):
+            pts = np.asarray(path, dtype=np.float32).reshape(-1, 2)
+            offsets[k] = (cursor, len(pts))
+            chunks.append(pts)
+            cursor += len(pts)
+
+    np.savez_compressed(
+        out_path,
+        keys=np.array(keys, dtype=str),
+        indptr=indptr,
+        indices=np.array([j for _, j in order], dtype=np.int32),
+        minutes=np.array([entries[pair][0] for pair in order], dtype=np.int32),
+        offsets=offsets,
+        points=np.concatenate(chunks) if chunks else np.zeros((0, 2), dtype=np.float32),
+        max_km=np.float64(max_km),
+    )
+    logger.info("카탈로그 매트릭스 저장: %s (장소 %d개, 항목 %d개, 좌표 %d개)", out_path, len(keys), len(order), cursor)
+
+if __name__ == "__main__":
+    # 사용법: python -m tripscheduler.api.catalogue catalogue_places.json catalogue_matrix.npz [--road-graph jeju_ch.npz]
+    parser = argparse.ArgumentParser(description="카탈로그 장소 간 이동 시간 매트릭스 배치 생성")
+    parser.add_argument("places", help="[{category, id, x_cord, y_cord}, ...] JSON 파일")
+    parser.add_argument("out", help="저장할 .npz 경로")
+    parser.add_argument("--road-graph", default=os.environ.get("ROAD_GRAPH_PATH"))
+    parser.add_argument("--max-km", type=float, default=DEFAULT_MAX_PAIR_KM)
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with open(args.places, "r", encoding="utf-8") as f:
+        catalogue_places = json.load(f)
+    build_catalogue_matrix(
+        catalogue_places, args.out,
+        api_key_id=os.environ.get("NAVER_API_CLIENT_ID"),
+        api_key=os.environ.get("NAVER_API_CLIENT_SECRET"),
+        road_graph_path=args.road_graph,
+        route_cache=load_route_cache_from_env(),
+        max_km=args.max_km,
+        block_size=args.block_size
+    )
@@ -1,10 +1,52 @@
-import requests
 import time
+import requests
 import logging
-from typing import List, Dict, Optional, Tuple
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Set, Tuple
+
+from tripscheduler.api.cache import RouteCache
+from tripscheduler.api.fetcher import TokenBucket, create_session, fetch_concurrently
+from tripscheduler.api.mock import estimate_minutes
+from tripscheduler.api.pruning import UNREACHABLE_MINUTES
+from tripscheduler.utils.geometry import to_path_array
 
 logger = logging.getLogger(__name__)
 
+DIRECTIONS_URL = "https://naveropenapi.apigw.ntruss.com/map-direction/v1/driving"
+FETCH_TIMEOUT_SEC = 5
+
+# 쌍별 처리 결과
+OUTCOME_CACHED   = "cached"    # 경로 캐시 적중
+OUTCOME_CATALOGUE = "catalogue"  # 카탈로그 사전 계산값
+OUTCOME_FETCHED  = "fetched"   # API 응답 사용
+OUTCOME_SKIPPED  = "skipped"   # 인접 불가능 쌍, 조회 생략
+OUTCOME_FAILED   = "failed"    # API 실패/경로 없음 → 추정치
+OUTCOME_TIMEOUT  = "timeout"   # 시간 예산 초과로 미조회 → 추정치
+ESTIMATED_OUTCOMES = (OUTCOME_FAILED, OUTCOME_TIMEOUT)
+
+@dataclass
+class MatrixBuildReport:
+    """
+    create_matrices의 쌍별 처리 결과. outcomes 키는 (i, j), i < j.
+    추정치로 채운 쌍은 raw[i][j]에도 {"estimated": True, "outcome": ...}로 표시된다.
+    """
+    outcomes: Dict[Tuple[int, int], str] = field(default_factory=dict)
+    elapsed_sec: float = 0.0
+
+    def record(self, i: int, j: int, outcome: str) -> None:
+        self.outcomes[(min(i, j), max(i, j))] = outcome
+
+    def is_estimated(self, i: int, j: int) -> bool:
+        return self.outcomes.get((min(i, j), max(i, j))) in ESTIMATED_OUTCOMES
+
+    @property
+    def estimated_pairs(self) -> Set[Tuple[int, int]]:
+        return {pair for pair, outcome in self.outcomes.items() if outcome in ESTIMATED_OUTCOMES}
+
+    def counts(self) -> Dict[str, int]:
+        return dict(Counter(self.outcomes.values()))
+
 def get_route_duration_and_path(
     route_entry: Dict
 ) -> Tuple[int, Optional[List[Dict]]]:
@@ -24,13 +66,15 @@ def get_route_duration_and_path(
     return minutes, optimal[0].get("path")
 
 def fetch_route(
-    start: str, goal: str, headers: Dict[str, str], timeout: float = 5
+    start: str, goal: str, headers: Dict[str, str], timeout: float = FETCH_TIMEOUT_SEC,
+    session: Optional[requests.Session] = None
 ) -> Dict:
     """
     실제 API 호출을 수행하고 JSON 응답을 반환.
+    session이 있으면 해당 커넥션 풀을 재사용한다.
     실패 시 빈 dict 반환.
     """
-    url = "https://naveropenapi.apigw.ntruss.com/map-direction/v1/driving"
+    url = DIRECTIONS_URL
     params = {"start": start, "goal": goal, "lang": "ko"}
 
     #백앤드 api 테스트
@@ -39,7 +83,7 @@ def fetch_route(
     logger.debug("🔑 요청 헤더: %s", headers)
 
     try:
-        resp = requests.get(url, headers=headers, params=params, timeout=timeout)
+        resp = (session or requests).get(url, headers=headers, params=params, timeout=timeout)
 
         logger.debug("📥 응답 코드: %s", resp.status_code)
         if resp.status_code == 401:
@@ -62,19 +106,34 @@ def update_direction_matrices(
 ):
     """
     dur_mat, path_mat의 [i][j]와 [j][i]를 업데이트
-    장소별 dur, path를 entry에서 추출
+    장소별 dur, path를 entry에서 추출 (path는 float32 배열로 보관)
     """
     minutes, path = get_route_duration_and_path(entry)
     dur_mat[i][j] = dur_mat[j][i] = minutes
-    path_mat[i][j] = path_mat[j][i] = path
+    path_mat[i][j] = path_mat[j][i] = to_path_array(path)
 
 def create_matrices(
     places: List[Dict],
     api_key_id: str,
     api_key: str,
     is_mock_enabled: bool = False,
-    mock_api_response: Optional[List[List[Dict]]] = None
+    mock_api_response: Optional[List[List[Dict]]] = None,
+    route_cache: Optional[RouteCache] = None,
+    max_workers: int = 8,
+    rate_per_sec: float = 10.0,
+    skip_pairs: Optional[Set[Tuple[int, int]]] = None,
+    latency_budget_sec: Optional[float] = None,
+    report: Optional[MatrixBuildReport] = None,
+    known_pairs: Optional[Dict[Tuple[int, int], Tuple]] = None
 ) -> Tuple[List[List[int]], List[List[Dict]], List[List[Optional[List[float]]]]]:
+    """
+    장소 쌍별 duration/path 매트릭스 생성.
+    API 모드에서 latency_budget_sec가 있으면 그 시간 안에 받지 못한 쌍과 실패한 쌍은
+    하버사인 추정치로 채운다. report가 있으면 쌍별 처리 결과를 기록한다.
+    known_pairs({(i, j): ((분, 경로) i→j, (분, 경로) j→i)})에 있는 쌍은 조회하지 않고 그 값을 쓴다.
+    """
+    started = time.monotonic()
+    report = report if report is not None else MatrixBuildReport()
     length = len(places)
     duration_matrix = [[0]*length for _ in range(length)]
     raw_api_response = [[None]*length for _ in range(length)]
@@ -84,6 +143,16 @@ def create_matrices(
         raw_api_response[i][j] = raw_api_response[j][i] = entry
         update_direction_matrices(i, j, duration_matrix, path_matrix, entry)
 
+    def estimate_pair(i: int, j: int, outcome: str):
+        # 직선 구간을 임시 경로로 사용
+        a, b = places[i], places[j]
+        raw_api_response[i][j] = raw_api_response[j][i] = {"estimated": True, "outcome": outcome}
+        duration_matrix[i][j] = duration_matrix[j][i] = estimate_minutes(a, b)
+        path_matrix[i][j] = path_matrix[j][i] = to_path_array(
+            [[a["x_cord"], a["y_cord"]], [b["x_cord"], b["y_cord"]]]
+        )
+        report.record(i, j, outcome)
+
     if is_mock_enabled:
         if mock_api_response is None:
             raise ValueError("mock=True일 때는 raw_matrix를 반드시 제공해야 합니다.")
@@ -98,16 +167,66 @@ def create_matrices(
         "X-NCP-APIGW-API-KEY-ID": api_key_id,
         "X-NCP-APIGW-API-KEY": api_key
     }
-    logger.info("API 모드: %d개 지점에 대해 처리 시작", length)
+    logger.info("API 모드: %d개 지점에 대해 처리 시작 (생략 %d쌍)", length, len(skip_pairs or ()))
+    pending = []
+    skip_pairs = skip_pairs or set()
+    known_pairs = known_pairs or {}
     for i in range(length):
         for j in range(i+1, length):
+            if (i, j) in skip_pairs:
+                # 실행 가능한 경로에 쓰일 수 없는 쌍: 조회 생략 후 큰 비용 부여
+                duration_matrix[i][j] = duration_matrix[j][i] = UNREACHABLE_MINUTES
+                report.record(i, j, OUTCOME_SKIPPED)
+                continue
+            if (i, j) in known_pairs:
+                (m_ij, p_ij), (m_ji, p_ji) = known_pairs[(i, j)]
+                duration_matrix[i][j], duration_matrix[j][i] = m_ij, m_ji
+                path_matrix[i][j], path_matrix[j][i] = p_ij, p_ji
+                report.record(i, j, OUTCOME_CATALOGUE)
+                continue
             start = f"{places[i]['x_cord']},{places[i]['y_cord']}"
             goal  = f"{places[j]['x_cord']},{places[j]['y_cord']}"
-            entry = fetch_route(start, goal, headers)
-            if not entry.get("route"):
-                logger.warning("유효 경로 없음: %s → %s", start, goal)
+            entry = route_cache.get(start, goal) if route_cache is not None else None
+            if entry is not None:
+                process_pair(i, j, entry)
+                report.record(i, j, OUTCOME_CACHED)
+            else:
+                pending.append((i, j, start, goal))
+
+    deadline = started + latency_budget_sec if latency_budget_sec is not None else None
+
+    def fetch_one(start: str, goal: str) -> Dict:
+        timeout = FETCH_TIMEOUT_SEC
+        if deadline is not None:
+            timeout = max(0.1, min(timeout, deadline - time.monotonic()))
+        return fetch_route(start, goal, headers, timeout=timeout, session=session)
+
+    # 마감으로 먼저 반환해도 진행 중인 호출이 모두 끝난 뒤에 Session을 닫는다
+    session = create_session(pool_size=max_workers)
+    entries = fetch_concurrently(
+        [(start, goal) for _, _, start, goal in pending],
+        fetch_one,
+        max_workers=max_workers,
+        limiter=TokenBucket(rate_per_sec),
+        deadline=deadline,
+        on_complete=session.close
+    )
+
+    for (i, j, start, goal), entry in zip(pending, entries):
+        if entry is None:
+            estimate_pair(i, j, OUTCOME_TIMEOUT)
+        elif not entry.get("route"):
+            logger.warning("유효 경로 없음: %s → %s (추정치 사용)", start, goal)
+            estimate_pair(i, j, OUTCOME_FAILED)
+        else:
+            if route_cache is not None:
+                route_cache.put(start, goal, entry)
             process_pair(i, j, entry)
-            time.sleep(0.1) 
+            report.record(i, j, OUTCOME_FETCHED)
 
+    report.elapsed_sec = time.monotonic() - started
+    logger.info("매트릭스 쌍별 처리 결과: %s (%.2fs)", report.counts(), report.elapsed_sec)
+    if route_cache is not None:
+        logger.info("경로 캐시 통계: %s", route_cache.stats())
     logger.info("거리·경로 매트릭스 생성 완료")
     return duration_matrix, raw_api_response, path_matrix
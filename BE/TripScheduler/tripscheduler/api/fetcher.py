@@ -0,0 +1,110 @@
+import time
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    초당 rate개의 토큰을 채우는 토큰 버킷.
+    acquire()는 토큰이 생길 때까지 대기한다. (스레드 안전)
+    """
+
+    def __init__(self, rate_per_sec: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate_per_sec <= 0:
+            raise ValueError("rate_per_sec는 0보다 커야 합니다.")
+        self.rate = rate_per_sec
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_sec)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1 - 1e-9:
+                    self._tokens = max(0.0, self._tokens - 1)
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+def create_session(pool_size: int = 8) -> requests.Session:
+    """keep-alive 커넥션 풀을 공유하는 Session 생성"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def fetch_concurrently(
+    pairs: List[Tuple[str, str]],
+    fetch_one: Callable[[str, str], Dict],
+    max_workers: int = 8,
+    limiter: Optional[TokenBucket] = None,
+    deadline: Optional[float] = None,
+    clock: Callable[[], float] = time.monotonic,
+    on_complete: Optional[Callable[[], None]] = None
+) -> List[Optional[Dict]]:
+    """
+    (start, goal) 쌍 목록을 스레드 풀로 동시에 호출하고, 입력 순서대로 응답을 반환.
+    limiter가 있으면 호출 직전에 토큰을 획득한다.
+    deadline(clock 기준 시각)이 있으면 그때까지 끝나지 않은 쌍은 None으로 반환하고 기다리지 않는다.
+    on_complete는 모든 호출 스레드가 끝난 뒤 한 번 호출된다 (마감으로 먼저 반환하면 남은 호출이 끝난 뒤
+    백그라운드에서). 호출 스레드가 공유하는 Session은 여기서 닫아야 진행 중인 호출과 겹치지 않는다.
+    """
+    if not pairs:
+        if on_complete is not None:
+            on_complete()
+        return []
+
+    def expired() -> bool:
+        return deadline is not None and clock() >= deadline
+
+    def task(pair: Tuple[str, str]) -> Optional[Dict]:
+        if expired():
+            return None
+        if limiter is not None:
+            limiter.acquire()
+            if expired():
+                return None
+        return fetch_one(*pair)
+
+    def finish(pool: ThreadPoolExecutor) -> None:
+        pool.shutdown(wait=True)
+        if on_complete is not None:
+            on_complete()
+
+    workers = max(1, min(max_workers, len(pairs)))
+    logger.info("동시 호출 시작: %d건, workers=%d", len(pairs), workers)
+    pool = ThreadPoolExecutor(max_workers=workers)
+    if deadline is None:
+        try:
+            return list(pool.map(task, pairs))
+        finally:
+            finish(pool)
+
+    not_done = ()
+    try:
+        futures = [pool.submit(task, pair) for pair in pairs]
+        _, not_done = wait(futures, timeout=max(0.0, deadline - clock()))
+        if not_done:
+            logger.warning("시간 예산 초과: %d/%d건 미완료", len(not_done), len(pairs))
+        return [f.result() if f.done() and not f.exception() else None for f in futures]
+    finally:
+        # 아직 시작하지 않은 호출은 취소하고, 진행 중인 호출은 각자의 timeout 후 끝나도록 기다리지 않는다
+        pool.shutdown(wait=False, cancel_futures=True)
+        if not_done:
+            threading.Thread(target=finish, args=(pool,), daemon=True).start()
+        else:
+            finish(pool)
@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+import logging
+import numpy as np
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from tripscheduler.api.directions import get_route_duration_and_path
+
+logger = logging.getLogger(__name__)
+
+# 바이너리 fixture 디렉토리 구성 파일
+DURATIONS_FILE = "durations.npy"  # int32 (n, n) 분 단위 소요 시간
+OFFSETS_FILE   = "offsets.npy"    # int64 (n, n, 2) points 내 [시작 위치, 점 개수]
+POINTS_FILE    = "points.npy"     # float32 (total, 2) 모든 경로 좌표를 이어붙인 blob
+
+def is_matrix_fixture(path: Optional[str]) -> bool:
+    """path가 convert_raw_fixture로 만든 바이너리 fixture 디렉토리인지"""
+    return bool(path) and os.path.isfile(os.path.join(path, DURATIONS_FILE))
+
+def convert_raw_fixture(json_path: str, out_dir: str) -> None:
+    """
+    directions_raw_data.json 형식(n×n 응답 행렬)을 바이너리 fixture로 변환.
+    create_matrices mock 모드와 같게 상삼각 [i][j] 응답을 양방향에 사용한다.
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    n = len(raw)
+    durations = np.zeros((n, n), dtype=np.int32)
+    offsets = np.zeros((n, n, 2), dtype=np.int64)
+    chunks: List[np.ndarray] = []
+    cursor = 0
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            minutes, path = get_route_duration_and_path(raw[i][j] or {})
+            durations[i, j] = durations[j, i] = minutes
+            if path:
+                pts = np.asarray(path, dtype=np.float32).reshape(-1, 2)
+                offsets[i, j] = offsets[j, i] = (cursor, len(pts))
+                chunks.append(pts)
+                cursor += len(pts)
+
+    points = np.concatenate(chunks) if chunks else np.zeros((0, 2), dtype=np.float32)
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, DURATIONS_FILE), durations)
+    np.save(os.path.join(out_dir, OFFSETS_FILE), offsets)
+    np.save(os.path.join(out_dir, POINTS_FILE), points)
+    logger.info("fixture 변환 완료: %s → %s (%d×%d, 좌표 %d개)", json_path, out_dir, n, n, len(points))
+
+class _LazyPathRow:
+    def __init__(self, source, i: int, n: int):
+        self._source, self._i, self._n = source, i, n
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, j: int) -> Optional[np.ndarray]:
+        if not 0 <= j < self._n:
+            raise IndexError(j)
+        return self._source.path(self._i, j)
+
+class LazyPathMatrix:
+    """
+    path_matrix[i][j] 접근 시에만 source.path(i, j)로 구간을 읽는 지연 행렬.
+    (memmap fixture, 도로 그래프 경로 복원 등에서 사용)
+    """
+
+    def __init__(self, source, n: int):
+        self._source, self._n = source, n
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i: int) -> _LazyPathRow:
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return _LazyPathRow(self._source, i, self._n)
+
+class MatrixFixture:
+    """memory-map으로 연 바이너리 fixture"""
+
+    def __init__(self, path: str):
+        self.path_dir = path
+        self.durations = np.load(os.path.join(path, DURATIONS_FILE), mmap_mode="r")
+        self.offsets = np.load(os.path.join(path, OFFSETS_FILE), mmap_mode="r")
+        self.points = np.load(os.path.join(path, POINTS_FILE), mmap_mode="r")
+
+    @property
+    def size(self) -> int:
+        return self.durations.shape[0]
+
+    def path(self, i: int, j: int) -> Optional[np.ndarray]:
+        start, count = self.offsets[i, j]
+        if count == 0:
+            return None
+        return self.points[start:start + count]
+
+    def matrices(self, n: int) -> Tuple[List[List[int]], List[List[None]], LazyPathMatrix]:
+        """앞쪽 n개 장소에 대한 (time_matrix, raw, path_matrix) 반환"""
+        if n > self.size:
+            raise ValueError(f"fixture 크기({self.size})보다 장소 수({n})가 많습니다.")
+        time_matrix = self.durations[:n, :n].tolist()
+        raw = [[None] * n for _ in range(n)]
+        return time_matrix, raw, LazyPathMatrix(self, n)
+
+@lru_cache(maxsize=8)
+def load_matrix_fixture(path: str) -> MatrixFixture:
+    """프로세스 내에서 같은 fixture는 한 번만 연다"""
+    logger.info("바이너리 fixture 로드: %s", path)
+    return MatrixFixture(path)
+
+if __name__ == "__main__":
+    # 사용법: python -m tripscheduler.api.fixture tests/data/directions_raw_data.json tests/data/directions.matrix
+    convert_raw_fixture(sys.argv[1], sys.argv[2])
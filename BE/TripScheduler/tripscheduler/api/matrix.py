@@ -0,0 +1,186 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from tripscheduler.api.prepare import prepare_matrices
+from tripscheduler.api.catalogue import catalogue_key
+from tripscheduler.api.directions import ESTIMATED_OUTCOMES, OUTCOME_SKIPPED, MatrixBuildReport
+from tripscheduler.api.cache import RouteCache
+from tripscheduler.api.pruning import find_unusable_pairs, group_windows_by_key
+
+logger = logging.getLogger(__name__)
+
+def node_key(place: Dict) -> Any:
+    """
+    매트릭스 키 "category:원본 id" (카탈로그 키와 동일).
+    id는 카탈로그 테이블(category)마다 따로 매겨지므로 category 없이 id만 쓰면 다른 장소가 행을 공유한다.
+    분할된 식당 노드는 원본 org_id를 쓴다.
+    """
+    return catalogue_key(place)
+
+def location_key(place: Dict) -> Tuple[float, float]:
+    """같은 좌표(소수점 6자리, 약 0.1m)의 장소는 매트릭스 행 하나를 공유한다"""
+    return round(float(place["x_cord"]), 6), round(float(place["y_cord"]), 6)
+
+@dataclass
+class DayMatrices:
+    """
+    하루치 전체 노드에 대한 매트릭스.
+    keys[i]가 i번째 행/열의 node_key이며, slice()로 조합별 부분 매트릭스를 만든다.
+    aliases(node_key → keys의 node_key)는 같은 좌표라서 다른 장소의 행을 공유하는 장소.
+    """
+    keys: List[Any]
+    time_matrix: List[List[int]]
+    raw: List[List[Optional[Dict]]]
+    path_matrix: List[List[Optional[List[float]]]]
+    report: Optional[MatrixBuildReport] = None
+    aliases: Dict[Any, Any] = field(default_factory=dict)
+    index: Dict[Any, int] = field(init=False)
+
+    def __post_init__(self):
+        self.index = {k: i for i, k in enumerate(self.keys)}
+        for alias, owner in self.aliases.items():
+            self.index[alias] = self.index[owner]
+
+    def rows_for(self, places: List[Dict]) -> List[int]:
+        return [self.index[node_key(p)] for p in places]
+
+    def slice(
+        self, places: List[Dict]
+    ) -> Tuple[List[List[int]], List[List[Optional[Dict]]], List[List[Optional[List[float]]]]]:
+        """places 순서대로 행/열을 골라 (time_matrix, raw, path_matrix)를 반환"""
+        rows = self.rows_for(places)
+        return _pick(self.time_matrix, rows), _pick(self.raw, rows), _pick(self.path_matrix, rows)
+
+    def subset(self, places: List[Dict]) -> "DayMatrices":
+        """places에 필요한 행/열만 담은 DayMatrices (다른 프로세스로 넘길 때 사용). report도 새 인덱스로 옮긴다"""
+        keys = list(dict.fromkeys(node_key(p) for p in places))
+        rows = list(dict.fromkeys(self.index[k] for k in keys))
+        aliases = {k: self.keys[self.index[k]] for k in keys if self.keys[self.index[k]] != k}
+        report = None
+        if self.report is not None:
+            position = {r: n for n, r in enumerate(rows)}
+            report = MatrixBuildReport(elapsed_sec=self.report.elapsed_sec)
+            for (a, b), outcome in self.report.outcomes.items():
+                if a in position and b in position:
+                    report.record(position[a], position[b], outcome)
+        return DayMatrices(
+            [self.keys[r] for r in rows],
+            _pick(self.time_matrix, rows), _pick(self.raw, rows), _pick(self.path_matrix, rows),
+            report, aliases
+        )
+
+    def unreliable_pairs(self) -> Set[Tuple[int, int]]:
+        """
+        재사용하면 안 되는 행 쌍 (i, j), i < j: 당시 윈도우 기준으로 조회를 생략한 쌍(도달 불가 값)과
+        시간 예산 초과/실패로 추정치를 넣은 쌍. 윈도우가 바뀌거나 다시 조회하면 값이 달라질 수 있다.
+        """
+        if self.report is None:
+            return set()
+        return {
+            pair for pair, outcome in self.report.outcomes.items()
+            if outcome == OUTCOME_SKIPPED or outcome in ESTIMATED_OUTCOMES
+        }
+
+    def covers(self, keys: List[Any]) -> bool:
+        """keys의 모든 쌍을 이 매트릭스에서 그대로 재사용할 수 있는지"""
+        if not all(k in self.index for k in keys):
+            return False
+        rows = sorted({self.index[k] for k in keys})
+        unreliable = self.unreliable_pairs()
+        return not any((a, b) in unreliable for n, a in enumerate(rows) for b in rows[n + 1:])
+
+    def known_pairs(self, keys: List[Any]) -> Dict[Tuple[int, int], Tuple]:
+        """
+        keys 순서의 인덱스 쌍 (i, j), i < j 중 이 매트릭스에 이미 있는 쌍을
+        create_matrices의 known_pairs 형식({(i, j): ((분, 경로) i→j, (분, 경로) j→i)})으로 반환
+        (조회를 생략했거나 추정치를 넣은 쌍은 제외해 새 윈도우로 다시 판단/조회하게 한다)
+        """
+        rows = [self.index.get(k) for k in keys]
+        unreliable = self.unreliable_pairs()
+        known = {}
+        for i, ri in enumerate(rows):
+            for j in range(i + 1, len(rows)):
+                rj = rows[j]
+                if ri is None or rj is None or (min(ri, rj), max(ri, rj)) in unreliable:
+                    continue
+                known[(i, j)] = (
+                    (self.time_matrix[ri][rj], self.path_matrix[ri][rj] if self.path_matrix else None),
+                    (self.time_matrix[rj][ri], self.path_matrix[rj][ri] if self.path_matrix else None),
+                )
+        return known
+
+def _pick(matrix, rows: List[int]):
+    if not matrix:
+        return [[None] * len(rows) for _ in rows]
+    return [[matrix[r][c] for c in rows] for r in rows]
+
+def prepare_day_matrices(
+    places: List[Dict],
+    api_key_id: str,
+    api_key: str,
+    use_mock: bool = False,
+    mock_raw_path: Optional[str] = None,
+    route_cache: Optional[RouteCache] = None,
+    windows: Optional[List[Tuple[int, int, Optional[str]]]] = None,
+    road_graph_path: Optional[str] = None,
+    latency_budget_sec: Optional[float] = None,
+    catalogue_path: Optional[str] = None,
+    previous: Optional[Union[DayMatrices, Sequence[DayMatrices]]] = None,
+) -> DayMatrices:
+    """
+    분할 노드를 포함한 하루치 장소 전체에 대해 매트릭스를 한 번만 생성.
+    같은 원본 장소(node_key)의 분할 노드와 같은 좌표의 장소(raw/fixture mock 제외)는 하나의 행을 공유한다.
+    windows(places와 같은 순서)가 있으면 실제 API 모드에서 인접 불가능한 쌍은 조회하지 않는다.
+    API 모드의 쌍별 처리 결과(추정치 여부 등)는 report에 keys 인덱스 기준으로 남는다.
+    previous(편집 전 하루 매트릭스)가 있으면 실제로 계산된 장소 쌍은 다시 조회하지 않고,
+    새 장소가 없으면 previous에서 필요한 행/열만 잘라 그대로 반환한다.
+    편집 전 윈도우로 조회를 생략한 쌍과 추정치 쌍은 재사용하지 않는다 (시간 변경 후 다시 판단).
+    previous는 여러 개일 수 있다 (분할 풀이에서 공통 쌍 매트릭스 + 클러스터별 매트릭스).
+    """
+    # raw/fixture mock은 행 순서로 응답을 찾으므로 좌표 병합 없이 장소별로 행을 만든다
+    merge_colocated = not (use_mock and mock_raw_path)
+    unique_places, keys, aliases, owners = [], [], {}, {}
+    for place in places:
+        key = node_key(place)
+        if key in keys or key in aliases:
+            continue
+        if merge_colocated:
+            owner = owners.setdefault(location_key(place), key)
+            if owner != key:
+                aliases[key] = owner
+                continue
+        keys.append(key)
+        unique_places.append(place)
+
+    previous = [previous] if isinstance(previous, DayMatrices) else list(previous or [])
+    for prev in previous:
+        if prev.covers([*keys, *aliases]):
+            logger.info("하루 매트릭스 재사용: 새 장소 없음 (%d개)", len(keys) + len(aliases))
+            return prev.subset(places)
+
+    known_pairs = None
+    for prev in previous:
+        known_pairs = {**(known_pairs or {}), **prev.known_pairs(keys)}
+
+    skip_pairs = None
+    if windows is not None and not use_mock and not road_graph_path:
+        grouped = group_windows_by_key(places, windows, lambda p: aliases.get(node_key(p), node_key(p)))
+        skip_pairs = find_unusable_pairs(unique_places, [grouped[k] for k in keys])
+
+    logger.info("하루 매트릭스 생성: 노드 %d개 → 고유 장소 %d개 (같은 좌표 병합 %d개)",
+                len(places), len(unique_places), len(aliases))
+    report = MatrixBuildReport()
+    time_matrix, raw, path_matrix = prepare_matrices(
+        unique_places, api_key_id, api_key,
+        use_mock=use_mock,
+        mock_raw_path=mock_raw_path,
+        route_cache=route_cache,
+        skip_pairs=skip_pairs,
+        road_graph_path=road_graph_path,
+        latency_budget_sec=latency_budget_sec,
+        report=report,
+        catalogue_path=catalogue_path,
+        known_pairs=known_pairs
+    )
+    return DayMatrices(keys, time_matrix, raw, path_matrix, report, aliases)
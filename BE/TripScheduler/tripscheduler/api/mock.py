@@ -1,21 +1,94 @@
+import sys
+import json
 import math
+import logging
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 
-def haversine_distance(lat1, lon1, lat2, lon2):
-    R = 6371  # 지구 반지름 (km)
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371  # 지구 반지름 (km)
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """두 좌표 사이의 대원 거리(km)"""
     phi1, phi2 = math.radians(lat1), math.radians(lat2)
     delta_phi = math.radians(lat2 - lat1)
     delta_lambda = math.radians(lon2 - lon1)
     a = math.sin(delta_phi / 2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2)**2
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return int(round(R * c)) + 10  # 여유 시간 10분 추가
+    return EARTH_RADIUS_KM * c
+
+def haversine_distance(lat1, lon1, lat2, lon2):
+    return int(round(haversine_km(lat1, lon1, lat2, lon2))) + 10  # 여유 시간 10분 추가
+
+def haversine_matrix_km(lats, lons) -> np.ndarray:
+    """위도/경도 배열로 n×n 대원 거리(km) 행렬을 한 번에 계산"""
+    phi = np.radians(np.asarray(lats, dtype=np.float64))
+    lam = np.radians(np.asarray(lons, dtype=np.float64))
+    d_phi = phi[:, None] - phi[None, :]
+    d_lam = lam[:, None] - lam[None, :]
+    a = np.sin(d_phi / 2)**2 + np.cos(phi)[:, None] * np.cos(phi)[None, :] * np.sin(d_lam / 2)**2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+@dataclass(frozen=True)
+class RoadTimeModel:
+    """직선거리(km) → 도로 이동 시간(분) 선형 회귀 모델: minutes = intercept + slope * km"""
+    intercept: float
+    slope: float
 
-def create_distance_matrix(places):
+    def predict(self, km):
+        return self.intercept + self.slope * np.asarray(km, dtype=np.float64)
+
+# tests/data/directions_raw_data.json 의 실제 응답 42건으로 적합한 계수 (fit_road_time_model)
+DEFAULT_ROAD_TIME_MODEL = RoadTimeModel(intercept=1.45, slope=2.07)
+
+def fit_road_time_model(raw_matrix: List[List[Optional[Dict]]]) -> RoadTimeModel:
+    """
+    저장된 Directions 응답 행렬에서 (출발·도착 직선거리, 소요 시간) 표본을 모아
+    최소제곱으로 RoadTimeModel을 적합한다.
+    """
+    km, minutes = [], []
+    for row in raw_matrix:
+        for entry in row:
+            optimal = ((entry or {}).get("route") or {}).get("traoptimal")
+            if not optimal:
+                continue
+            summary = optimal[0].get("summary", {})
+            start = summary.get("start", {}).get("location")
+            goal = summary.get("goal", {}).get("location")
+            if not start or not goal:
+                continue
+            km.append(haversine_km(start[1], start[0], goal[1], goal[0]))
+            minutes.append(summary.get("duration", 0) / 60000)
+
+    if len(km) < 2:
+        raise ValueError("회귀 모델 적합에 필요한 경로 응답이 부족합니다.")
+
+    slope, intercept = np.polyfit(km, minutes, 1)
+    logger.info("도로 시간 모델 적합: %d건, intercept=%.3f, slope=%.3f", len(km), intercept, slope)
+    return RoadTimeModel(intercept=float(intercept), slope=float(slope))
+
+def create_distance_matrix(places, model: RoadTimeModel = DEFAULT_ROAD_TIME_MODEL):
+    """
+    장소 좌표(x_cord=경도, y_cord=위도)로 하버사인 거리를 벡터 연산한 뒤
+    model로 분 단위 이동 시간 행렬을 만든다.
+    """
     n = len(places)
-    matrix = [[0] * n for _ in range(n)]
-    for i, pi in enumerate(places):
-        for j in range(i + 1, n):
-            lat1, lon1 = pi["x_cord"], pi["y_cord"]
-            lat2, lon2 = places[j]["x_cord"], places[j]["y_cord"]
-            d = haversine_distance(lat1, lon1, lat2, lon2)
-            matrix[i][j] = matrix[j][i] = d
-    return matrix
+    if n == 0:
+        return []
+    lats = [p["y_cord"] for p in places]
+    lons = [p["x_cord"] for p in places]
+    minutes = np.rint(model.predict(haversine_matrix_km(lats, lons))).astype(int)
+    np.fill_diagonal(minutes, 0)
+    return minutes.tolist()
+
+def estimate_minutes(a: Dict, b: Dict, model: RoadTimeModel = DEFAULT_ROAD_TIME_MODEL) -> int:
+    """두 장소 사이 이동 시간(분) 추정치 (API 응답을 받지 못한 쌍의 대체값)"""
+    km = haversine_km(a["y_cord"], a["x_cord"], b["y_cord"], b["x_cord"])
+    return int(round(float(model.predict(km))))
+
+if __name__ == "__main__":
+    # 사용법: python -m tripscheduler.api.mock tests/data/directions_raw_data.json
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        print(fit_road_time_model(json.load(f)))
@@ -1,10 +1,15 @@
 import logging
 import json
-from typing import Optional, Tuple, List, Dict
+from typing import Optional, Set, Tuple, List, Dict
 
 from tripscheduler.api.snap       import snap_to_road
-from tripscheduler.api.directions import create_matrices
+from tripscheduler.api.directions import MatrixBuildReport, create_matrices
 from tripscheduler.api.mock       import create_distance_matrix
+from tripscheduler.api.cache      import RouteCache
+from tripscheduler.api.fixture    import is_matrix_fixture, load_matrix_fixture
+from tripscheduler.api.roadnet    import create_roadnet_matrices, load_road_graph
+from tripscheduler.api.catalogue  import load_catalogue_matrix
+from tripscheduler.utils.metrics  import span
 
 logger = logging.getLogger(__name__)
 
@@ -14,22 +19,53 @@ def prepare_matrices(
     api_key: str,
     use_mock: bool = False,
     mock_raw_path: Optional[str] = None,
+    route_cache: Optional[RouteCache] = None,
+    skip_pairs: Optional[Set[Tuple[int, int]]] = None,
+    road_graph_path: Optional[str] = None,
+    latency_budget_sec: Optional[float] = None,
+    report: Optional[MatrixBuildReport] = None,
+    catalogue_path: Optional[str] = None,
+    known_pairs: Optional[Dict[Tuple[int, int], Tuple]] = None,
 ) -> Tuple[List[List[int]], List[List[Dict]], List[List[Optional[List[float]]]]]:
     """
     장소 리스트를 받아:
       - time_matrix, raw, path_matrix를 반환.
-      - use_mock+mock_raw_path 있으면 mock으로,
+      - use_mock+mock_raw_path 있으면 mock으로 (바이너리 fixture 디렉토리면 memmap으로 지연 로드),
       - use_mock만 있으면 하버사인 mock,
-      - 아니면 실제 API (스냅→directions)
+      - catalogue_path의 사전 계산 매트릭스에 모든 쌍이 있으면 그대로 사용,
+      - road_graph_path가 있으면 로컬 도로 그래프(오프라인),
+      - 아니면 실제 API (스냅→directions), route_cache가 있으면 캐시 우선 조회
+        skip_pairs에 포함된 쌍은 조회하지 않음
+        latency_budget_sec 안에 받지 못한 쌍은 하버사인 추정치로 채우고 report에 기록
+        카탈로그 또는 known_pairs(이전 매트릭스 재사용 등)에 있는 쌍은 조회하지 않음
+    "prepare_matrices" span에 장소 수와 쌍별 처리 결과(report.counts())를 남긴다.
     """
+    report = report if report is not None else MatrixBuildReport()
+    with span("prepare_matrices", places=len(places)) as attrs:
+        matrices = _build_matrices(
+            places, api_key_id, api_key, use_mock, mock_raw_path, route_cache, skip_pairs,
+            road_graph_path, latency_budget_sec, report, catalogue_path, known_pairs
+        )
+        attrs["pairs"] = report.counts()
+    return matrices
+
+def _build_matrices(
+    places, api_key_id, api_key, use_mock, mock_raw_path, route_cache, skip_pairs,
+    road_graph_path, latency_budget_sec, report, catalogue_path, known_pairs
+):
     # 1) mock + raw 데이터
+    if use_mock and is_matrix_fixture(mock_raw_path):
+        logger.info("Mock(fixture) 모드: %s", mock_raw_path)
+        return load_matrix_fixture(mock_raw_path).matrices(len(places))
+
     if use_mock and mock_raw_path:
         logger.info("Mock(raw) 모드: %s 로드", mock_raw_path)
         with open(mock_raw_path, 'r', encoding='utf-8') as f:
             mock_response_matrix = json.load(f)
         return create_matrices(
             places, api_key_id, api_key,
-            is_mock_enabled=True, mock_api_response=mock_response_matrix
+            is_mock_enabled=True, mock_api_response=mock_response_matrix,
+            report=report
         )
 
     # 2) mock only
@@ -41,7 +77,24 @@ def prepare_matrices(
         path_matrix = [[None] * n for _ in range(n)]
         return duration_matrix, raw_api_response, path_matrix
 
-    # 3) 실제 API: 좌표 스냅 후 matrix 생성 snap 이 필요한가? 나중에 고민
+    # 3) 카탈로그 사전 계산 매트릭스: 알려진 장소끼리는 온라인 계산 없음
+    known_pairs = dict(known_pairs or {})
+    if catalogue_path:
+        catalogue = load_catalogue_matrix(catalogue_path)
+        found = catalogue.lookup(places)
+        full = catalogue.matrices(places, found=found)
+        if full is not None:
+            logger.info("카탈로그 모드: %d개 지점 전부 사전 계산됨", len(places))
+            return full
+        logger.info("카탈로그 부분 적중: %d쌍", len(found))
+        known_pairs = {**found, **known_pairs}
+
+    # 4) 로컬 도로 그래프: 네트워크 호출 없이 many-to-many 최단 시간 계산
+    if road_graph_path:
+        logger.info("도로 그래프 모드: %s", road_graph_path)
+        return create_roadnet_matrices(places, load_road_graph(road_graph_path))
+
+    # 5) 실제 API: 좌표 스냅 후 matrix 생성 snap 이 필요한가? 나중에 고민
     # for p in places:
     #     p['y_cord'], p['x_cord'] = snap_to_road(
     #         p['y_cord'], p['x_cord'],
@@ -50,5 +103,10 @@ def prepare_matrices(
 
     return create_matrices(
         places, api_key_id, api_key,
-        is_mock_enabled=False, mock_api_response=None
+        is_mock_enabled=False, mock_api_response=None,
+        route_cache=route_cache,
+        skip_pairs=skip_pairs,
+        latency_budget_sec=latency_budget_sec,
+        report=report,
+        known_pairs=known_pairs
     )
\ No newline at end of file
@@ -0,0 +1,73 @@
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+from tripscheduler.api.mock import haversine_matrix_km
+
+logger = logging.getLogger(__name__)
+
+# 조회하지 않은 쌍에 넣는 비용. Time 차원 용량(global_end)보다 커서 OR-Tools가 사용하지 않는다.
+UNREACHABLE_MINUTES = 10_000
+# 직선거리 하한 계산용 최고 속도 (제주 도로 제한속도 기준)
+MAX_SPEED_KMH = 80
+# add_time_constraints에서 윈도우 양끝에 허용하는 여유(분)
+WINDOW_SLACK = 10
+# 시작/종료 노드가 될 수 있는 카테고리. 출발 시각이 윈도우와 무관하므로 제약 없이 취급
+ANCHOR_CATEGORIES = ("accommodation", "transport")
+
+Window = Tuple[Optional[int], Optional[int], Optional[str]]
+
+def can_follow(w_from: Window, service_time: int, w_to: Window, lower_bound: float) -> bool:
+    """w_from 노드 방문 직후 w_to 노드에 윈도우 안에 도착할 수 있는지"""
+    o_from, _, meal_from = w_from
+    _, c_to, meal_to = w_to
+    if o_from is None or c_to is None:
+        return True
+    if meal_from and meal_from == meal_to:
+        # 같은 끼니의 식당은 한 조합에 함께 들어가지 않는다
+        return False
+    return (o_from - WINDOW_SLACK) + service_time + lower_bound <= c_to + WINDOW_SLACK
+
+def find_unusable_pairs(
+    places: List[Dict],
+    windows: List[List[Window]]
+) -> Set[Tuple[int, int]]:
+    """
+    어느 방향으로도 인접할 수 없는 (i, j) 쌍(i < j)을 반환.
+    windows[i]는 i번째 장소가 가질 수 있는 윈도우 목록(분할 식당은 여러 개).
+    """
+    unusable = set()
+    n = len(places)
+    if n < 2:
+        return unusable
+    # 직선거리 / 최고 속도로 계산한 이동 시간 하한(분)
+    lower_bounds = haversine_matrix_km(
+        [p["y_cord"] for p in places], [p["x_cord"] for p in places]
+    ) / MAX_SPEED_KMH * 60
+    windows = [
+        [(None, None, None)] if p.get("category") in ANCHOR_CATEGORIES else wins
+        for p, wins in zip(places, windows)
+    ]
+    for i in range(n):
+        for j in range(i + 1, n):
+            lb = lower_bounds[i, j]
+            svc_i = places[i].get("service_time", 0)
+            svc_j = places[j].get("service_time", 0)
+            usable = any(
+                can_follow(wi, svc_i, wj, lb) or can_follow(wj, svc_j, wi, lb)
+                for wi in windows[i] for wj in windows[j]
+            )
+            if not usable:
+                unusable.add((i, j))
+    logger.info("조회 생략 가능한 쌍: %d / %d", len(unusable), n * (n - 1) // 2)
+    return unusable
+
+def group_windows_by_key(
+    places: List[Dict],
+    windows: List[Window],
+    key_fn
+) -> Dict[object, List[Window]]:
+    """분할 노드의 윈도우를 키(org_id)별로 모은다"""
+    grouped: Dict[object, List[Window]] = {}
+    for place, win in zip(places, windows):
+        grouped.setdefault(key_fn(place), []).append(win)
+    return grouped
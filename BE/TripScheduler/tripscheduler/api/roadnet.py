@@ -0,0 +1,439 @@
+import sys
+import math
+import heapq
+import logging
+import numpy as np
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from tripscheduler.api.fixture import LazyPathMatrix
+from tripscheduler.api.pruning import UNREACHABLE_MINUTES
+
+logger = logging.getLogger(__name__)
+
+# 장소 좌표 → 가장 가까운 도로 노드까지의 접근 속도 (직선거리 기준)
+ACCESS_SPEED_KMH = 30
+METERS_PER_DEGREE = 111_320.0
+# CH 전처리 중 witness 탐색에서 확정할 최대 노드 수
+WITNESS_SETTLE_LIMIT = 60
+# (min, +) 행렬곱을 나눠 계산할 만남 노드 묶음 크기
+MIN_PLUS_CHUNK = 64
+
+Edge = Tuple[int, int, float, bool]  # (u, v, 소요 초, 일방통행 여부)
+
+def _to_csr(n: int, src, dst, weights, mids=None):
+    src = np.asarray(src, dtype=np.int64)
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(indptr, src + 1, 1)
+    np.cumsum(indptr, out=indptr)
+    out = [indptr, np.asarray(dst, dtype=np.int32)[order], np.asarray(weights, dtype=np.float32)[order]]
+    if mids is not None:
+        out.append(np.asarray(mids, dtype=np.int32)[order])
+    return out
+
+def save_road_graph(
+    path: str,
+    lons: Sequence[float],
+    lats: Sequence[float],
+    edges: Iterable[Edge]
+) -> None:
+    """
+    노드 좌표와 간선 목록을 CSR 인접 배열(.npz)로 저장.
+    OSM 추출본 등은 (u, v, 초, 일방통행) 간선 목록으로 변환한 뒤 이 함수로 저장한다.
+    """
+    n = len(lons)
+    src, dst, cost = [], [], []
+    for u, v, sec, oneway in edges:
+        src.append(u); dst.append(v); cost.append(sec)
+        if not oneway:
+            src.append(v); dst.append(u); cost.append(sec)
+
+    indptr, indices, seconds = _to_csr(n, src, dst, cost)
+    np.savez_compressed(
+        path,
+        lon=np.asarray(lons, dtype=np.float64),
+        lat=np.asarray(lats, dtype=np.float64),
+        indptr=indptr,
+        indices=indices,
+        seconds=seconds,
+    )
+    logger.info("도로 그래프 저장: %s (노드 %d, 간선 %d)", path, n, len(dst))
+
+class RoadGraph:
+    """
+    CSR 인접 배열로 표현한 도로 그래프.
+    build_contraction_hierarchy로 전처리한 파일이면 up/down 계층 그래프도 함께 가진다.
+    """
+
+    def __init__(self, lon, lat, indptr, indices, seconds, hierarchy: Optional[Dict[str, np.ndarray]] = None):
+        self.lon = lon
+        self.lat = lat
+        self.indptr = indptr
+        self.indices = indices
+        self.seconds = seconds
+        self.hierarchy = hierarchy
+        self._adj = None
+        self._up = self._down = None
+        self._edge_mid = None
+
+    @classmethod
+    def load(cls, path: str) -> "RoadGraph":
+        data = np.load(path)
+        hierarchy = None
+        if "up_indptr" in data.files:
+            hierarchy = {k: data[k] for k in data.files if k.startswith(("up_", "dn_"))}
+        return cls(data["lon"], data["lat"], data["indptr"], data["indices"], data["seconds"], hierarchy)
+
+    @property
+    def size(self) -> int:
+        return len(self.lon)
+
+    def adjacency(self) -> List[List[Tuple[int, float]]]:
+        """원본 그래프 인접 리스트 (파이썬 리스트로 한 번만 변환)"""
+        if self._adj is None:
+            self._adj = _csr_to_lists(self.indptr, self.indices, self.seconds)
+        return self._adj
+
+    def nearest_nodes(self, lons: Sequence[float], lats: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """각 좌표에서 가장 가까운 노드 번호와 거리(m)를 반환 (평면 근사)"""
+        nodes = np.empty(len(lons), dtype=np.int64)
+        dists = np.empty(len(lons), dtype=np.float64)
+        for k, (x, y) in enumerate(zip(lons, lats)):
+            dx = (self.lon - x) * METERS_PER_DEGREE * math.cos(math.radians(y))
+            dy = (self.lat - y) * METERS_PER_DEGREE
+            d2 = dx * dx + dy * dy
+            nodes[k] = int(np.argmin(d2))
+            dists[k] = math.sqrt(d2[nodes[k]])
+        return nodes, dists
+
+    def many_to_many(self, sources: Sequence[int], targets: Sequence[int]) -> "RoadQuery":
+        """
+        sources × targets 최단 시간(초)을 계산.
+        계층(CH)이 있으면 source/target별 상향 탐색 후 만남 노드 위에서 (min, +) 결합,
+        없으면 source별 Dijkstra를 사용한다.
+        """
+        if self.hierarchy is None:
+            return self._many_to_many_dijkstra(sources, targets)
+
+        if self._up is None:
+            h = self.hierarchy
+            self._up = _csr_to_lists(h["up_indptr"], h["up_indices"], h["up_weights"])
+            self._down = _csr_to_lists(h["dn_indptr"], h["dn_indices"], h["dn_weights"])
+            self._edge_mid = _edge_mid_map(h)
+
+        fwd = [_upward_search(self._up, int(s)) for s in sources]
+        back = [_upward_search(self._down, int(t)) for t in targets]
+
+        # 두 탐색 공간이 만나는 노드 집합 위에서 (min, +) 행렬곱으로 거리 계산
+        space = sorted(set().union(*(d.keys() for d, _ in fwd)) & set().union(*(d.keys() for d, _ in back)))
+        col = {v: k for k, v in enumerate(space)}
+        F = np.full((len(sources), len(space)), np.inf)
+        B = np.full((len(space), len(targets)), np.inf)
+        for si, (dist, _) in enumerate(fwd):
+            for v, d in dist.items():
+                if v in col:
+                    F[si, col[v]] = d
+        for ti, (dist, _) in enumerate(back):
+            for v, d in dist.items():
+                if v in col:
+                    B[col[v], ti] = d
+
+        best = np.full((len(sources), len(targets)), np.inf)
+        for k in range(0, len(space), MIN_PLUS_CHUNK):
+            chunk = F[:, k:k + MIN_PLUS_CHUNK, None] + B[None, k:k + MIN_PLUS_CHUNK, :]
+            np.minimum(best, chunk.min(axis=1), out=best)
+
+        return RoadQuery(
+            self, sources, targets, best,
+            [pred for _, pred in fwd], [pred for _, pred in back],
+            meeting=(np.asarray(space, dtype=np.int64), F, B)
+        )
+
+    def _many_to_many_dijkstra(self, sources, targets) -> "RoadQuery":
+        best = np.full((len(sources), len(targets)), np.inf)
+        preds = []
+        target_set = set(int(t) for t in targets)
+        for si, s in enumerate(sources):
+            settled, pred = dijkstra_to_targets(self, int(s), target_set)
+            for ti, t in enumerate(targets):
+                best[si, ti] = settled.get(int(t), np.inf)
+            preds.append(pred)
+        return RoadQuery(self, sources, targets, best, preds)
+
+    def coords(self, chain: List[int]) -> np.ndarray:
+        return np.column_stack((self.lon[chain], self.lat[chain])).astype(np.float32)
+
+    def unpack(self, a: int, b: int) -> List[int]:
+        """계층 간선 a→b를 원본 노드 열로 풀어낸다 (a 제외, b 포함)"""
+        out, stack = [], [(a, b)]
+        while stack:
+            u, v = stack.pop()
+            mid = self._edge_mid.get((u, v), -1)
+            if mid < 0:
+                out.append(v)
+            else:
+                stack.append((mid, v))
+                stack.append((u, mid))
+        return out
+
+class RoadQuery:
+    """many-to-many 질의 결과. 경로 좌표는 path(i, j) 호출 시에만 복원한다."""
+
+    def __init__(self, graph: RoadGraph, sources, targets, seconds, fwd_preds, back_preds=None, meeting=None):
+        self.graph = graph
+        self.sources = [int(s) for s in sources]
+        self.targets = [int(t) for t in targets]
+        self.seconds = seconds
+        self._fwd = fwd_preds
+        self._back = back_preds
+        self._meeting = meeting
+
+    def node_chain(self, si: int, ti: int) -> Optional[List[int]]:
+        s, t = self.sources[si], self.targets[ti]
+        if not np.isfinite(self.seconds[si, ti]):
+            return None
+        if self._meeting is None:
+            chain = [t]
+            while chain[-1] != s:
+                chain.append(self._fwd[si][chain[-1]])
+            chain.reverse()
+            return chain
+
+        space, F, B = self._meeting
+        m = int(space[np.argmin(F[si] + B[:, ti])])
+        up_chain = [m]
+        while up_chain[-1] != s:
+            up_chain.append(self._fwd[si][up_chain[-1]])
+        up_chain.reverse()
+        down_chain = [m]
+        while down_chain[-1] != t:
+            down_chain.append(self._back[ti][down_chain[-1]])
+
+        chain = [s]
+        for a, b in zip(up_chain, up_chain[1:]):
+            chain.extend(self.graph.unpack(a, b))
+        for a, b in zip(down_chain, down_chain[1:]):
+            chain.extend(self.graph.unpack(a, b))
+        return chain
+
+def _csr_to_lists(indptr, indices, weights) -> List[List[Tuple[int, float]]]:
+    ptr, idx, w = indptr.tolist(), indices.tolist(), weights.tolist()
+    return [list(zip(idx[ptr[u]:ptr[u + 1]], w[ptr[u]:ptr[u + 1]])) for u in range(len(ptr) - 1)]
+
+def _edge_mid_map(h: Dict[str, np.ndarray]) -> Dict[Tuple[int, int], int]:
+    """원본 방향 (from, to) → 숏컷 중간 노드 (원본 간선은 -1)"""
+    mids = {}
+    for prefix, forward in (("up_", True), ("dn_", False)):
+        ptr = h[prefix + "indptr"].tolist()
+        idx = h[prefix + "indices"].tolist()
+        mid = h[prefix + "mid"].tolist()
+        for u in range(len(ptr) - 1):
+            for e in range(ptr[u], ptr[u + 1]):
+                key = (u, idx[e]) if forward else (idx[e], u)
+                mids[key] = mid[e]
+    return mids
+
+def _upward_search(adj: List[List[Tuple[int, float]]], source: int) -> Tuple[Dict[int, float], Dict[int, int]]:
+    """CH 상향 그래프 전체 Dijkstra (탐색 공간이 작아 목표 없이 끝까지 진행)"""
+    dist = {source: 0.0}
+    pred: Dict[int, int] = {}
+    heap = [(0.0, source)]
+    pop, push, get, inf = heapq.heappop, heapq.heappush, dist.get, math.inf
+    while heap:
+        d, u = pop(heap)
+        if d > dist[u]:
+            continue
+        for v, w in adj[u]:
+            nd = d + w
+            if nd < get(v, inf):
+                dist[v] = nd
+                pred[v] = u
+                push(heap, (nd, v))
+    return dist, pred
+
+def dijkstra_to_targets(graph: RoadGraph, source: int, targets: set) -> Tuple[Dict[int, float], Dict[int, int]]:
+    """source에서 출발해 targets가 모두 확정되면 종료하는 Dijkstra"""
+    adj = graph.adjacency()
+    settled: Dict[int, float] = {}
+    pred: Dict[int, int] = {}
+    best = {source: 0.0}
+    heap = [(0.0, source)]
+    remaining = set(targets)
+
+    while heap and remaining:
+        d, u = heapq.heappop(heap)
+        if u in settled:
+            continue
+        settled[u] = d
+        remaining.discard(u)
+        for v, w in adj[u]:
+            nd = d + w
+            if v not in settled and nd < best.get(v, math.inf):
+                best[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd, v))
+    return settled, pred
+
+def _witness_distances(out_adj, source: int, skip: int, max_cost: float) -> Dict[int, float]:
+    """skip 노드를 거치지 않는 source 출발 제한 Dijkstra (witness 탐색)"""
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    settled = 0
+    done = set()
+    while heap and settled < WITNESS_SETTLE_LIMIT:
+        d, u = heapq.heappop(heap)
+        if u in done:
+            continue
+        if d > max_cost:
+            break
+        done.add(u)
+        settled += 1
+        for v, w in out_adj[u].items():
+            if v == skip:
+                continue
+            nd = d + w
+            if nd < dist.get(v, math.inf):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+def _shortcuts_for(v: int, in_adj, out_adj) -> List[Tuple[int, int, float]]:
+    shortcuts = []
+    if not in_adj[v] or not out_adj[v]:
+        return shortcuts
+    max_out = max(out_adj[v].values())
+    for u, w_in in in_adj[v].items():
+        witness = _witness_distances(out_adj, u, v, w_in + max_out)
+        for x, w_out in out_adj[v].items():
+            if x == u:
+                continue
+            if witness.get(x, math.inf) > w_in + w_out:
+                shortcuts.append((u, x, w_in + w_out))
+    return shortcuts
+
+def build_contraction_hierarchy(graph: RoadGraph) -> Dict[str, np.ndarray]:
+    """
+    Contraction Hierarchies 전처리 (오프라인).
+    edge difference + 인접 축약 수로 노드 순서를 정하고(lazy update),
+    축약 시 witness 경로가 없는 쌍에만 숏컷을 추가한다.
+    반환 값은 up_/dn_ 접두사의 CSR 배열로, save_road_graph 파일에 함께 저장한다.
+    """
+    n = graph.size
+    out_adj: List[Dict[int, float]] = [dict() for _ in range(n)]
+    in_adj: List[Dict[int, float]] = [dict() for _ in range(n)]
+    mid: Dict[Tuple[int, int], int] = {}
+    for u, edges in enumerate(graph.adjacency()):
+        for v, w in edges:
+            if u != v and w < out_adj[u].get(v, math.inf):
+                out_adj[u][v] = w
+                in_adj[v][u] = w
+
+    deleted_neighbors = [0] * n
+
+    def importance(v: int) -> int:
+        return len(_shortcuts_for(v, in_adj, out_adj)) - len(in_adj[v]) - len(out_adj[v]) + deleted_neighbors[v]
+
+    heap = [(importance(v), v) for v in range(n)]
+    heapq.heapify(heap)
+    contracted = [False] * n
+    up = ([], [], [], [])    # src, dst, weight, mid : rank 낮음 → 높음 (원본 방향)
+    down = ([], [], [], [])  # src, dst, weight, mid : 역방향 저장 (높은 rank 노드 → 원본 출발)
+
+    while heap:
+        _, v = heapq.heappop(heap)
+        if contracted[v]:
+            continue
+        current = importance(v)
+        if heap and current > heap[0][0]:
+            heapq.heappush(heap, (current, v))
+            continue
+
+        for u, x, w in _shortcuts_for(v, in_adj, out_adj):
+            if w < out_adj[u].get(x, math.inf):
+                out_adj[u][x] = w
+                in_adj[x][u] = w
+                mid[(u, x)] = v
+
+        for x, w in out_adj[v].items():
+            for arr, val in zip(up, (v, x, w, mid.get((v, x), -1))):
+                arr.append(val)
+            del in_adj[x][v]
+            deleted_neighbors[x] += 1
+        for u, w in in_adj[v].items():
+            for arr, val in zip(down, (v, u, w, mid.get((u, v), -1))):
+                arr.append(val)
+            del out_adj[u][v]
+            deleted_neighbors[u] += 1
+        out_adj[v], in_adj[v] = {}, {}
+        contracted[v] = True
+
+    hierarchy = {}
+    for prefix, (src, dst, w, m) in (("up_", up), ("dn_", down)):
+        indptr, indices, weights, mids = _to_csr(n, src, dst, w, m)
+        hierarchy.update({
+            prefix + "indptr": indptr, prefix + "indices": indices,
+            prefix + "weights": weights, prefix + "mid": mids,
+        })
+    logger.info("CH 전처리 완료: 노드 %d, 숏컷 %d", n, len(mid))
+    return hierarchy
+
+def preprocess_road_graph(in_path: str, out_path: str) -> None:
+    """save_road_graph 파일을 읽어 CH 계층을 추가한 파일로 저장"""
+    graph = RoadGraph.load(in_path)
+    hierarchy = build_contraction_hierarchy(graph)
+    np.savez_compressed(
+        out_path,
+        lon=graph.lon, lat=graph.lat,
+        indptr=graph.indptr, indices=graph.indices, seconds=graph.seconds,
+        **hierarchy
+    )
+
+@lru_cache(maxsize=4)
+def load_road_graph(path: str) -> RoadGraph:
+    logger.info("도로 그래프 로드: %s", path)
+    return RoadGraph.load(path)
+
+class _RoadPaths:
+    """LazyPathMatrix용 장소 인덱스 → 도로 경로 좌표 변환기"""
+
+    def __init__(self, query: RoadQuery, cols: List[int]):
+        self._query, self._cols = query, cols
+
+    def path(self, i: int, j: int) -> Optional[np.ndarray]:
+        if i == j:
+            return None
+        chain = self._query.node_chain(self._cols[i], self._cols[j])
+        return self._query.graph.coords(chain) if chain else None
+
+def create_roadnet_matrices(
+    places: List[Dict],
+    graph: RoadGraph
+) -> Tuple[List[List[int]], List[List[None]], LazyPathMatrix]:
+    """
+    로컬 도로 그래프로 (time_matrix, raw, path_matrix)를 생성.
+    장소는 가장 가까운 노드로 스냅하며, 스냅 거리만큼 접근 시간을 더한다.
+    path_matrix는 실제로 접근한 구간만 경로를 복원한다.
+    """
+    n = len(places)
+    nodes, snap_m = graph.nearest_nodes([p["x_cord"] for p in places], [p["y_cord"] for p in places])
+    access_min = snap_m / 1000 / ACCESS_SPEED_KMH * 60
+
+    unique_nodes = sorted(set(nodes.tolist()))
+    col = {v: k for k, v in enumerate(unique_nodes)}
+    cols = [col[int(v)] for v in nodes]
+    query = graph.many_to_many(unique_nodes, unique_nodes)
+
+    minutes = query.seconds[np.ix_(cols, cols)] / 60 + access_min[:, None] + access_min[None, :]
+    unreachable = ~np.isfinite(minutes)
+    if unreachable.any():
+        logger.warning("도로 그래프상 도달 불가 쌍: %d", int(unreachable.sum()))
+    time_matrix = np.where(unreachable, UNREACHABLE_MINUTES, np.rint(np.nan_to_num(minutes, posinf=0))).astype(int)
+    np.fill_diagonal(time_matrix, 0)
+
+    logger.info("도로 그래프 매트릭스 생성 완료: %d개 지점 (고유 노드 %d)", n, len(unique_nodes))
+    return time_matrix.tolist(), [[None] * n for _ in range(n)], LazyPathMatrix(_RoadPaths(query, cols), n)
+
+if __name__ == "__main__":
+    # 사용법: python -m tripscheduler.api.roadnet jeju_graph.npz jeju_graph_ch.npz
+    preprocess_road_graph(sys.argv[1], sys.argv[2])
@@ -1,58 +1,52 @@
 import logging
-from tripscheduler.cli.utils import (
-    load_test_case,
-    generate_valid_combinations,
-    build_selection_inputs
-)
+from tripscheduler.cli.utils import load_test_case
+from tripscheduler.core.preprocessing.closed_days import filter_closed_places
 from tripscheduler.core.preprocessing.timewindow import calculate_effective_time_windows
 from tripscheduler.core.preprocessing.restaurant import split_restaurant_nodes
-from tripscheduler.scheduler import run_scheduler
+from tripscheduler.scheduler import build_day_matrices
+from tripscheduler.combinations import solve_day
 
 logger = logging.getLogger(__name__)
 
 def execute_full_pipeline(
     json_path: str,
     use_mock: bool = False,
-    mock_raw_path: str = None
+    mock_raw_path: str = None,
+    profile: str = None,
+    max_workers: int = None,
+    deadline_sec: float = None,
+    meal_assignment: str = "enumerate",
+    report=None
 ):
     """
     1) JSON 로드
-    2) 시간 윈도우 계산
+    2) 여행일 휴무 장소 제외 후 시간 윈도우 계산
     3) 식당 분할
-    4) 조합 생성
-    5) 조합별 run_scheduler 실행
+    4) 식사 배정: model(단일 모델) 또는 enumerate(조합 생성 후 조합별 병렬 실행)
+    5) run_scheduler 실행 (profile: solver 프로파일, deadline_sec: 공유 마감)
+       enumerate면 하한이 최선 objective 이상인 조합은 풀지 않음 (report: CombinationReport에 집계)
     6) 결과(result dict)와 windows 리스트 반환
     """
     data = load_test_case(json_path)
     places, user, day_info = data["places"], data["user"], data["day_info"]
 
+    places, _ = filter_closed_places(places, day_info)
     eff_windows_map = calculate_effective_time_windows(places, user)
     new_places, new_windows = split_restaurant_nodes(places, eff_windows_map)
 
-    valid_selections = generate_valid_combinations(new_places, new_windows)
-
-    results = {}
-    for sel in valid_selections:
-        sel_places, sel_windows, labels = build_selection_inputs(new_places, new_windows, sel)
-
-        logger.info("▶ 조합 %s 실행", labels)
-        try:
-            visits, cost, full_path = run_scheduler(
-                sel_places,
-                sel_windows,
-                user,
-                day_info,
-                use_mock=use_mock,
-                mock_raw_path=mock_raw_path
-            )
-            results[sel] = {
-                "cost": cost,
-                "visits": visits,
-                "path": full_path
-            }
-            logger.info("✔ 조합 %s 완료 (cost=%s)", labels, cost)
-        except Exception as e:
-            results[sel] = None
-            logger.error("✖ 조합 %s 실패: %s", labels, e)
+    # 하루 매트릭스는 한 번만 생성하고 조합별로 슬라이스
+    day_matrices = build_day_matrices(
+        new_places, use_mock=use_mock, mock_raw_path=mock_raw_path, windows=new_windows
+    )
 
+    results = solve_day(
+        new_places, new_windows, user, day_info, day_matrices,
+        meal_assignment=meal_assignment,
+        use_mock=use_mock,
+        mock_raw_path=mock_raw_path,
+        profile=profile,
+        max_workers=max_workers,
+        deadline_sec=deadline_sec,
+        report=report
+    )
     return results, new_windows
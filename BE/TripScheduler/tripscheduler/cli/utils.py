@@ -3,10 +3,13 @@ import itertools
 from collections import defaultdict
 from typing import Any, Dict, List, Tuple
 
+from tripscheduler.utils.metrics import timed
+
 def load_test_case(path: str) -> Dict[str, Any]:
     with open(path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+@timed("generate_valid_combinations")
 def generate_valid_combinations(
     places: List[Dict[str, Any]],
     windows: List[Tuple[int,int,Any]]
@@ -38,6 +41,19 @@ def generate_valid_combinations(
             valid.append(sel)
     return valid
 
+def all_meal_nodes(
+    places: List[Dict[str, Any]],
+    windows: List[Tuple[int,int,Any]]
+) -> Tuple[int, ...]:
+    """
+    meal 태그가 있는 restaurant 노드 전체.
+    build_selection_inputs에 넘기면 식당 후보를 모두 담은 단일 모델 입력이 된다.
+    """
+    return tuple(
+        i for i, place in enumerate(places)
+        if place.get("category") == "restaurant" and windows[i][2]
+    )
+
 def build_selection_inputs(
     places: List[Dict[str, Any]],
     windows: List[Tuple[int,int,Any]],
@@ -61,6 +77,12 @@ def display_results(
     for sel, out in results.items():
         labels = tuple(windows[i][2] for i in sel)
         print(f"\n=== Option {labels!r} ===")
+        if out and out.get("status") == "pruned":
+            print(f"  (가지치기: 하한 {out['bound']}으로 상위 결과가 될 수 없어 풀지 않음)")
+            continue
+        if out and out.get("status") == "timed_out":
+            print("  (마감 초과)")
+            continue
         if not out or out.get("visits") is None:
             print("  (해결 불가)")
             continue
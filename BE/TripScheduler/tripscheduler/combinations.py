@@ -0,0 +1,356 @@
+import os
+import math
+import time
+import atexit
+import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from tripscheduler.cli.utils import all_meal_nodes, build_selection_inputs, generate_valid_combinations
+from tripscheduler.api.matrix import DayMatrices
+from tripscheduler.core.indexing.handlers import determine_start_end_indices
+from tripscheduler.core.routing.bounds import INFEASIBLE, combination_lower_bound
+from tripscheduler.core.routing.feasibility import InfeasibleScheduleError
+from tripscheduler.scheduler import check_day_feasibility, run_scheduler
+from tripscheduler.utils.metrics import collect_spans, merge_spans
+from tripscheduler.utils.time import time_to_minutes
+
+logger = logging.getLogger(__name__)
+
+# 조합 전체 공유 마감 이후 결과 수집을 기다리는 여유 시간
+DEADLINE_GRACE_SEC = 2.0
+
+Selection = Tuple[int, ...]
+
+# 조합 병렬 실행 프로세스 풀 (호출마다 새로 띄우지 않고 재사용, 작업자 수가 바뀌면 다시 생성)
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+def combination_executor(workers: int) -> ProcessPoolExecutor:
+    """조합 실행과 분할 풀이(decomposition)가 함께 쓰는 프로세스 풀 (workers가 바뀔 때만 새로 생성)"""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        shutdown_combination_executor()
+        _pool, _pool_workers = ProcessPoolExecutor(max_workers=workers), workers
+    return _pool
+
+def terminate_combination_executor() -> None:
+    """마감 후에도 실행 중인 작업이 있거나 풀이 깨졌으면 워커 프로세스를 종료하고 풀을 버린다 (다음 호출에서 새로 생성)"""
+    global _pool
+    if _pool is None:
+        return
+    for process in list((_pool._processes or {}).values()):
+        process.terminate()
+    _pool.shutdown(wait=True, cancel_futures=True)
+    _pool = None
+
+def shutdown_combination_executor(wait: bool = True) -> None:
+    """조합 실행 프로세스 풀 종료 (프로세스 종료 시 atexit으로도 호출)"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=wait, cancel_futures=True)
+        _pool = None
+
+atexit.register(shutdown_combination_executor)
+
+# enumerate(기본): 식사 조합별로 따로 풀기 / model: 식당 후보 전체를 한 모델에서 배정 (선택)
+MEAL_ASSIGNMENTS = ("model", "enumerate")
+
+# 풀지 않았거나 마감까지 끝나지 않은 조합의 결과 {"status": ...} (해가 없거나 실패한 조합은 None)
+PRUNED = "pruned"
+TIMED_OUT = "timed_out"
+
+def _solve_selection(
+    sel_places: List[Dict[str, Any]],
+    sel_windows: List[Tuple[int, int, Any]],
+    user: Dict[str, Any],
+    day_info: Dict[str, Any],
+    matrices: DayMatrices,
+    options: Dict[str, Any],
+) -> Dict[str, Any]:
+    # 워커 프로세스에서 기록된 단계별 시간은 결과와 함께 돌려보내 호출 측에서 합친다
+    with collect_spans() as spans:
+        visits, cost, full_path = run_scheduler(
+            sel_places, sel_windows, user, day_info,
+            matrices=matrices,
+            **options
+        )
+    return {"cost": cost, "visits": visits, "path": full_path, "timings": spans}
+
+@dataclass
+class CombinationReport:
+    """
+    조합 실행 결과 집계 (solve_combinations에 넘기면 채워짐).
+    - bounds: 조합별 objective 하한 (combination_lower_bound)
+    - infeasible: 하한 계산만으로 해가 없음이 증명된 조합 수
+    - pruned: 하한이 지금까지 찾은 objective 이상이라 (개선할 수 없어) 풀지 않은 조합 수
+    - timed_out: 공유 마감까지 끝나지 않은 조합 수
+    - failed: 풀이 중 예외로 실패한 조합 수
+    counts()의 합은 전체 조합 수와 같다.
+    """
+    bounds: Dict[Selection, float] = field(default_factory=dict)
+    solved: int = 0
+    pruned: int = 0
+    infeasible: int = 0
+    timed_out: int = 0
+    failed: int = 0
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "solved": self.solved, "pruned": self.pruned, "infeasible": self.infeasible,
+            "timed_out": self.timed_out, "failed": self.failed,
+        }
+
+def _selection_bound(sel_places, sel_windows, user, day_info, matrices: DayMatrices) -> float:
+    time_matrix, _, _ = matrices.slice(sel_places)
+    try:
+        start_idx, end_idx = determine_start_end_indices(sel_places, day_info)
+    except ValueError:
+        # 입력 오류는 run_scheduler에서 조합 실패로 기록되도록 가지치기하지 않는다
+        return 0.0
+    return combination_lower_bound(
+        sel_places, sel_windows, time_matrix, start_idx, end_idx,
+        time_to_minutes(user["start_time"]), time_to_minutes(user["end_time"])
+    )
+
+def _prune_threshold(costs: List[float], keep: int) -> float:
+    """keep번째로 좋은 objective (아직 keep개를 못 찾았으면 무한대)"""
+    return sorted(costs)[keep - 1] if len(costs) >= keep else math.inf
+
+def solve_combinations(
+    places: List[Dict[str, Any]],
+    windows: List[Tuple[int, int, Any]],
+    selections: List[Selection],
+    user: Dict[str, Any],
+    day_info: Dict[str, Any],
+    day_matrices: DayMatrices,
+    use_mock: bool = False,
+    mock_raw_path: Optional[str] = None,
+    profile: Optional[str] = None,
+    path_tolerance_m: float = 0.0,
+    path_format: str = "coords",
+    max_workers: Optional[int] = None,
+    deadline_sec: Optional[float] = None,
+    keep: int = 1,
+    report: Optional[CombinationReport] = None,
+) -> Dict[Selection, Optional[Dict[str, Any]]]:
+    """
+    식사 조합별 run_scheduler를 프로세스 풀(기본: CPU 코어 수)에서 동시에 실행.
+    - 풀기 전에 조합별 objective 하한을 계산해 하한이 낮은 조합부터 실행하고,
+      해가 없음이 증명되거나 하한이 지금까지 keep번째로 좋은 objective 이상인 조합은 풀지 않는다.
+    - deadline_sec: 모든 조합이 공유하는 마감(초). 각 조합의 탐색 시간은 남은 시간 이하로 제한되고,
+      마감 후에도 끝나지 않은 조합은 {"status": TIMED_OUT}으로 처리한다.
+    - 조합이 하나이거나 max_workers=1이면 현재 프로세스에서 순서대로 실행한다.
+      병렬 실행 프로세스 풀은 호출 간에 재사용하고, 마감 후 끝나지 않은 조합이 있으면 워커를 종료한다.
+    반환: {selection: {"cost", "visits", "path"} / {"status": PRUNED, "bound"} / {"status": TIMED_OUT}
+          / None (해 없음/실패)}
+    """
+    report = report if report is not None else CombinationReport()
+    deadline = time.time() + deadline_sec if deadline_sec is not None else None
+    options = {
+        "use_mock": use_mock,
+        "mock_raw_path": mock_raw_path,
+        "path_tolerance_m": path_tolerance_m,
+        "path_format": path_format,
+        "profile": profile,
+        "deadline": deadline,
+    }
+    results: Dict[Selection, Optional[Dict[str, Any]]] = {}
+    tasks = []
+    for sel in selections:
+        sel_places, sel_windows, labels = build_selection_inputs(places, windows, sel)
+        bound = _selection_bound(sel_places, sel_windows, user, day_info, day_matrices)
+        report.bounds[sel] = bound
+        if bound == INFEASIBLE:
+            results[sel] = None
+            report.infeasible += 1
+            logger.info("✂ 조합 %s: 하한 계산으로 해 없음", labels)
+            continue
+        tasks.append((sel, labels, sel_places, sel_windows))
+    tasks.sort(key=lambda task: report.bounds[task[0]])
+
+    costs: List[float] = []
+
+    def record(sel, labels, out, from_worker=False):
+        merge_spans(out.pop("timings", None), from_worker=from_worker)
+        results[sel] = out
+        report.solved += 1
+        if out and out.get("cost") is not None:
+            costs.append(out["cost"])
+        logger.info("✔ 조합 %s 완료 (cost=%s)", labels, out and out["cost"])
+
+    def prune(sel, labels):
+        # 해가 없는 것이 아니라 상위 keep개에 들 수 없어 풀지 않은 조합
+        results[sel] = {"status": PRUNED, "bound": report.bounds[sel]}
+        report.pruned += 1
+        logger.info("✂ 조합 %s: 하한 %s ≥ 기준 %s", labels, report.bounds[sel], _prune_threshold(costs, keep))
+
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+
+    if workers <= 1:
+        for sel, labels, sel_places, sel_windows in tasks:
+            if report.bounds[sel] >= _prune_threshold(costs, keep):
+                prune(sel, labels)
+                continue
+            logger.info("▶ 조합 %s 실행", labels)
+            try:
+                record(sel, labels, _solve_selection(sel_places, sel_windows, user, day_info, day_matrices, options))
+            except Exception as e:
+                results[sel] = None
+                report.failed += 1
+                logger.error("✖ 조합 %s 실패: %s", labels, e)
+        logger.info("조합 실행 집계: %s", report.counts())
+        return {sel: results[sel] for sel in selections}
+
+    logger.info("조합 %d개 병렬 실행 (workers=%d)", len(tasks), workers)
+    pool = combination_executor(workers)
+    broken = False
+    futures = {}
+    try:
+        futures = {
+            # 조합에 필요한 행/열만 넘겨 프로세스 간 전송량을 줄인다
+            pool.submit(
+                _solve_selection, sel_places, sel_windows, user, day_info,
+                day_matrices.subset(sel_places), options
+            ): (sel, labels)
+            for sel, labels, sel_places, sel_windows in tasks
+        }
+        limit = None if deadline is None else deadline + DEADLINE_GRACE_SEC
+        pending = set(futures)
+        while pending:
+            timeout = None if limit is None else max(0.0, limit - time.time())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                sel, labels = futures[future]
+                try:
+                    record(sel, labels, future.result(), from_worker=True)
+                except Exception as e:
+                    broken = broken or isinstance(e, BrokenProcessPool)
+                    results[sel] = None
+                    report.failed += 1
+                    logger.error("✖ 조합 %s 실패: %s", labels, e)
+
+            # 아직 시작하지 않은 조합 중 하한이 기준을 넘는 것은 취소
+            threshold = _prune_threshold(costs, keep)
+            for future in list(pending):
+                sel, labels = futures[future]
+                if report.bounds[sel] >= threshold and future.cancel():
+                    pending.discard(future)
+                    prune(sel, labels)
+
+        for future in pending:
+            sel, labels = futures[future]
+            results[sel] = {"status": TIMED_OUT}
+            report.timed_out += 1
+            logger.error("✖ 조합 %s 마감 초과", labels)
+    except BaseException:
+        broken = True
+        raise
+    finally:
+        # 각 조합 탐색은 남은 시간으로 제한되지만, 그래도 마감 후 남은 작업은 워커째 종료해
+        # 반환 뒤 백그라운드에서 계속 풀지 않도록 한다
+        if broken or any(not future.done() for future in futures):
+            for future in futures:
+                future.cancel()
+            terminate_combination_executor()
+
+    logger.info("조합 실행 집계: %s", report.counts())
+    # 입력 조합 순서 유지
+    return {sel: results[sel] for sel in selections}
+
+def solve_meal_model(
+    places: List[Dict[str, Any]],
+    windows: List[Tuple[int, int, Any]],
+    user: Dict[str, Any],
+    day_info: Dict[str, Any],
+    day_matrices: DayMatrices,
+    use_mock: bool = False,
+    mock_raw_path: Optional[str] = None,
+    profile: Optional[str] = None,
+    path_tolerance_m: float = 0.0,
+    path_format: str = "coords",
+    deadline_sec: Optional[float] = None,
+    initial_order: Optional[List[str]] = None,
+) -> Dict[Selection, Optional[Dict[str, Any]]]:
+    """
+    식당 후보 전체를 한 모델에 넣고 식사 배정까지 한 번에 푼다 (add_meal_disjunctions).
+    반환 형식은 solve_combinations와 같으며, 키는 실제로 방문한 식당 노드 인덱스 조합이다.
+    initial_order(이전 해의 방문 장소 이름 순서)가 있으면 그 순서에서 탐색을 시작한다.
+    """
+    candidates = all_meal_nodes(places, windows)
+    sel_places, sel_windows, _ = build_selection_inputs(places, windows, candidates)
+    logger.info("▶ 단일 모델 식사 배정 실행: 식당 후보 %d개", len(candidates))
+    try:
+        result = _solve_selection(
+            sel_places, sel_windows, user, day_info, day_matrices,
+            {
+                "use_mock": use_mock,
+                "mock_raw_path": mock_raw_path,
+                "path_tolerance_m": path_tolerance_m,
+                "path_format": path_format,
+                "profile": profile,
+                "deadline": time.time() + deadline_sec if deadline_sec is not None else None,
+                "initial_order": initial_order,
+            }
+        )
+    except InfeasibleScheduleError:
+        # 하루 전체에 해가 없음: 결과 없음 대신 원인과 함께 전달
+        raise
+    except Exception as e:
+        logger.error("✖ 단일 모델 실패: %s", e)
+        return {candidates: None}
+    merge_spans(result.pop("timings", None))
+
+    visited = {visit["place"] for visit in result["visits"]}
+    sel = tuple(i for i in candidates if places[i]["name"] in visited)
+    logger.info("✔ 단일 모델 완료 (cost=%s, 식당 %s)", result["cost"], [windows[i][2] for i in sel])
+    return {sel: result}
+
+def solve_day(
+    places: List[Dict[str, Any]],
+    windows: List[Tuple[int, int, Any]],
+    user: Dict[str, Any],
+    day_info: Dict[str, Any],
+    day_matrices: DayMatrices,
+    meal_assignment: str = "enumerate",
+    max_workers: Optional[int] = None,
+    keep: int = 1,
+    report: Optional[CombinationReport] = None,
+    **options
+) -> Dict[Selection, Optional[Dict[str, Any]]]:
+    """
+    하루 일정 풀이 진입점.
+    - model: solve_meal_model로 한 번에 풀기 (결과 1개)
+    - enumerate: generate_valid_combinations의 조합별 결과 (차선 조합 비교용).
+      objective 순 상위 keep개가 될 수 없는 조합은 풀지 않고 {"status": PRUNED}로 둔다
+    - report: 풀이/가지치기 조합 수 집계 (CombinationReport)
+    필수 장소만으로 해가 없음이 확인되면 풀기 전에 InfeasibleScheduleError
+    """
+    if meal_assignment not in MEAL_ASSIGNMENTS:
+        raise ValueError(f"지원하지 않는 식사 배정 방식입니다: {meal_assignment}")
+    check_day_feasibility(places, windows, user, day_info, day_matrices)
+    if meal_assignment == "model":
+        results = solve_meal_model(places, windows, user, day_info, day_matrices, **options)
+        if report is not None:
+            report.solved += 1
+        return results
+
+    selections = generate_valid_combinations(places, windows)
+    return solve_combinations(
+        places, windows, selections, user, day_info, day_matrices,
+        max_workers=max_workers, keep=keep, report=report, **options
+    )
+
+def rank_results(
+    results: Dict[Selection, Optional[Dict[str, Any]]]
+) -> List[Tuple[Selection, Dict[str, Any]]]:
+    """해가 있는 조합을 objective 오름차순으로 정렬 (같으면 입력 순서)"""
+    solved = [
+        (sel, out) for sel, out in results.items()
+        if out and out.get("visits") and out.get("cost") is not None
+    ]
+    return sorted(solved, key=lambda item: item[1]["cost"])
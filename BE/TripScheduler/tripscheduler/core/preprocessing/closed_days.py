@@ -0,0 +1,77 @@
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from tripscheduler.utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = ("월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일")
+
+def _normalize(token: str) -> str:
+    """"월" / "월요일" / "2025-04-10" 형태의 휴무일 표기를 비교용으로 정규화"""
+    token = token.strip()
+    if len(token) == 1 and token + "요일" in WEEKDAYS:
+        return token + "요일"
+    return token
+
+def closed_days_of(place: Dict[str, Any]) -> Set[str]:
+    """장소 휴무일 (휴무일 또는 closed_days 필드)"""
+    days = place.get("휴무일") or place.get("closed_days") or []
+    return {_normalize(d) for d in days if isinstance(d, str) and d.strip()}
+
+def day_keys(day_info: Dict[str, Any]) -> Set[str]:
+    """여행일을 가리키는 표기: 요일(없으면 date에서 계산)과 날짜"""
+    keys = set()
+    weekday = day_info.get("weekday")
+    day = day_info.get("date")
+    if not weekday and day:
+        try:
+            weekday = WEEKDAYS[date.fromisoformat(day).weekday()]
+        except ValueError:
+            logger.warning("날짜 형식이 올바르지 않음: %s", day)
+    if weekday:
+        keys.add(_normalize(weekday))
+    if day:
+        keys.add(day)
+    return keys
+
+def is_closed_on(place: Dict[str, Any], day_info: Dict[str, Any]) -> bool:
+    return bool(closed_days_of(place) & day_keys(day_info))
+
+@timed("filter_closed_places")
+def filter_closed_places(places: List[Dict[str, Any]], day_info: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    여행일에 휴무인 장소를 매트릭스 생성 전에 제외한다.
+    - 선택 장소는 제외하고 이름을 반환
+    - 필수 장소가 휴무면 어떤 장소가 어느 요일에 쉬는지 담아 ValueError
+    반환: (남은 장소, 제외된 장소 이름)
+    """
+    keys = day_keys(day_info)
+    if not keys:
+        return places, []
+
+    kept, dropped, blocked = [], [], []
+    for place in places:
+        hit = closed_days_of(place) & keys
+        if not hit:
+            kept.append(place)
+        elif place.get("is_mandatory", True):
+            blocked.append(f"{place['name']}({', '.join(sorted(hit))})")
+        else:
+            dropped.append(place["name"])
+
+    if blocked:
+        logger.warning("필수 장소 휴무: %s", blocked)
+        raise ValueError(f"필수 장소가 여행일에 휴무입니다: {', '.join(blocked)}")
+    if dropped:
+        logger.info("휴무 장소 %d곳 제외: %s", len(dropped), dropped)
+    return kept, dropped
+
+def open_days(place: Dict[str, Any], day_infos: List[Dict[str, Any]]) -> Optional[List[int]]:
+    """여러 날 일정에서 장소를 방문할 수 있는 여행일 인덱스. 휴무인 날이 없으면 None"""
+    closed = closed_days_of(place)
+    if not closed:
+        return None
+    days = [d for d, info in enumerate(day_infos) if not closed & day_keys(info)]
+    return None if len(days) == len(day_infos) else days
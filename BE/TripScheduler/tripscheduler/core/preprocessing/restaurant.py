@@ -1,7 +1,9 @@
 import logging
+from tripscheduler.utils.metrics import timed
 
 logger = logging.getLogger(__name__)
 
+@timed("split_restaurant_nodes")
 def split_restaurant_nodes(places, windows_map):
     new_places, new_wins = [], []
 
@@ -1,6 +1,13 @@
 import logging
 from tripscheduler.utils.time import time_to_minutes, adjust_for_midnight
-from tripscheduler.utils.window_utils import intersect_interval, subtract_intervals
+from tripscheduler.utils.window_utils import subtract_intervals
+from tripscheduler.core.preprocessing.window_cache import (
+    get_window_cache,
+    clip_to_day,
+    overlapping_breaks,
+    intersect_meals
+)
+from tripscheduler.utils.metrics import timed
 
 logger = logging.getLogger(__name__)
 
@@ -24,56 +31,17 @@ def compute_meal_intervals(meal_preferences: dict, global_start: int, global_end
     logger.info("식사 선호 시간 간격 계산 완료: %d개", len(intervals))
     return intervals
 
-def compute_effective_window(place: dict, global_start: int, global_end: int) -> tuple:
-    place_open = time_to_minutes(place["open_time"])
-    place_close = time_to_minutes(place["close_time"])
-    place_open, place_close = adjust_for_midnight(place_open, place_close)
-
-    effective_open = max(place_open, global_start)
-    effective_close = min(place_close, global_end)
-    logger.debug("장소 [%s] 운영시간 보정: %d~%d", place["name"], effective_open, effective_close)
-    return effective_open, effective_close
-
-def compute_operational_windows(place: dict, global_start: int, global_end: int) -> list:
-    effective_open, effective_close = compute_effective_window(place, global_start, global_end)
+def _segments(place: dict, compiled, effective_open: int, effective_close: int) -> list:
+    """보정된 운영 구간에서 휴식 시간을 뺀 가용 구간"""
     main_interval = (effective_open, effective_close)
-    logger.debug("장소 [%s] 기본 가용 시간: %s", place["name"], main_interval)
-
-    break_intervals = []
-    if "break_time" in place and place["break_time"]:
-        bt = place["break_time"]
-        if len(bt) % 2 == 0:
-            for i in range(0, len(bt), 2):
-                try:
-                    b_start = time_to_minutes(bt[i])
-                    b_end = time_to_minutes(bt[i+1])
-                    b_start, b_end = adjust_for_midnight(b_start, b_end)
-                    inter = intersect_interval(effective_open, effective_close, b_start, b_end)
-                    if inter:
-                        break_intervals.append(inter)
-                        logger.debug(" - 휴식 시간 겹침: %s", inter)
-                except Exception as e:
-                    logger.warning("휴식 시간 파싱 실패: %s", e)
-
+    break_intervals = overlapping_breaks(effective_open, effective_close, compiled.breaks)
     if break_intervals:
         segments = subtract_intervals(main_interval, break_intervals)
         logger.debug("장소 [%s] 최종 가용 구간: %s", place["name"], segments)
         return segments
-    else:
-        return [main_interval]
-
-def compute_restaurant_windows(effective_open: int, effective_close: int, meal_intervals: dict, place_name: str):
-    valid_windows = []
-    for meal, (meal_start, meal_end) in meal_intervals.items():
-        inter = intersect_interval(effective_open, effective_close, meal_start, meal_end)
-        if inter:
-            valid_windows.append((inter[0], inter[1], meal))
-            logger.debug("식당 [%s] - %s 가능: %s", place_name, meal, inter)
-    if not valid_windows:
-        logger.warning("식당 [%s]은(는) 선호 시간과 교집합 없음", place_name)
-        raise ValueError(f"식당 {place_name}은(는) 식사 선호 시간에 부합하는 윈도우가 없습니다.")
-    return valid_windows
+    return [main_interval]
 
+@timed("calculate_effective_time_windows")
 def calculate_effective_time_windows(places: list, user: dict) -> dict:
     logger.info("calculate_effective_time_windows() 시작: %d개 장소", len(places))
     effective_windows = {}
@@ -86,18 +54,16 @@ def calculate_effective_time_windows(places: list, user: dict) -> dict:
     meal_preferences = user.get("meal_time_preferences", {})
     meal_intervals = compute_meal_intervals(meal_preferences, global_start, global_end)
 
-    for place in places:
-        operational_segments = compute_operational_windows(place, global_start, global_end)
+    # 운영시간은 장소별로 미리 컴파일된 정수 값을 쓰고, 하루 시간과의 교차는 전체 장소를 한 번에 계산
+    cache = get_window_cache()
+    compiled = [cache.get(place) for place in places]
+    opens, closes = clip_to_day(compiled, global_start, global_end)
+
+    for place, window, effective_open, effective_close in zip(places, compiled, opens.tolist(), closes.tolist()):
+        operational_segments = _segments(place, window, effective_open, effective_close)
 
         if place.get("category") == "restaurant":
-            restaurant_windows = []
-            for segment in operational_segments:
-                seg_start, seg_end = segment
-                try:
-                    windows = compute_restaurant_windows(seg_start, seg_end, meal_intervals, place["name"])
-                    restaurant_windows.extend(windows)
-                except ValueError:
-                    continue
+            restaurant_windows = intersect_meals(operational_segments, meal_intervals)
             if not restaurant_windows:
                 logger.warning("식당 %s: 유효한 시간 없음", place["name"])
                 raise ValueError(f"식당 {place['name']}은(는) 식사 선호 시간에 부합하는 윈도우가 없습니다.")
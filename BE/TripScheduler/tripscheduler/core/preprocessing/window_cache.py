@@ -0,0 +1,137 @@
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from tripscheduler.utils.time import time_to_minutes, adjust_for_midnight
+
+logger = logging.getLogger(__name__)
+
+# 메모리에 보관할 장소 수 (넘으면 가장 오래 쓰지 않은 장소부터 제거)
+DEFAULT_MAX_ENTRIES = 4096
+
+@dataclass(frozen=True)
+class CompiledWindow:
+    """
+    장소 운영시간을 분 단위 정수로 미리 변환한 값.
+    - open/close: 자정 넘김 보정 후 운영 시작/종료
+    - breaks: (k, 2) int64 배열, 자정 넘김 보정된 휴식 시간 구간
+    """
+    open: int
+    close: int
+    breaks: np.ndarray
+
+def _source_of(place: Dict[str, Any]) -> Tuple:
+    """캐시 검증용 원본 문자열 (같은 id라도 여행일별 운영시간이 다르면 다시 컴파일)"""
+    return place["open_time"], place["close_time"], tuple(place.get("break_time") or ())
+
+def compile_place_window(place: Dict[str, Any]) -> CompiledWindow:
+    """
+    open_time/close_time/break_time 문자열을 한 번만 파싱한다.
+    운영시간 파싱 실패는 ValueError, 휴식 시간 파싱 실패는 경고 후 해당 구간만 무시 (기존 동작과 동일).
+    """
+    place_open, place_close = adjust_for_midnight(
+        time_to_minutes(place["open_time"]), time_to_minutes(place["close_time"])
+    )
+    breaks = []
+    bt = place.get("break_time") or []
+    if len(bt) % 2 == 0:
+        for i in range(0, len(bt), 2):
+            try:
+                breaks.append(adjust_for_midnight(time_to_minutes(bt[i]), time_to_minutes(bt[i + 1])))
+            except Exception as e:
+                logger.warning("휴식 시간 파싱 실패: %s", e)
+    return CompiledWindow(place_open, place_close, np.asarray(breaks, dtype=np.int64).reshape(-1, 2))
+
+class PlaceWindowCache:
+    """
+    장소 id → CompiledWindow 캐시. 처음 쓸 때 컴파일하고, 원본 문자열이 바뀌면 다시 컴파일한다.
+    카탈로그 적재 시점에 precompile로 미리 채워 둘 수도 있다.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Any, Tuple[Tuple, CompiledWindow]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, place: Dict[str, Any]) -> CompiledWindow:
+        key, source = place["id"], _source_of(place)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == source:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        compiled = compile_place_window(place)
+        with self._lock:
+            self._entries[key] = (source, compiled)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def precompile(self, places: List[Dict[str, Any]]) -> None:
+        for place in places:
+            self.get(place)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+_default_cache = PlaceWindowCache()
+
+def get_window_cache() -> PlaceWindowCache:
+    """프로세스 공용 PlaceWindowCache"""
+    return _default_cache
+
+def _adjust(start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """adjust_for_midnight의 배열 버전 (종료 시간만 반환)"""
+    return np.where(end <= start, end + 1440, end)
+
+def clip_to_day(compiled: List[CompiledWindow], global_start: int, global_end: int) -> Tuple[np.ndarray, np.ndarray]:
+    """장소별 운영시간을 하루 시간과 교차해 (보정된 시작, 보정된 종료) 배열로 반환"""
+    opens = np.fromiter((c.open for c in compiled), dtype=np.int64, count=len(compiled))
+    closes = np.fromiter((c.close for c in compiled), dtype=np.int64, count=len(compiled))
+    return np.maximum(opens, global_start), np.minimum(closes, global_end)
+
+def overlapping_breaks(effective_open: int, effective_close: int, breaks: np.ndarray) -> List[Tuple[int, int]]:
+    """운영 구간과 겹치는 휴식 구간 (겹치는 부분만 잘라 반환)"""
+    if not len(breaks):
+        return []
+    close = effective_close + 1440 if effective_close <= effective_open else effective_close
+    starts = np.maximum(effective_open, breaks[:, 0])
+    ends = np.minimum(close, breaks[:, 1])
+    keep = starts < ends
+    return list(zip(starts[keep].tolist(), ends[keep].tolist()))
+
+def intersect_meals(segments: List[Tuple[int, int]], meal_intervals: Dict[str, Tuple[int, int]]) -> List[Tuple[int, int, str]]:
+    """
+    운영 구간 × 식사 구간 교집합을 한 번에 계산.
+    반환: [(시작, 종료, 식사)], 구간 순 → meal_intervals 순
+    """
+    if not segments or not meal_intervals:
+        return []
+    seg = np.asarray(segments, dtype=np.int64)
+    meals = list(meal_intervals)
+    bounds = np.asarray([meal_intervals[m] for m in meals], dtype=np.int64)
+    seg_end = _adjust(seg[:, 0], seg[:, 1])
+    meal_end = _adjust(bounds[:, 0], bounds[:, 1])
+    starts = np.maximum(seg[:, :1], bounds[None, :, 0])
+    ends = np.minimum(seg_end[:, None], meal_end[None, :])
+    rows, cols = np.nonzero(starts < ends)
+    return [
+        (int(starts[r, c]), int(ends[r, c]), meals[c])
+        for r, c in zip(rows.tolist(), cols.tolist())
+    ]
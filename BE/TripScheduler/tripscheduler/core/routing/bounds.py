@@ -0,0 +1,117 @@
+import math
+import numpy as np
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from tripscheduler.core.routing.dummy import is_dummy_node
+
+INFEASIBLE = math.inf
+
+def shortest_transit(matrix, service_times: List[int]) -> np.ndarray:
+    """
+    노드 사이 최단 이동 시간 (중간 노드를 거치면 그 노드의 서비스 시간 포함, Floyd–Warshall).
+    도로 시간이 삼각 부등식을 만족하지 않거나 직접 연결이 가지치기된 쌍도 하한으로 쓸 수 있다.
+    """
+    dist = np.asarray(matrix, dtype=float)
+    svc = np.asarray(service_times[:len(dist)], dtype=float)
+    for k in range(len(dist)):
+        dist = np.minimum(dist, dist[:, k:k + 1] + svc[k] + dist[k:k + 1, :])
+    return dist
+
+def minimum_spanning_weight(dist: np.ndarray, nodes: List[int]) -> float:
+    """nodes 사이 (양방향 중 짧은 쪽) 최소 신장 트리 가중치 — 이 노드들을 모두 지나는 경로 이동 시간의 하한"""
+    if len(nodes) < 2:
+        return 0.0
+    sub = dist[np.ix_(nodes, nodes)]
+    sub = np.minimum(sub, sub.T)
+    best = sub[0].copy()
+    in_tree = np.zeros(len(nodes), dtype=bool)
+    in_tree[0] = True
+    total = 0.0
+    for _ in range(len(nodes) - 1):
+        candidates = np.where(in_tree, np.inf, best)
+        k = int(np.argmin(candidates))
+        total += candidates[k]
+        in_tree[k] = True
+        best = np.minimum(best, sub[k])
+    return total
+
+def arrival_ranges(
+    windows: List[Tuple[int, int, Optional[str]]],
+    dist: np.ndarray,
+    service_times: List[int],
+    start_idx: Optional[int],
+    end_idx: Optional[int],
+    global_start: int,
+    global_end: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    노드별 도착 가능 구간. 모델과 같은 윈도우 여유(±10분)를 두고
+    - from_start: 시작 노드에서 가장 빨리 도착하는 시각
+    - earliest: max(윈도우 시작, from_start)
+    - latest: min(윈도우 끝, 서비스 후 종료 노드에 global_end까지 닿을 수 있는 마지막 도착 시각)
+    earliest > latest인 노드는 어떤 경로로도 방문할 수 없다. start_idx/end_idx가 None이면 더미 노드(이동 시간 0)로 본다.
+    """
+    n = len(dist)
+    svc = np.asarray(service_times[:n], dtype=float)
+    opens = np.asarray([o for o, _, _ in windows[:n]], dtype=float)
+    closes = np.asarray([c for _, c, _ in windows[:n]], dtype=float)
+    depart = global_start + (svc[start_idx] if start_idx is not None else 0)
+    from_start = depart + (dist[start_idx] if start_idx is not None else np.zeros(n))
+    to_end = dist[:, end_idx] if end_idx is not None else np.zeros(n)
+    earliest = np.maximum(np.maximum(global_start, opens - 10), from_start)
+    latest = np.minimum(np.minimum(global_end, closes + 10), global_end - svc - to_end)
+    return from_start, earliest, latest
+
+def combination_lower_bound(
+    places: List[dict],
+    windows: List[Tuple[int, int, Optional[str]]],
+    matrix: List[List[int]],
+    start_idx: Optional[int],
+    end_idx: Optional[int],
+    global_start: int,
+    global_end: int,
+    penalty: int = 1000
+) -> float:
+    """
+    run_scheduler 모델 objective(미방문 penalty 합)의 하한. 모델을 풀지 않고 계산한다.
+    - 시작 노드에서 가장 빨리 가도 윈도우 안에 도착할 수 없거나, 방문 후 종료 노드에 제시간에
+      닿을 수 없는 노드는 반드시 미방문: 선택 노드면 penalty, 필수 노드(또는 필수 식당 전체)면 INFEASIBLE
+    - 필수 노드 최소 신장 트리 + 서비스 시간이 하루 시간을 넘으면 INFEASIBLE
+    start_idx/end_idx가 None이면 더미 노드(이동 시간 0)로 본다.
+    """
+    n = len(matrix)
+    svc = [p.get("service_time", 0) for p in places[:n]]
+    dist = shortest_transit(matrix, svc)
+
+    _, earliest, latest = arrival_ranges(windows, dist, svc, start_idx, end_idx, global_start, global_end)
+    reachable = {i: bool(earliest[i] <= latest[i]) for i in range(n) if i not in (start_idx, end_idx)}
+
+    bound = 0.0
+    meal_groups, org_groups = defaultdict(list), defaultdict(list)
+    mandatory = [i for i in (start_idx, end_idx) if i is not None]
+    for i, ok in reachable.items():
+        p = places[i]
+        if p.get("category") == "restaurant" and windows[i][2]:
+            meal_groups[windows[i][2]].append(i)
+            org_groups[p.get("org_id", p["id"])].append(i)
+        elif p.get("is_mandatory", True):
+            if not ok:
+                return INFEASIBLE
+            mandatory.append(i)
+        elif not ok:
+            bound += penalty
+
+    for nodes in meal_groups.values():
+        if not any(reachable[i] for i in nodes):
+            bound += penalty
+    for nodes in org_groups.values():
+        if places[nodes[0]].get("is_mandatory", True) and not any(reachable[i] for i in nodes):
+            return INFEASIBLE
+
+    mandatory = sorted(set(mandatory))
+    busy = minimum_spanning_weight(dist, mandatory) + sum(
+        svc[i] for i in mandatory if i != end_idx and not is_dummy_node(places[i]["name"])
+    )
+    if global_start + busy > global_end:
+        return INFEASIBLE
+    return bound
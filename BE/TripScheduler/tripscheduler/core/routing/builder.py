@@ -2,6 +2,7 @@ from .components import (
     create_routing_model,
     register_transit,
     add_disjunctions,
+    add_meal_disjunctions,
     add_time_constraints
 )
 from .context import RoutingContext
@@ -18,9 +19,14 @@ def build_model(ctx: RoutingContext) -> None:
         ctx.routing, ctx.mgr,
         ctx.matrix, ctx.service_times, ctx.places
     )
+    meal_nodes = add_meal_disjunctions(
+        ctx.routing, ctx.mgr,
+        ctx.places, ctx.windows, ctx.start_idx, ctx.end_idx
+    )
     add_disjunctions(
         ctx.routing, ctx.mgr,
-        ctx.places, ctx.start_idx, ctx.end_idx
+        ctx.places, ctx.start_idx, ctx.end_idx,
+        exclude=meal_nodes
     )
     ctx.time_dimension = add_time_constraints(
         ctx.routing, ctx.callback_index,
@@ -0,0 +1,61 @@
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# 좌표(경도/위도) → km 환산
+KM_PER_DEG_LAT = 110.57
+
+# 시간 윈도우 중앙값 1분을 몇 km로 볼지 (60분 차이 ≈ 3km)
+DEFAULT_KM_PER_MINUTE = 0.05
+
+def place_features(
+    places: List[dict],
+    windows: List[Tuple[int, int, Optional[str]]],
+    global_start: int,
+    global_end: int,
+    km_per_minute: float = DEFAULT_KM_PER_MINUTE
+) -> np.ndarray:
+    """클러스터링 특징: (동서 km, 남북 km, 하루 안으로 자른 윈도우 중앙 시각 × km_per_minute)"""
+    lon = np.asarray([p["x_cord"] for p in places], dtype=float)
+    lat = np.asarray([p["y_cord"] for p in places], dtype=float)
+    opens = np.clip([o for o, _, _ in windows], global_start, global_end)
+    closes = np.clip([c for _, c, _ in windows], global_start, global_end)
+    km_per_deg_lon = KM_PER_DEG_LAT * math.cos(math.radians(float(lat.mean()) if len(lat) else 0.0))
+    return np.column_stack([
+        lon * km_per_deg_lon,
+        lat * KM_PER_DEG_LAT,
+        (opens + closes) / 2 * km_per_minute,
+    ])
+
+def kmeans(features: np.ndarray, k: int, iterations: int = 25) -> np.ndarray:
+    """
+    결정적 k-means (가장 먼 점 순서로 초기 중심 선택, Lloyd 반복).
+    빈 클러스터는 현재 중심에서 가장 먼 점으로 다시 채운다. 반환: 점별 클러스터 번호
+    """
+    n = len(features)
+    k = max(1, min(k, n))
+    centers = [features[0]]
+    gap = np.linalg.norm(features - centers[0], axis=1)
+    for _ in range(1, k):
+        far = int(np.argmax(gap))
+        centers.append(features[far])
+        gap = np.minimum(gap, np.linalg.norm(features - features[far], axis=1))
+    centers = np.asarray(centers)
+
+    labels = np.zeros(n, dtype=int)
+    for step in range(iterations):
+        dist = np.linalg.norm(features[:, None, :] - centers[None, :, :], axis=2)
+        new_labels = np.argmin(dist, axis=1)
+        for c in range(k):
+            members = new_labels == c
+            if members.any():
+                centers[c] = features[members].mean(axis=0)
+            else:
+                far = int(np.argmax(dist[np.arange(n), new_labels]))
+                new_labels[far] = c
+                centers[c] = features[far]
+        if step and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    return labels
@@ -1,31 +1,112 @@
+import numpy as np
+from collections import defaultdict
 from ortools.constraint_solver import pywrapcp, routing_enums_pb2
 from tripscheduler.core.routing.dummy import is_dummy_node
 
-def create_routing_model(n: int, start_idx: int, end_idx: int):
-    """Index Manager와 RoutingModel 객체를 생성해 반환"""
-    mgr = pywrapcp.RoutingIndexManager(n, 1, [start_idx], [end_idx])
+def _depot_list(idx):
+    """시작/종료 노드 인자(int 또는 차량별 리스트)를 리스트로 변환"""
+    return list(idx) if isinstance(idx, (list, tuple)) else [idx]
+
+def create_routing_model(n: int, start_idx, end_idx):
+    """
+    Index Manager와 RoutingModel 객체를 생성해 반환.
+    start_idx/end_idx가 리스트면 차량(여행일)별 시작/종료 노드로 보고 차량 여러 대 모델을 만든다.
+    """
+    starts, ends = _depot_list(start_idx), _depot_list(end_idx)
+    mgr = pywrapcp.RoutingIndexManager(n, len(starts), starts, ends)
     return mgr, pywrapcp.RoutingModel(mgr)
 
+def build_transit_matrix(matrix, service_times, places):
+    """
+    거리+서비스 시간(u→v: matrix[u][v] + service_times[u])을 places 크기의 정수 행렬로 미리 계산.
+    matrix 뒤에 붙은 더미 노드를 포함해 더미 행/열은 0으로 둔다.
+    """
+    n, m = len(places), len(matrix)
+    transit = np.zeros((n, n), dtype=np.int64)
+    if m:
+        transit[:m, :m] = np.asarray(matrix, dtype=np.int64) + np.asarray(service_times[:m], dtype=np.int64)[:, None]
+    dummy = np.array([is_dummy_node(p['name']) for p in places], dtype=bool)
+    transit[dummy, :] = 0
+    transit[:, dummy] = 0
+    return transit.tolist()
+
 def register_transit(routing, mgr, matrix, service_times, places):
     """
-    거리+서비스 시간을 더한 비용 함수를 callback으로 등록.
+    거리+서비스 시간을 더한 비용을 정수 행렬로 등록 (탐색 중 Python callback 호출 없음).
     더미 노드끼리는 비용 0으로 처리.
     """
-    def transit_callback(i, j):
-        u = mgr.IndexToNode(i)
-        v = mgr.IndexToNode(j)
-        if is_dummy_node(places[u]['name']) or is_dummy_node(places[v]['name']):
-            return 0
-        return matrix[u][v] + service_times[u]
-    return routing.RegisterTransitCallback(transit_callback)
+    return routing.RegisterTransitMatrix(build_transit_matrix(matrix, service_times, places))
 
-def add_disjunctions(routing, mgr, places, start_idx, end_idx, penalty: int = 1000):
+def add_disjunctions(routing, mgr, places, start_idx, end_idx, penalty: int = 1000, exclude=()):
     """
     is_mandatory=False인 노드에 대해 Disjunction(방문 안 해도 되지만 penalty 있음) 추가
+    exclude에 있는 노드(add_meal_disjunctions에서 처리한 식당 노드)는 건너뛴다
+    """
+    depots = set(_depot_list(start_idx) + _depot_list(end_idx))
+    for i, p in enumerate(places):
+        if i in exclude:
+            continue
+        if i not in depots and not p.get('is_mandatory', True):
+            routing.AddDisjunction([mgr.NodeToIndex(i)], penalty)
+
+def add_meal_disjunctions(routing, mgr, places, windows, start_idx, end_idx, penalty: int = 1000):
+    """
+    식사 윈도우(meal 태그)가 있는 restaurant 노드를 한 모델 안에서 배정.
+    - 같은 meal의 노드들은 하나의 disjunction: 최대 1곳 방문, 한 곳도 없으면 penalty
+    - 같은 org_id(분할 노드)는 최대 1회, is_mandatory면 정확히 1회 방문
+    처리한 노드 인덱스 집합을 반환한다 (add_disjunctions의 exclude로 사용)
     """
+    meal_groups, org_groups = defaultdict(list), defaultdict(list)
     for i, p in enumerate(places):
-        if i not in (start_idx, end_idx) and not p.get('is_mandatory', True):
+        if i in (start_idx, end_idx) or p.get('category') != 'restaurant' or not windows[i][2]:
+            continue
+        meal_groups[windows[i][2]].append(i)
+        org_groups[p.get('org_id', p['id'])].append(i)
+
+    for nodes in meal_groups.values():
+        routing.AddDisjunction([mgr.NodeToIndex(i) for i in nodes], penalty, 1)
+
+    solver = routing.solver()
+    for nodes in org_groups.values():
+        visits = solver.Sum([routing.ActiveVar(mgr.NodeToIndex(i)) for i in nodes])
+        if places[nodes[0]].get('is_mandatory', True):
+            solver.Add(visits == 1)
+        elif len(nodes) > 1:
+            solver.Add(visits <= 1)
+
+    return {i for nodes in meal_groups.values() for i in nodes}
+
+def add_daily_meal_constraints(routing, mgr, places, windows, start_idx, end_idx, penalty: int = 1000):
+    """
+    여러 여행일(차량) 모델용 식사 배정.
+    - 식당 노드는 각각 penalty가 있는 선택 방문
+    - 하루(차량)마다 같은 meal은 최대 1곳
+    - 같은 org_id는 여행 전체에서 최대 1회, is_mandatory면 정확히 1회 방문
+    처리한 노드 인덱스 집합을 반환한다 (add_disjunctions의 exclude로 사용)
+    """
+    depots = set(_depot_list(start_idx) + _depot_list(end_idx))
+    meal_groups, org_groups = defaultdict(list), defaultdict(list)
+    for i, p in enumerate(places):
+        if i in depots or p.get('category') != 'restaurant' or not windows[i][2]:
+            continue
+        meal_groups[windows[i][2]].append(i)
+        org_groups[p.get('org_id', p['id'])].append(i)
+
+    solver = routing.solver()
+    for nodes in meal_groups.values():
+        for i in nodes:
             routing.AddDisjunction([mgr.NodeToIndex(i)], penalty)
+        for vehicle in range(routing.vehicles()):
+            solver.Add(solver.Sum([routing.VehicleVar(mgr.NodeToIndex(i)) == vehicle for i in nodes]) <= 1)
+
+    for nodes in org_groups.values():
+        visits = solver.Sum([routing.ActiveVar(mgr.NodeToIndex(i)) for i in nodes])
+        if places[nodes[0]].get('is_mandatory', True):
+            solver.Add(visits == 1)
+        elif len(nodes) > 1:
+            solver.Add(visits <= 1)
+
+    return {i for nodes in meal_groups.values() for i in nodes}
 
 def add_time_constraints(
     routing, transit_cb_idx, global_start, global_end,
@@ -34,16 +115,19 @@ def add_time_constraints(
     """
     Time Dimension 추가 및 각 노드의 시간 윈도우 설정
     windows: [(open, close, tag), ...]
+    차량이 여러 대(여행일별)면 차량마다 하루 시작/종료 시간을 따로 고정한다.
     """
     routing.AddDimension(transit_cb_idx, 1000, global_end, False, "Time")
     td = routing.GetMutableDimension("Time")
 
     # 시작/종료 시간 고정
-    td.CumulVar(routing.Start(0)).SetRange(global_start, global_start)
-    td.CumulVar(routing.End(0)).SetRange(0, global_end)
+    for vehicle in range(routing.vehicles()):
+        td.CumulVar(routing.Start(vehicle)).SetRange(global_start, global_start)
+        td.CumulVar(routing.End(vehicle)).SetRange(0, global_end)
 
+    depots = set(_depot_list(start_idx) + _depot_list(end_idx))
     for i, (o, c, _) in enumerate(windows):
-        if i in (start_idx, end_idx):
+        if i in depots:
             continue
         idx = mgr.NodeToIndex(i)
         lo = max(global_start, o - 10)
@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from typing import List, Tuple, Optional
 from ortools.constraint_solver import pywrapcp
+from tripscheduler.core.routing.reduction import NodeReduction
 
 @dataclass
 class RoutingContext:
@@ -13,6 +14,10 @@ class RoutingContext:
     global_start: int
     global_end: int
     path_matrix: List[List[Optional[List[float]]]] = field(default_factory=list)
+    path_tolerance_m: float = 0.0
+    path_format: str = "coords"
+    # 모델을 축소 노드로 만든 경우 해를 원래 인덱스로 펼칠 매핑
+    reduction: Optional[NodeReduction] = None
 
     routing: pywrapcp.RoutingModel = field(init=False)
     mgr: pywrapcp.RoutingIndexManager = field(init=False)
@@ -45,6 +50,9 @@ def build_context(
     callback_index: int,
     time_dimension: pywrapcp.RoutingDimension,
     path_matrix: Optional[List[List[Optional[List[float]]]]] = None,
+    path_tolerance_m: float = 0.0,
+    path_format: str = "coords",
+    reduction: Optional[NodeReduction] = None,
 ) -> RoutingContext:
     ctx = RoutingContext(
         places=places,
@@ -56,6 +64,9 @@ def build_context(
         global_start=global_start,
         global_end=global_end,
         path_matrix=path_matrix or [],
+        path_tolerance_m=path_tolerance_m,
+        path_format=path_format,
+        reduction=reduction,
     )
     ctx.attach_routing_components(routing, mgr, callback_index, time_dimension)
     return ctx
@@ -0,0 +1,174 @@
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from tripscheduler.core.routing.bounds import arrival_ranges, minimum_spanning_weight, shortest_transit
+from tripscheduler.core.routing.dummy import is_dummy_node
+from tripscheduler.utils.time import minutes_to_time_str
+
+logger = logging.getLogger(__name__)
+
+# InfeasibleScheduleError.reason 값
+DAY_WINDOW = "day_window"                   # 하루 시작이 종료보다 늦음
+UNREACHABLE_FROM_START = "unreachable_from_start"  # 시작 노드에서 윈도우 안에 도착 불가
+CANNOT_REACH_END = "cannot_reach_end"       # 방문 후 종료 노드에 제시간에 도착 불가
+NO_MEAL_WINDOW = "no_meal_window"           # 필수 식당의 어떤 식사 윈도우에도 방문 불가
+WINDOW_CONFLICT = "window_conflict"         # 두 필수 장소를 어느 순서로도 방문 불가
+WINDOW_OVERLOAD = "window_overload"         # 한 구간에 몰린 필수 장소 서비스 시간이 구간보다 김
+TOTAL_TIME_EXCEEDED = "total_time_exceeded" # 필수 장소 서비스 + 최소 이동 시간이 하루보다 김
+
+class InfeasibleScheduleError(ValueError):
+    """
+    solver를 실행하기 전에 해가 없음이 확인된 경우.
+    - reason: 위 상수 중 하나
+    - places: 원인이 된 장소 이름
+    - detail: 판단에 쓴 시각/시간 (분)
+    """
+
+    def __init__(self, reason: str, message: str, places: Optional[List[str]] = None, detail: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.reason = reason
+        self.places = list(places or [])
+        self.detail = dict(detail or {})
+
+    def __reduce__(self):
+        # 조합 병렬 실행 시 워커 프로세스에서 그대로 전달되도록
+        return type(self), (self.reason, str(self), self.places, self.detail)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"reason": self.reason, "message": str(self), "places": self.places, "detail": self.detail}
+
+def _required_nodes(places, windows, start_idx, end_idx) -> Tuple[List[int], Dict[Any, List[int]]]:
+    """필수 일반 노드와 필수 식당(org_id → 식사별 분할 노드)"""
+    singles, orgs = [], defaultdict(list)
+    for i, p in enumerate(places):
+        if i in (start_idx, end_idx) or is_dummy_node(p["name"]) or not p.get("is_mandatory", True):
+            continue
+        if p.get("category") == "restaurant" and windows[i][2]:
+            orgs[p.get("org_id", p["id"])].append(i)
+        else:
+            singles.append(i)
+    return singles, orgs
+
+def find_infeasibility(
+    places: List[dict],
+    windows: List[Tuple[int, int, Optional[str]]],
+    matrix: List[List[int]],
+    start_idx: int,
+    end_idx: int,
+    global_start: int,
+    global_end: int
+) -> Optional[InfeasibleScheduleError]:
+    """
+    run_scheduler 모델에 해가 없음을 빠르게(모델 없이) 찾는다. 없음이 확실할 때만 오류를 반환하고, 아니면 None.
+    1) 필수 장소: 시작 노드에서 윈도우 안에 도착할 수 있는지, 방문 후 종료 노드에 global_end까지 닿는지
+    2) 필수 식당: 분할 노드 중 하나라도 1)을 만족하는지
+    3) 필수 장소 두 곳씩: 적어도 한 순서로 이어 방문할 수 있는지
+    4) 도착 가능 구간이 [a, b] 안에 모두 들어가는 필수 장소들의 서비스 시간 합이 b - a 이하인지
+    5) 필수 장소 서비스 시간 + 최소 신장 트리 이동 시간이 하루 시간 이하인지
+    """
+    if global_end <= global_start:
+        return InfeasibleScheduleError(
+            DAY_WINDOW,
+            f"하루 시작({minutes_to_time_str(global_start)})이 종료({minutes_to_time_str(global_end)})보다 늦습니다.",
+            detail={"global_start": global_start, "global_end": global_end}
+        )
+
+    # 매트릭스 뒤에 붙은 더미 노드는 이동 시간 0 (build_transit_matrix와 같음).
+    # 더미 노드는 경로 양 끝에만 오므로 최단 경로의 중간 노드로 쓰지 않는다
+    n = len(matrix)
+    svc = [p.get("service_time", 0) for p in places]
+    dist = np.zeros((len(places), len(places)))
+    dist[:n, :n] = shortest_transit(matrix, svc[:n])
+    from_start, earliest, latest = arrival_ranges(windows, dist, svc, start_idx, end_idx, global_start, global_end)
+    names = [p["name"] for p in places]
+    singles, orgs = _required_nodes(places, windows, start_idx, end_idx)
+
+    # 1) 시작/종료 노드와의 도달 가능성
+    for i in singles:
+        if earliest[i] <= latest[i]:
+            continue
+        close = min(global_end, windows[i][1] + 10)
+        if from_start[i] > close:
+            return InfeasibleScheduleError(
+                UNREACHABLE_FROM_START,
+                f"필수 장소 {names[i]}에 {minutes_to_time_str(close)}까지 도착할 수 없습니다 "
+                f"(시작 노드에서 가장 빠른 도착 {minutes_to_time_str(int(from_start[i]))}).",
+                [names[i]], {"earliest_arrival": int(from_start[i]), "latest_arrival": int(close)}
+            )
+        return InfeasibleScheduleError(
+            CANNOT_REACH_END,
+            f"필수 장소 {names[i]}을(를) 방문하면 종료 노드에 {minutes_to_time_str(global_end)}까지 도착할 수 없습니다.",
+            [names[i]], {"earliest_arrival": int(earliest[i]), "latest_arrival": int(latest[i])}
+        )
+
+    # 2) 필수 식당: 식사 윈도우 중 하나는 가능해야 함 (분할 노드가 하나면 일반 필수 장소처럼 이후 검사에 포함)
+    chain = list(singles)
+    for org, nodes in orgs.items():
+        ok = [i for i in nodes if earliest[i] <= latest[i]]
+        if not ok:
+            label = names[nodes[0]].rsplit(" (", 1)[0]
+            return InfeasibleScheduleError(
+                NO_MEAL_WINDOW,
+                f"필수 식당 {label}은(는) 어떤 식사 시간에도 방문할 수 없습니다.",
+                [label], {"meals": [windows[i][2] for i in nodes]}
+            )
+        if len(ok) == 1:
+            chain.append(ok[0])
+
+    if chain:
+        idx = np.asarray(sorted(chain))
+        e, l = earliest[idx], latest[idx]
+        s = np.asarray([svc[i] for i in idx], dtype=float)
+
+        # 3) 두 장소를 어느 순서로도 이어 방문할 수 없으면 불가
+        forward = e[:, None] + s[:, None] + dist[np.ix_(idx, idx)] <= l[None, :]
+        conflict = ~(forward | forward.T)
+        np.fill_diagonal(conflict, False)
+        if conflict.any():
+            a, b = (int(k) for k in np.argwhere(conflict)[0])
+            pair = [names[idx[a]], names[idx[b]]]
+            return InfeasibleScheduleError(
+                WINDOW_CONFLICT,
+                f"필수 장소 {pair[0]}와(과) {pair[1]}의 시간 윈도우가 겹치지 않아 둘 다 방문할 수 없습니다.",
+                pair, {"windows": [[int(e[a]), int(l[a])], [int(e[b]), int(l[b])]]}
+            )
+
+        # 4) 구간 [a, b]에 서비스가 모두 들어가야 하는 장소들의 서비스 시간 합
+        lo = np.unique(e)
+        hi = np.unique(l + s)
+        inside = (e[None, None, :] >= lo[:, None, None]) & ((l + s)[None, None, :] <= hi[None, :, None])
+        load = (inside * s).sum(axis=2)
+        span_len = hi[None, :] - lo[:, None]
+        over = (load > span_len) & (span_len > 0)
+        if over.any():
+            a, b = (int(k) for k in np.argwhere(over)[0])
+            members = [names[i] for i, hit in zip(idx, inside[a, b]) if hit]
+            return InfeasibleScheduleError(
+                WINDOW_OVERLOAD,
+                f"{minutes_to_time_str(int(lo[a]))}~{minutes_to_time_str(int(hi[b]))} 사이에 필수 장소 "
+                f"{len(members)}곳의 서비스 시간({int(load[a, b])}분)이 들어가지 않습니다.",
+                members, {"start": int(lo[a]), "end": int(hi[b]), "service": int(load[a, b])}
+            )
+
+    # 5) 하루 전체 시간
+    required = sorted(set(chain) | {start_idx, end_idx})
+    travel = minimum_spanning_weight(dist, required)
+    service = sum(svc[i] for i in required if i != end_idx and not is_dummy_node(names[i]))
+    if global_start + travel + service > global_end:
+        return InfeasibleScheduleError(
+            TOTAL_TIME_EXCEEDED,
+            f"필수 장소 서비스 시간({service}분)과 최소 이동 시간({int(travel)}분)이 "
+            f"하루 일정({global_end - global_start}분)보다 깁니다.",
+            [names[i] for i in chain],
+            {"service": service, "travel": int(travel), "available": global_end - global_start}
+        )
+    return None
+
+def check_feasibility(*args, **kwargs) -> None:
+    """find_infeasibility와 같은 입력. 해가 없음이 확인되면 InfeasibleScheduleError"""
+    error = find_infeasibility(*args, **kwargs)
+    if error is not None:
+        logger.warning("사전 검사로 해 없음 확인 (%s): %s", error.reason, error)
+        raise error
@@ -0,0 +1,230 @@
+import time
+import logging
+from collections import defaultdict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from tripscheduler.core.routing.components import build_transit_matrix
+from tripscheduler.core.routing.dummy import is_dummy_node
+
+logger = logging.getLogger(__name__)
+
+# OR-Tools 모델과 같은 값 (add_disjunctions / add_meal_disjunctions / add_time_constraints)
+PENALTY = 1000
+WINDOW_SLACK = 10
+
+# 경로 개선(2-opt / Or-opt) 시간 예산
+DEFAULT_BUDGET_MS = 40
+
+class _Problem:
+    """휴리스틱용 배열: transit(u→v 이동 + u 서비스 시간), 노드별 도착 허용 구간 [lo, hi]"""
+
+    def __init__(self, places, windows, matrix, service_times, start_idx, end_idx, global_start, global_end):
+        n = len(places)
+        self.transit = np.asarray(build_transit_matrix(matrix, service_times, places), dtype=np.int64)
+        self.rows = self.transit.tolist()
+        lo = np.full(n, global_start, dtype=np.int64)
+        hi = np.full(n, global_end, dtype=np.int64)
+        for i, (o, c, _) in enumerate(windows):
+            if i in (start_idx, end_idx):
+                continue
+            if o is not None:
+                lo[i] = max(global_start, o - WINDOW_SLACK)
+            if c is not None:
+                hi[i] = min(global_end, c + WINDOW_SLACK)
+        hi[start_idx] = global_start
+        self.lo, self.hi = lo, hi
+        self.start, self.end = start_idx, end_idx
+
+    def schedule(self, route: List[int]) -> Optional[List[int]]:
+        """가장 이른 도착 시각 목록. 윈도우를 어기면 None"""
+        lo, hi, rows = self.lo, self.hi, self.rows
+        arrivals = [int(lo[route[0]])]
+        for u, v in zip(route, route[1:]):
+            t = max(int(lo[v]), arrivals[-1] + rows[u][v])
+            if t > hi[v]:
+                return None
+            arrivals.append(t)
+        return arrivals
+
+    def latest(self, route: List[int]) -> np.ndarray:
+        """뒤쪽 방문을 지키면서 각 위치에 도착할 수 있는 가장 늦은 시각"""
+        rows = self.rows
+        late = [0] * len(route)
+        late[-1] = int(self.hi[route[-1]])
+        for k in range(len(route) - 2, -1, -1):
+            late[k] = min(int(self.hi[route[k]]), late[k + 1] - rows[route[k]][route[k + 1]])
+        return np.asarray(late, dtype=np.int64)
+
+    def travel(self, route: List[int]) -> int:
+        rows = self.rows
+        return sum(rows[u][v] for u, v in zip(route, route[1:]))
+
+    def best_insertion(self, route: List[int], arrivals, late, v: int) -> Tuple[Optional[int], float]:
+        """v를 끼울 수 있는 위치 중 이동 시간 증가가 가장 작은 곳 (없으면 None)"""
+        r = np.asarray(route)
+        prev, nxt = r[:-1], r[1:]
+        T = self.transit
+        arr_v = np.maximum(self.lo[v], np.asarray(arrivals[:-1]) + T[prev, v])
+        arr_next = np.maximum(self.lo[nxt], arr_v + T[v, nxt])
+        ok = (arr_v <= self.hi[v]) & (arr_next <= late[1:])
+        if not ok.any():
+            return None, np.inf
+        delta = np.where(ok, T[prev, v] + T[v, nxt] - T[prev, nxt], np.iinfo(np.int64).max)
+        k = int(np.argmin(delta))
+        return k + 1, float(delta[k])
+
+def _improve(problem: _Problem, route: List[int], deadline: float) -> List[int]:
+    """시간 윈도우를 지키는 2-opt / Or-opt(구간 1~3개 이동)로 총 이동 시간을 줄인다"""
+    rows = problem.rows
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        n = len(route)
+
+        # 2-opt: route[i..j] 뒤집기
+        for i in range(1, n - 2):
+            for j in range(i + 1, n - 1):
+                before = rows[route[i - 1]][route[i]] + rows[route[j]][route[j + 1]]
+                before += sum(rows[route[k]][route[k + 1]] for k in range(i, j))
+                after = rows[route[i - 1]][route[j]] + rows[route[i]][route[j + 1]]
+                after += sum(rows[route[k + 1]][route[k]] for k in range(i, j))
+                if after < before:
+                    candidate = route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+                    if problem.schedule(candidate) is not None:
+                        route, improved = candidate, True
+            if time.perf_counter() >= deadline:
+                return route
+
+        # Or-opt: route[i:i+size]를 다른 위치로 이동
+        for size in (1, 2, 3):
+            i = 1
+            while i + size < len(route):
+                segment = route[i:i + size]
+                rest = route[:i] + route[i + size:]
+                removed = (
+                    rows[route[i - 1]][segment[0]] + rows[segment[-1]][route[i + size]]
+                    - rows[route[i - 1]][route[i + size]]
+                )
+                best, best_gain = None, 0
+                for k in range(1, len(rest)):
+                    if k == i:
+                        continue
+                    added = rows[rest[k - 1]][segment[0]] + rows[segment[-1]][rest[k]] - rows[rest[k - 1]][rest[k]]
+                    if removed - added > best_gain:
+                        candidate = rest[:k] + segment + rest[k:]
+                        if problem.schedule(candidate) is not None:
+                            best, best_gain = candidate, removed - added
+                if best is not None:
+                    route, improved = best, True
+                i += 1
+            if time.perf_counter() >= deadline:
+                return route
+    return route
+
+def heuristic_route(
+    places: List[dict],
+    windows: List[Tuple[int, int, Optional[str]]],
+    matrix: List[List[int]],
+    service_times: List[int],
+    start_idx: int,
+    end_idx: int,
+    global_start: int,
+    global_end: int,
+    budget_ms: float = DEFAULT_BUDGET_MS,
+    initial_route: Optional[List[int]] = None
+) -> Tuple[Optional[List[Tuple[int, int]]], Optional[int]]:
+    """
+    OR-Tools 모델과 같은 제약(시간 윈도우, 필수 방문, 식사별 1곳, 같은 식당 1회)을
+    NumPy 최소 비용 삽입 + 2-opt/Or-opt로 빠르게 푼다.
+    - 필수 노드를 먼저, 그 다음 선택 노드를 이동 시간 증가가 가장 작은 곳에 삽입
+    - 개선으로 시간이 남으면 남은 노드 삽입을 다시 시도 (budget_ms 안에서 반복)
+    - initial_route(시작/종료 제외 노드 순서)가 있으면 필수 노드 다음으로 그 순서대로 삽입을 시도한 뒤 시작
+    반환: ([(노드, 도착 시각), ...] 시작~종료, objective(미방문 penalty 합)). 필수 노드를 넣지 못하면 (None, None)
+    """
+    deadline = time.perf_counter() + budget_ms / 1000
+    problem = _Problem(places, windows, matrix, service_times, start_idx, end_idx, global_start, global_end)
+
+    meal_of, org_of, mandatory = {}, {}, set()
+    candidates = []
+    for i, p in enumerate(places):
+        if i in (start_idx, end_idx) or is_dummy_node(p["name"]):
+            continue
+        candidates.append(i)
+        if p.get("category") == "restaurant" and windows[i][2]:
+            meal_of[i] = windows[i][2]
+            org_of[i] = p.get("org_id", p["id"])
+        if p.get("is_mandatory", True):
+            mandatory.add(i)
+    mandatory_orgs = {org_of[i] for i in mandatory if i in org_of}
+
+    route = [start_idx, end_idx]
+    if problem.schedule(route) is None:
+        return None, None
+    used_meals, used_orgs = set(), set()
+
+    def eligible(i):
+        return i not in route and meal_of.get(i) not in used_meals and org_of.get(i) not in used_orgs
+
+    def use(i):
+        if i in meal_of:
+            used_meals.add(meal_of[i])
+            used_orgs.add(org_of[i])
+
+    def must(i):
+        return (i in mandatory and i not in meal_of) or org_of.get(i) in mandatory_orgs
+
+    def insert_all(required_only=False):
+        nonlocal route
+        while True:
+            arrivals = problem.schedule(route)
+            late = problem.latest(route)
+            pool = [i for i in candidates if eligible(i)]
+            required = [i for i in pool if must(i)]
+            if required_only and not required:
+                return
+            best = None
+            for i in (required or pool):
+                pos, delta = problem.best_insertion(route, arrivals, late, i)
+                if pos is not None and (best is None or delta < best[2]):
+                    best = (i, pos, delta)
+            if best is None:
+                return
+            i, pos, _ = best
+            route = route[:pos] + [i] + route[pos:]
+            use(i)
+
+    if initial_route:
+        # 필수 노드를 먼저 넣고, 초기 순서대로 가장 싼 위치에 삽입
+        insert_all(required_only=True)
+        allowed = set(candidates)
+        for i in initial_route:
+            if i in allowed and eligible(i):
+                pos, _ = problem.best_insertion(route, problem.schedule(route), problem.latest(route), i)
+                if pos is not None:
+                    route = route[:pos] + [i] + route[pos:]
+                    use(i)
+
+    insert_all()
+    while time.perf_counter() < deadline:
+        size = len(route)
+        route = _improve(problem, route, deadline)
+        insert_all()
+        if len(route) == size:
+            break
+
+    visited = set(route)
+    if any(must(i) and i not in visited for i in candidates if i not in meal_of) or \
+            not mandatory_orgs <= {org_of[i] for i in visited if i in org_of}:
+        logger.warning("휴리스틱: 필수 장소를 넣을 수 없음")
+        return None, None
+
+    meals = defaultdict(bool)
+    for i in meal_of:
+        meals[meal_of[i]] |= i in visited
+    objective = PENALTY * (
+        sum(1 for i in candidates if i not in meal_of and i not in mandatory and i not in visited)
+        + sum(1 for hit in meals.values() if not hit)
+    )
+    return list(zip(route, problem.schedule(route))), objective
@@ -1,18 +1,20 @@
 from tripscheduler.core.routing.dummy import is_dummy_node
 from tripscheduler.utils.format import format_visit_info
 from tripscheduler.core.routing.context import RoutingContext
+from tripscheduler.utils.geometry import format_path
+import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
 
 def append_segment(full_path, segment):
-    if not segment:
+    if segment is None or len(segment) == 0:
         return
 
     last_full = full_path[-1][-1] if full_path else None
     first_seg = segment[0]
     
-    if full_path and last_full == first_seg:
+    if full_path and np.array_equal(last_full, first_seg):
         full_path.append(segment[1:])
         logger.debug("중복 첫 점 제거 후 이어붙임: 제거된 점='%s', 추가된 점 수=%d", first_seg, len(segment) - 1)
     else:
@@ -40,30 +42,50 @@ def make_visit(order, node, arrival, stay, travel, wait, delay, place):
         y_cord=place["y_cord"]
     )
 
-def parse_solution(ctx: RoutingContext, solution):
+def parse_solution(ctx: RoutingContext, solution, vehicle: int = 0):
+    """
+    vehicle(여러 여행일 모델이면 여행일 순번) 경로를 visits와 full_path로 변환.
+    ctx.reduction이 있으면 축소 모델의 노드를 원래 인덱스로 펼친 뒤 ctx.places/matrix 기준으로 파싱한다.
+    """
+    logger.info("솔루션 파싱 시작")
+    sequence = solution_sequence(ctx.routing, ctx.mgr, ctx.time_dimension, solution, vehicle)
+    if ctx.reduction is not None:
+        sequence = ctx.reduction.expand(sequence)
+    return parse_route(ctx, sequence)
+
+def solution_sequence(routing, mgr, time_dimension, solution, vehicle: int = 0):
+    """vehicle 경로의 [(노드, 도착 시각), ...] (시작~종료 노드 포함)"""
+    sequence = []
+    idx = routing.Start(vehicle)
+    while not routing.IsEnd(idx):
+        sequence.append((mgr.IndexToNode(idx), solution.Value(time_dimension.CumulVar(idx))))
+        idx = solution.Value(routing.NextVar(idx))
+    sequence.append((mgr.IndexToNode(idx), solution.Value(time_dimension.CumulVar(idx))))
+    return sequence
+
+def parse_route(ctx: RoutingContext, sequence):
+    """
+    [(노드, 도착 시각), ...] 순서(시작~종료 노드 포함)를 visits와 full_path로 변환.
+    OR-Tools 해(parse_solution)와 휴리스틱 경로가 같은 방문 형식을 쓰도록 공유한다.
+    """
     visits = []
     full_path = []
 
-    idx = ctx.routing.Start(0)
     order = 1
     prev_node = None
     prev_departure = None
 
-    logger.info("솔루션 파싱 시작")
-
-    while not ctx.routing.IsEnd(idx):
-        node = ctx.mgr.IndexToNode(idx)
+    for node, arrival in sequence[:-1]:
         place = ctx.places[node]
         name = place['name']
 
         if not is_dummy_node(name):
-            arrival = solution.Value(ctx.time_dimension.CumulVar(idx))
             stay = ctx.service_times[node]
             travel = wait = delay = None
 
             if prev_node is not None:
                 travel = ctx.matrix[prev_node][node]
-                segment = ctx.path_matrix[prev_node][node] or []
+                segment = ctx.path_matrix[prev_node][node]
                 append_segment(full_path, segment)
                 wait, delay = calc_travel_info(prev_departure, arrival, travel)
 
@@ -80,20 +102,17 @@ def parse_solution(ctx: RoutingContext, solution):
             prev_node = node
             prev_departure = arrival + stay
 
-        idx = solution.Value(ctx.routing.NextVar(idx))
-
     # End 노드 처리
-    end_node = ctx.mgr.IndexToNode(idx)
+    end_node, arrival = sequence[-1]
     end_place = ctx.places[end_node]
     end_name = end_place['name']
 
     if not is_dummy_node(end_name):
-        arrival = solution.Value(ctx.time_dimension.CumulVar(idx))
         travel = wait = None
 
         if prev_node is not None:
             travel = ctx.matrix[prev_node][end_node]
-            segment = ctx.path_matrix[prev_node][end_node] or []
+            segment = ctx.path_matrix[prev_node][end_node]
             append_segment(full_path, segment)
             wait = max(0, arrival - (prev_departure + travel))
 
@@ -102,5 +121,6 @@ def parse_solution(ctx: RoutingContext, solution):
 
         visits.append(make_visit(order, end_node, arrival, 0, travel, wait, None, end_place))
 
+    full_path = format_path(full_path, ctx.path_tolerance_m, ctx.path_format)
     logger.info("솔루션 파싱 완료. 총 %d개 장소", len(visits))
     return visits, full_path
@@ -1,3 +1,4 @@
+from typing import Optional
 from .context import RoutingContext
 from .builder import build_model
 from .solver import solve
@@ -6,11 +7,12 @@ from .parser import parse_solution
 def plan_route(
     places, windows, matrix, service_times,
     start_idx, end_idx, global_start, global_end,
-    time_limit_sec: int = 10
+    time_limit_sec: Optional[float] = None,
+    profile: Optional[str] = None
 ):
     """
     1) RoutingContext 생성
-    2) build_model → solve → parse_solution 순으로 최적 경로를 계산
+    2) build_model → solve(profile) → parse_solution 순으로 최적 경로를 계산
     3) (visits, objective) 튜플을 반환
     """
     ctx = RoutingContext(
@@ -25,7 +27,7 @@ def plan_route(
     )
 
     build_model(ctx)
-    sol = solve(ctx, time_limit_sec)
+    sol = solve(ctx, time_limit_sec, profile)
     visits = parse_solution(ctx, sol)
     objective = sol.ObjectiveValue() if sol else None
     return visits, objective
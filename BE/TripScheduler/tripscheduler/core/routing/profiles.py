@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+from tripscheduler.core.routing.dummy import is_dummy_node
+
+FSS = routing_enums_pb2.FirstSolutionStrategy
+LSM = routing_enums_pb2.LocalSearchMetaheuristic
+
+@dataclass(frozen=True)
+class SolverProfile:
+    """
+    탐색 파라미터 프로파일.
+    time_limit = base_sec + per_node_sec × 노드 수 × (1 + 윈도우 타이트함), max_sec로 제한
+    - metaheuristic_min_nodes: 노드 수가 이보다 적으면 메타휴리스틱 없이 greedy descent로 끝낸다
+    - improvement_rate / improvement_distance: 최근 distance개 해 동안 개선율이 rate 미만이면 중단
+    """
+    name: str
+    base_sec: float
+    per_node_sec: float
+    max_sec: float
+    metaheuristic: int
+    metaheuristic_min_nodes: int
+    solution_limit: Optional[int] = None
+    improvement_rate: Optional[float] = None
+    improvement_distance: int = 0
+
+PROFILES = {
+    "fast": SolverProfile(
+        "fast", base_sec=0.5, per_node_sec=0.05, max_sec=2,
+        metaheuristic=LSM.GREEDY_DESCENT, metaheuristic_min_nodes=10**9,
+        solution_limit=100,
+    ),
+    "balanced": SolverProfile(
+        "balanced", base_sec=1, per_node_sec=0.2, max_sec=10,
+        metaheuristic=LSM.GUIDED_LOCAL_SEARCH, metaheuristic_min_nodes=8,
+        improvement_rate=0.01, improvement_distance=200,
+    ),
+    "quality": SolverProfile(
+        "quality", base_sec=3, per_node_sec=0.5, max_sec=30,
+        metaheuristic=LSM.GUIDED_LOCAL_SEARCH, metaheuristic_min_nodes=4,
+        improvement_rate=0.001, improvement_distance=1000,
+    ),
+}
+DEFAULT_PROFILE = "balanced"
+
+# 마감이 임박해도 초기해를 찾을 최소 시간
+MIN_TIME_LIMIT_SEC = 0.1
+
+# 윈도우가 이보다 타이트하면 시간 순 삽입 기반 초기해를 사용
+TIGHT_WINDOW_THRESHOLD = 0.5
+
+def get_profile(name: Optional[str]) -> SolverProfile:
+    if name is None:
+        name = DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"지원하지 않는 solver profile입니다: {name} (가능: {', '.join(PROFILES)})")
+    return PROFILES[name]
+
+def window_tightness(
+    windows: List[Tuple[int, int, Optional[str]]],
+    global_start: int,
+    global_end: int
+) -> float:
+    """
+    0(윈도우가 전역 범위 전체) ~ 1(윈도우 폭 0) 사이 값.
+    전역 범위로 자른 각 윈도우 폭 평균을 전역 범위 길이로 나눈 값의 보수.
+    """
+    span = global_end - global_start
+    if span <= 0 or not windows:
+        return 0.0
+    widths = [
+        max(0, min(c, global_end) - max(o, global_start))
+        for o, c, _ in windows
+    ]
+    return 1.0 - sum(widths) / (len(widths) * span)
+
+def build_search_parameters(
+    profile: Optional[str],
+    n_nodes: int,
+    tightness: float = 0.0,
+    time_limit_sec: Optional[float] = None,
+    time_cap_sec: Optional[float] = None
+):
+    """
+    프로파일과 문제 크기(노드 수, 윈도우 타이트함)로 탐색 파라미터 생성.
+    time_limit_sec가 주어지면 프로파일 계산값 대신 사용하고,
+    time_cap_sec(공유 마감까지 남은 시간 등)가 있으면 시간 제한을 그 이하로 자른다.
+    """
+    prof = get_profile(profile)
+    params = pywrapcp.DefaultRoutingSearchParameters()
+
+    # 아크 비용이 없는 모델이라 윈도우가 타이트하면 삽입 기반 초기해가 유리
+    params.first_solution_strategy = (
+        FSS.PARALLEL_CHEAPEST_INSERTION if tightness >= TIGHT_WINDOW_THRESHOLD else FSS.AUTOMATIC
+    )
+    params.local_search_metaheuristic = (
+        prof.metaheuristic if n_nodes >= prof.metaheuristic_min_nodes else LSM.GREEDY_DESCENT
+    )
+
+    if time_limit_sec is None:
+        time_limit_sec = min(prof.max_sec, prof.base_sec + prof.per_node_sec * n_nodes * (1 + tightness))
+    if time_cap_sec is not None:
+        time_limit_sec = max(MIN_TIME_LIMIT_SEC, min(time_limit_sec, time_cap_sec))
+    params.time_limit.FromMilliseconds(int(time_limit_sec * 1000))
+
+    if prof.solution_limit is not None:
+        params.solution_limit = prof.solution_limit
+    if prof.improvement_rate is not None:
+        params.improvement_limit_parameters.improvement_rate_coefficient = prof.improvement_rate
+        params.improvement_limit_parameters.improvement_rate_solutions_distance = prof.improvement_distance
+    return params
+
+def search_parameters_for(
+    places: List[dict],
+    windows: List[Tuple[int, int, Optional[str]]],
+    global_start: int,
+    global_end: int,
+    profile: Optional[str] = None,
+    time_limit_sec: Optional[float] = None,
+    time_cap_sec: Optional[float] = None,
+    depots: Iterable[int] = ()
+):
+    """
+    실제 방문 노드(시작/종료 노드 depots와 더미 노드 제외)의 수와 윈도우로 build_search_parameters 호출.
+    시작/종료·더미 노드까지 세면 작은 문제가 더 큰 크기로 잡혀 시간 제한과 메타휴리스틱이 달라진다.
+    """
+    depots = set(depots)
+    real = [
+        w for i, (p, w) in enumerate(zip(places, windows))
+        if i not in depots and not is_dummy_node(p["name"])
+    ]
+    return build_search_parameters(
+        profile, len(real), window_tightness(real, global_start, global_end),
+        time_limit_sec, time_cap_sec
+    )
@@ -0,0 +1,121 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from tripscheduler.api.matrix import node_key
+from tripscheduler.core.routing.bounds import arrival_ranges, shortest_transit
+from tripscheduler.core.routing.dummy import is_dummy_node
+
+logger = logging.getLogger(__name__)
+
+# NodeReduction.dropped 값
+UNREACHABLE = "unreachable"   # 어떤 경로로도 윈도우 안에 방문 불가
+DUPLICATE = "duplicate"       # 같은 장소의 다른 노드가 윈도우는 넓고 서비스 시간은 짧음
+
+@dataclass
+class NodeReduction:
+    """
+    모델을 만들기 전에 뺀 선택 노드와 인덱스 매핑.
+    - kept[j]: 축소된 j번째 노드의 원래 인덱스 (순서 유지, 더미 노드는 항상 뒤쪽에 남음)
+    - dropped: 원래 인덱스 → 제외 사유
+    """
+    kept: List[int]
+    dropped: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def reduced(self) -> bool:
+        return bool(self.dropped)
+
+    def index_of(self, node: int) -> int:
+        """원래 인덱스 → 축소 인덱스 (시작/종료 노드처럼 남아 있는 노드만)"""
+        return self.kept.index(node)
+
+    def apply(self, places, windows, matrix, service_times):
+        """축소된 (places, windows, matrix, service_times). 매트릭스 행이 없는 더미 노드는 그대로 뒤에 붙는다"""
+        if not self.reduced:
+            return places, windows, matrix, service_times
+        rows = [i for i in self.kept if i < len(matrix)]
+        return (
+            [places[i] for i in self.kept],
+            [windows[i] for i in self.kept],
+            [[matrix[r][c] for c in rows] for r in rows],
+            [service_times[i] for i in self.kept],
+        )
+
+    def expand(self, sequence: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """축소 모델의 [(노드, 도착 시각), ...]를 원래 인덱스로 되돌린다"""
+        if not self.reduced:
+            return sequence
+        return [(self.kept[node], arrival) for node, arrival in sequence]
+
+def _identity(place: dict) -> Tuple:
+    """같은 장소 판정: category까지 포함한 node_key와 좌표가 모두 같아야 한다 (id는 테이블마다 따로 매겨짐)"""
+    return node_key(place), place.get("x_cord"), place.get("y_cord")
+
+def _contains(outer: Tuple[int, int, Optional[str]], inner: Tuple[int, int, Optional[str]]) -> bool:
+    return outer[0] <= inner[0] and inner[1] <= outer[1]
+
+def reduce_nodes(
+    places: List[dict],
+    windows: List[Tuple[int, int, Optional[str]]],
+    matrix: List[List[int]],
+    service_times: List[int],
+    start_idx: int,
+    end_idx: int,
+    global_start: int,
+    global_end: int
+) -> NodeReduction:
+    """
+    방문해도 목적값이 나아질 수 없는 선택 노드를 찾는다 (필수/시작·종료/더미/식사 분할 노드는 그대로 둔다).
+    1) 시작 노드에서의 최단 도착과 종료 노드까지의 최단 이동으로 보아 윈도우 안에 방문할 수 없는 노드
+    2) 같은 장소(category·원본 id·좌표가 같은 노드)가 여러 번 들어온 경우, 다른 노드보다 윈도우가 좁고 서비스 시간이 긴 노드
+       (같은 장소를 두 번 방문하는 일정은 의미가 없으므로 더 방문하기 쉬운 쪽만 남김)
+    빠진 노드는 미방문과 같으므로 호출 측은 목적값에 노드당 미방문 penalty를 더해 기존과 비교 가능하게 한다.
+    """
+    candidates = {
+        i for i, p in enumerate(places)
+        if i not in (start_idx, end_idx) and not is_dummy_node(p["name"])
+        and not p.get("is_mandatory", True) and not windows[i][2]
+    }
+    if not candidates:
+        return NodeReduction(list(range(len(places))))
+
+    dropped: Dict[int, str] = {}
+
+    # 1) 도달 불가 (feasibility와 같이 더미 노드는 이동 시간 0으로 뒤에 붙임)
+    n = len(matrix)
+    dist = np.zeros((len(places), len(places)))
+    dist[:n, :n] = shortest_transit(matrix, service_times[:n])
+    _, earliest, latest = arrival_ranges(windows, dist, service_times, start_idx, end_idx, global_start, global_end)
+    for i in sorted(candidates):
+        if i < n and earliest[i] > latest[i]:
+            dropped[i] = UNREACHABLE
+
+    # 2) 같은 장소의 지배된 중복 노드 (필수 노드가 앞에 오도록 정렬)
+    groups: Dict[object, List[int]] = {}
+    for i, p in enumerate(places):
+        if i not in (start_idx, end_idx) and not is_dummy_node(p["name"]) and not windows[i][2]:
+            groups.setdefault(_identity(p), []).append(i)
+    for nodes in groups.values():
+        if len(nodes) < 2:
+            continue
+        order = sorted(nodes, key=lambda i: (not places[i].get("is_mandatory", True), i))
+        for pos, i in enumerate(order):
+            if i not in candidates or i in dropped:
+                continue
+            for rank, j in enumerate(order):
+                if j == i or j in dropped:
+                    continue
+                if not (_contains(windows[j], windows[i]) and service_times[j] <= service_times[i]):
+                    continue
+                # 윈도우와 서비스 시간이 같으면 앞선 노드만 남김
+                same = windows[j][:2] == windows[i][:2] and service_times[j] == service_times[i]
+                if not same or rank < pos:
+                    dropped[i] = DUPLICATE
+                    break
+
+    if dropped:
+        logger.info("모델에서 선택 노드 %d개 제외: %s",
+                    len(dropped), {places[i]["name"]: reason for i, reason in dropped.items()})
+    return NodeReduction([i for i in range(len(places)) if i not in dropped], dropped)
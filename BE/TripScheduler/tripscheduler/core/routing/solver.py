@@ -1,10 +1,100 @@
-from .components import get_default_search_parameters
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from tripscheduler.core.routing.dummy import is_dummy_node
 from .context import RoutingContext
+from .profiles import search_parameters_for
 
-def solve(ctx: RoutingContext, time_limit_sec: int = 10):
+logger = logging.getLogger(__name__)
+
+def order_to_route(
+    places: List[Dict],
+    previous_order: Sequence[str],
+    matrix: List[List[int]],
+    start_idx: int,
+    end_idx: int,
+    windows: Optional[List[Tuple[int, int, Any]]] = None,
+    service_times: Optional[List[int]] = None
+) -> List[int]:
+    """
+    이전 해의 방문 순서(장소 이름)를 현재 places의 노드 인덱스 경로로 변환 (시작/종료 노드 제외).
+    - 삭제된 장소는 건너뛰고, 새로 추가된 필수 장소는 이동 시간 기준 최소 비용 위치에 삽입한다.
+      windows/service_times가 있으면 시간 윈도우를 지키는 위치 중에서 고른다.
+    - 식당 노드와 더미 노드는 새로 삽입하지 않는다 (식사 배정은 탐색에 맡김).
+    """
+    index = {p["name"]: i for i, p in enumerate(places)}
+    route = [
+        index[name] for name in dict.fromkeys(previous_order)
+        if name in index and index[name] not in (start_idx, end_idx)
+    ]
+
+    def cost(u, v):
+        if is_dummy_node(places[u]["name"]) or is_dummy_node(places[v]["name"]):
+            return 0
+        return matrix[u][v]
+
+    def fits(stops):
+        if windows is None:
+            return True
+        t = None
+        for k, v in enumerate(stops):
+            opens, closes, _ = windows[v]
+            t = opens if k == 0 else t + (service_times[stops[k - 1]] if service_times else 0) + cost(stops[k - 1], v)
+            if opens is not None:
+                t = max(t, opens) if t is not None else opens
+            if closes is not None and t is not None and t > closes:
+                return False
+        return True
+
+    in_route = set(route)
+    for node, place in enumerate(places):
+        if (
+            node in in_route or node in (start_idx, end_idx)
+            or is_dummy_node(place["name"])
+            or place.get("category") == "restaurant"
+            or not place.get("is_mandatory", True)
+        ):
+            continue
+        stops = [start_idx] + route + [end_idx]
+        positions = sorted(
+            range(len(stops) - 1),
+            key=lambda k: cost(stops[k], node) + cost(node, stops[k + 1]) - cost(stops[k], stops[k + 1])
+        )
+        best = next(
+            (k for k in positions if fits(stops[:k + 1] + [node] + stops[k + 1:])),
+            positions[0]
+        )
+        route.insert(best, node)
+        logger.debug("새 필수 장소 삽입: %s (위치 %d)", place["name"], best)
+    return route
+
+def solve_with_params(routing, mgr, params, initial_route: Optional[List[int]] = None):
+    """
+    initial_route(노드 인덱스, 시작/종료 제외)가 있으면 그 경로를 초기해로 탐색을 시작한다.
+    초기해가 제약을 만족하지 않으면 처음부터 푼다.
+    """
+    if initial_route is not None:
+        routing.CloseModelWithParameters(params)
+        initial = routing.ReadAssignmentFromRoutes([[mgr.NodeToIndex(n) for n in initial_route]], True)
+        if initial is not None:
+            logger.debug("이전 방문 순서로 warm start: %d개 노드", len(initial_route))
+            return routing.SolveFromAssignmentWithParameters(initial, params)
+        logger.warning("이전 방문 순서가 현재 제약을 만족하지 않아 처음부터 탐색")
+    return routing.SolveWithParameters(params)
+
+def solve(
+    ctx: RoutingContext,
+    time_limit_sec: Optional[float] = None,
+    profile: Optional[str] = None,
+    initial_route: Optional[List[int]] = None
+):
     """
     구성된 RoutingContext.routing 모델을 SolveWithParameters로 풉니다.
+    탐색 파라미터는 profile(fast/balanced/quality)과 노드 수·윈도우 타이트함으로 정하며,
+    time_limit_sec가 있으면 시간 제한만 그 값으로 고정합니다.
+    initial_route가 있으면 그 경로에서 탐색을 시작합니다 (solve_with_params).
     """
-    params = get_default_search_parameters(time_limit_sec)
-    solution = ctx.routing.SolveWithParameters(params)
-    return solution
+    params = search_parameters_for(
+        ctx.places, ctx.windows, ctx.global_start, ctx.global_end, profile, time_limit_sec,
+        depots=(ctx.start_idx, ctx.end_idx)
+    )
+    return solve_with_params(ctx.routing, ctx.mgr, params, initial_route)
@@ -0,0 +1,233 @@
+import os
+import math
+import time
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tripscheduler.cli.utils import all_meal_nodes
+from tripscheduler.combinations import combination_executor, terminate_combination_executor
+from tripscheduler.core.indexing.handlers import determine_start_end_indices
+from tripscheduler.core.preprocessing.closed_days import filter_closed_places
+from tripscheduler.core.preprocessing.timewindow import calculate_effective_time_windows
+from tripscheduler.core.preprocessing.restaurant import split_restaurant_nodes
+from tripscheduler.core.routing.clustering import kmeans, place_features
+from tripscheduler.core.routing.context import RoutingContext
+from tripscheduler.core.routing.dummy import add_dummy_node
+from tripscheduler.core.routing.heuristic import PENALTY, heuristic_route
+from tripscheduler.core.routing.parser import parse_route
+from tripscheduler.scheduler import build_day_matrices, solve_route
+from tripscheduler.utils.metrics import collect_spans, merge_spans, span
+from tripscheduler.utils.time import minutes_to_time_str, time_to_minutes
+
+logger = logging.getLogger(__name__)
+
+# 클러스터당 장소 수 (식당 후보 제외)
+DEFAULT_CLUSTER_SIZE = 12
+# 식사마다 부분 문제에 넣을 식당 후보 수 (클러스터 중심에서 가까운 순, 필수 식당은 항상 포함)
+DEFAULT_MEAL_CANDIDATES = 6
+# 이어 붙인 경로의 마지막 개선(삽입 + 2-opt/Or-opt) 시간 예산
+DEFAULT_IMPROVE_MS = 300
+# 이어 붙일 클러스터 경로 수
+DEFAULT_STITCH_CLUSTERS = 2
+
+def _solve_cluster(task: Dict[str, Any]) -> Tuple[Optional[List[int]], Optional[int], List[Dict[str, Any]]]:
+    """
+    부분 문제 하나를 풀어 (방문 노드 순서(부분 문제 인덱스, 시작/종료 제외), 목적값, span)을 반환.
+    OR-Tools가 실패하면 필수 장소를 선택으로 바꿔 다시 풀고, 그래도 없으면 휴리스틱을 쓴다.
+    """
+    with collect_spans() as spans:
+        places, windows = task["places"], task["windows"]
+        args = (task["matrix"], task["svc"], task["start"], task["end"], task["gs"], task["ge"])
+        sequence, objective = solve_route(places, windows, *args, profile=task["profile"], deadline=task["deadline"])
+        if sequence is None:
+            relaxed = [dict(p, is_mandatory=False) if i not in (task["start"], task["end"]) else p
+                       for i, p in enumerate(places)]
+            sequence, objective = solve_route(relaxed, windows, *args, profile=task["profile"], deadline=task["deadline"])
+        if sequence is None:
+            sequence, objective = heuristic_route(places, windows, *args)
+    if sequence is None:
+        return None, None, spans
+    return [node for node, _ in sequence[1:-1]], objective, spans
+
+def _meal_slots(windows, meal_nodes) -> Dict[str, List[int]]:
+    slots = defaultdict(list)
+    for i in meal_nodes:
+        slots[windows[i][2]].append(i)
+    return slots
+
+def schedule_decomposed(
+    data: Dict[str, Any],
+    use_mock: bool = False,
+    mock_raw_path: Optional[str] = None,
+    profile: Optional[str] = "fast",
+    cluster_size: int = DEFAULT_CLUSTER_SIZE,
+    meal_candidates: int = DEFAULT_MEAL_CANDIDATES,
+    stitch_clusters: int = DEFAULT_STITCH_CLUSTERS,
+    max_workers: Optional[int] = None,
+    deadline_sec: Optional[float] = None,
+    budget_ms: float = DEFAULT_IMPROVE_MS,
+    path_tolerance_m: float = 0.0,
+    path_format: str = "coords"
+) -> Dict[str, Any]:
+    """
+    장소가 매우 많은 하루 일정을 지역/시간대 클러스터로 나눠 푼다.
+    1) 시작/종료·식당을 뺀 장소를 좌표와 시간 윈도우로 k-means (클러스터당 약 cluster_size곳)
+    2) 클러스터마다 실제 시작/종료 노드 사이에서 클러스터 장소 + 필수 장소 + 식사별로 가까운 식당 후보
+       meal_candidates곳을 하루 일정으로 풀기 (병렬)
+    3) 방문 수가 많고 목적값이 작은 클러스터 경로 stitch_clusters개를 순서대로 이어 붙임
+    4) 이어 붙인 경로 + 필수 장소 + 선택된 클러스터의 식당 후보만으로 매트릭스를 만들어 삽입/2-opt/Or-opt 개선
+    시작/종료·필수 장소·식당 후보 사이 쌍은 한 번만 계산해 각 부분 문제와 마지막 매트릭스에서 재사용한다.
+    부분 문제 크기가 cluster_size로 고정되므로 매트릭스와 풀이 시간이 장소 수에 거의 선형으로 늘어난다.
+    - return: {"visits", "path", "cost", "clusters", "timings"} (+ 휴무로 제외한 장소가 있으면 "closed",
+      이어 붙이지 않은 클러스터가 있으면 "unstitched": [{"cluster", "places"}, ...])
+    """
+    started = time.perf_counter()
+    deadline = time.time() + deadline_sec if deadline_sec is not None else None
+    places, user, day_info = data["places"], data["user"], data["day_info"]
+
+    with collect_spans() as timings, span("schedule_decomposed", places=len(places)) as attrs:
+        places, closed = filter_closed_places(places, day_info)
+        new_places, new_windows = split_restaurant_nodes(places, calculate_effective_time_windows(places, user))
+        start_idx, end_idx = determine_start_end_indices(new_places, day_info)
+        gs, ge = time_to_minutes(user["start_time"]), time_to_minutes(user["end_time"])
+        svc = [p.get("service_time", 0) for p in new_places]
+
+        meal_nodes = all_meal_nodes(new_places, new_windows)
+        depots = {i for i in (start_idx, end_idx) if i is not None}
+        others = [i for i in range(len(new_places)) if i not in depots and i not in meal_nodes]
+
+        # 1) 클러스터링
+        features = place_features(new_places, new_windows, gs, ge)
+        k = max(1, math.ceil(len(others) / cluster_size))
+        labels = kmeans(features[others], k) if others else np.zeros(0, dtype=int)
+        groups = [[others[j] for j in np.flatnonzero(labels == c)] for c in range(k)]
+        groups = [g for g in groups if g] or [[]]
+        attrs["clusters"] = len(groups)
+        mandatory = [i for i in others if new_places[i].get("is_mandatory", True)]
+
+        # 2) 클러스터별 부분 문제: 실제 시작/종료 노드 + 클러스터 + 필수 장소 + 가까운 식당 후보
+        head = [start_idx] if start_idx is not None else []
+        tail = [end_idx] if end_idx is not None and end_idx != start_idx else []
+        members, extras = [], []
+        for group in groups:
+            center = features[group].mean(axis=0) if group else features.mean(axis=0)
+            extra = []
+            for nodes in _meal_slots(new_windows, meal_nodes).values():
+                required = [i for i in nodes if new_places[i].get("is_mandatory", True)]
+                nearest = sorted(
+                    (i for i in nodes if i not in required),
+                    key=lambda i: float(np.linalg.norm(features[i, :2] - center[:2]))
+                )
+                extra.extend(required + nearest[:max(0, meal_candidates - len(required))])
+            nodes = list(dict.fromkeys(group + [i for i in mandatory if i not in group] + extra))
+            members.append(head + nodes + tail)
+            extras.append(extra)
+
+        # 모든 부분 문제에 공통인 노드(시작/종료, 필수 장소, 식당 후보) 쌍은 한 번만 계산해 재사용
+        common = list(dict.fromkeys(head + mandatory + [i for extra in extras for i in extra] + tail))
+        shared = build_day_matrices(
+            [new_places[i] for i in common], use_mock=use_mock, mock_raw_path=mock_raw_path,
+            windows=[new_windows[i] for i in common]
+        )
+
+        tasks, cluster_matrices = [], []
+        for c, sub in enumerate(members):
+            sub_places = [new_places[i] for i in sub]
+            sub_windows = [new_windows[i] for i in sub]
+            matrices = build_day_matrices(
+                sub_places, use_mock=use_mock, mock_raw_path=mock_raw_path, windows=sub_windows, previous=shared
+            )
+            time_matrix, _, _ = matrices.slice(sub_places)
+            s = 0 if head else add_dummy_node(sub_places, sub_windows, "start", gs, ge)
+            if end_idx is None:
+                e = add_dummy_node(sub_places, sub_windows, "end", gs, ge)
+            else:
+                e = len(sub) - 1 if tail else s
+            tasks.append({
+                "places": sub_places, "windows": sub_windows, "matrix": time_matrix,
+                "svc": [p.get("service_time", 0) for p in sub_places],
+                "start": s, "end": e, "gs": gs, "ge": ge,
+                "profile": profile, "deadline": deadline,
+            })
+            cluster_matrices.append(matrices)
+            logger.debug("클러스터 %d: 부분 문제 노드 %d개", c, len(sub))
+
+        workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+        if workers > 1:
+            # 조합 실행과 같은 풀을 재사용 (풀이가 깨지거나 중단되면 워커째 정리)
+            try:
+                outcomes = list(combination_executor(workers).map(_solve_cluster, tasks))
+            except BaseException:
+                terminate_combination_executor()
+                raise
+        else:
+            outcomes = [_solve_cluster(task) for task in tasks]
+
+        # 3) 방문 수가 많고 목적값이 작은 클러스터 경로부터 stitch_clusters개를 이어 붙임
+        routes = []
+        for c, (sub, (order, objective, spans)) in enumerate(zip(members, outcomes)):
+            merge_spans(spans, from_worker=workers > 1)
+            if order is None:
+                logger.warning("클러스터 %d 부분 문제 해 없음", c)
+                continue
+            routes.append((-len(order), objective, c, [sub[j] for j in order if j < len(sub)]))
+        routes.sort()
+        chosen = [c for _, _, c, _ in routes[:stitch_clusters]]
+        attrs["stitched"] = len(chosen)
+        stitched = list(dict.fromkeys(i for _, _, _, route in routes[:stitch_clusters] for i in route))
+
+        # 4) 최종 후보(방문 장소 + 필수 장소 + 식당 후보)로 이어 붙인 경로 개선
+        final = sorted(depots | set(stitched) | set(mandatory) | {i for c in chosen for i in extras[c]})
+        final_places = [new_places[i] for i in final]
+        final_windows = [new_windows[i] for i in final]
+        local = {g: j for j, g in enumerate(final)}
+        with span("stitch", nodes=len(final)):
+            # 공통 쌍과 선택된 클러스터 안의 쌍은 이미 계산됨: 클러스터 사이 쌍만 새로 계산
+            matrices = build_day_matrices(
+                final_places, use_mock=use_mock, mock_raw_path=mock_raw_path, windows=final_windows,
+                previous=[shared] + [cluster_matrices[c] for c in chosen]
+            )
+            time_matrix, _, path_matrix = matrices.slice(final_places)
+        s = local[start_idx] if start_idx is not None else add_dummy_node(final_places, final_windows, "start", gs, ge)
+        e = local[end_idx] if end_idx is not None else add_dummy_node(final_places, final_windows, "end", gs, ge)
+        final_svc = [p.get("service_time", 0) for p in final_places]
+
+        with span("improve"):
+            sequence, objective = heuristic_route(
+                final_places, final_windows, time_matrix, final_svc, s, e, gs, ge,
+                budget_ms=budget_ms, initial_route=[local[i] for i in stitched]
+            )
+
+    if sequence is None:
+        logger.error("분할 풀이 실패: 필수 장소를 모두 넣을 수 없음")
+        output = {"visits": [], "path": [], "cost": None, "clusters": len(groups)}
+    else:
+        # 최종 후보에 넣지 않은 선택 장소는 미방문 penalty
+        skipped = sum(1 for i in others if i not in local and not new_places[i].get("is_mandatory", True))
+        ctx = RoutingContext(
+            places=final_places, windows=final_windows, matrix=time_matrix, service_times=final_svc,
+            start_idx=s, end_idx=e, global_start=gs, global_end=ge,
+            path_matrix=path_matrix or [],
+            path_tolerance_m=path_tolerance_m,
+            path_format=path_format
+        )
+        visits, full_path = parse_route(ctx, sequence)
+        output = {"visits": visits, "path": full_path, "cost": objective + PENALTY * skipped, "clusters": len(groups)}
+        # 이어 붙이지 않은 클러스터와 그 때문에 최종 후보에서 빠진 장소
+        unstitched = [
+            {"cluster": c, "places": [new_places[i]["name"] for i in group if i not in local]}
+            for c, group in enumerate(groups) if c not in chosen
+        ]
+        if unstitched:
+            output["unstitched"] = unstitched
+            logger.info("이어 붙이지 않은 클러스터 %d개 (최종 후보에서 빠진 장소 %d곳): %s",
+                        len(unstitched), sum(len(u["places"]) for u in unstitched), unstitched)
+        logger.info("분할 풀이 완료: 클러스터 %d개, 방문 %d곳, %.2f초",
+                    len(groups), len(visits), time.perf_counter() - started)
+    if closed:
+        output["closed"] = closed
+    output["timings"] = timings
+    return output
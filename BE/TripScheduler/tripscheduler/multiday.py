@@ -0,0 +1,165 @@
+import time
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from tripscheduler.core.indexing.handlers import determine_start_end_indices
+from tripscheduler.core.preprocessing.closed_days import filter_closed_places, open_days
+from tripscheduler.core.preprocessing.timewindow import calculate_effective_time_windows
+from tripscheduler.core.preprocessing.restaurant import split_restaurant_nodes
+from tripscheduler.core.routing.components import (
+    create_routing_model,
+    register_transit,
+    add_disjunctions,
+    add_daily_meal_constraints,
+    add_time_constraints
+)
+from tripscheduler.core.routing.profiles import search_parameters_for
+from tripscheduler.core.routing.dummy import add_dummy_node, is_dummy_node
+from tripscheduler.core.routing.context import build_context
+from tripscheduler.core.routing.parser import parse_solution
+from tripscheduler.scheduler import build_day_matrices
+from tripscheduler.utils.time import time_to_minutes
+
+logger = logging.getLogger(__name__)
+
+def collect_trip_nodes(
+    data: Dict[str, Any]
+) -> Tuple[List[Dict[str, Any]], List[Tuple[int, int, Any]], List[Optional[List[int]]], List[Tuple[Optional[int], Optional[int]]]]:
+    """
+    여행일별 고정 장소(days[d]["places"])와 배정할 장소(places)를 한 노드 목록으로 합친다.
+    시간 윈도우와 식당 분할은 그룹(여행일/미배정)마다 따로 계산한다 (같은 숙소라도 날마다 운영시간이 다를 수 있음).
+    휴무일 처리: 고정 장소는 그날 휴무면 제외(필수면 ValueError), 배정할 장소는 휴무가 아닌 날에만 배정하고
+    모든 여행일이 휴무면 제외(필수면 ValueError).
+    반환: (노드, 윈도우, 노드별 방문 가능 여행일(None이면 제한 없음), 여행일별 (시작, 종료) 노드 인덱스)
+    """
+    user = data["user"]
+    day_infos = [day["day_info"] for day in data["days"]]
+    groups = [(d, filter_closed_places(day["places"], day_infos[d])[0]) for d, day in enumerate(data["days"])]
+
+    free, unavailable = [], []
+    for place in data.get("places", []):
+        days = open_days(place, day_infos)
+        if days == []:
+            unavailable.append(place)
+        else:
+            free.append((place, days))
+    blocked = [p["name"] for p in unavailable if p.get("is_mandatory", True)]
+    if blocked:
+        raise ValueError(f"필수 장소가 모든 여행일에 휴무입니다: {', '.join(blocked)}")
+    if unavailable:
+        logger.info("모든 여행일 휴무로 제외: %s", [p["name"] for p in unavailable])
+    groups.append((None, [place for place, _ in free]))
+    free_days = {id(place): days for place, days in free}
+
+    nodes, windows, owners, depots = [], [], [], []
+    for day, group in groups:
+        group_nodes, group_windows = split_restaurant_nodes(group, calculate_effective_time_windows(group, user))
+        offset = len(nodes)
+        if day is not None:
+            start, end = determine_start_end_indices(group_nodes, day_infos[day])
+            depots.append((
+                None if start is None else offset + start,
+                None if end is None else offset + end
+            ))
+            owners.extend([[day]] * len(group_nodes))
+        else:
+            # 분할 식당 노드는 원래 장소(org_id)의 휴무일을 따른다
+            source = {place.get("id"): free_days[id(place)] for place in group}
+            owners.extend(source.get(node.get("org_id", node.get("id"))) for node in group_nodes)
+        nodes.extend(group_nodes)
+        windows.extend(group_windows)
+    return nodes, windows, owners, depots
+
+def plan_trip(
+    data: Dict[str, Any],
+    use_mock: bool = False,
+    mock_raw_path: Optional[str] = None,
+    profile: Optional[str] = None,
+    deadline_sec: Optional[float] = None,
+    path_tolerance_m: float = 0.0,
+    path_format: str = "coords"
+) -> Dict[str, Any]:
+    """
+    여러 날 일정을 한 라우팅 모델(여행일마다 차량 1대)로 푼다.
+    - data: {"user", "days": [{"day_info", "places": 그날 고정 장소}], "places": 여행일을 정하지 않은 장소}
+    - 여행일마다 시작/종료 노드는 determine_start_end_indices 규칙으로, 하루 시작/종료 시간은 차량별로 고정
+    - 선택 장소는 가장 잘 맞는 날에 배정되고, 고정 장소는 그날 차량만 방문할 수 있다
+    - 휴무일인 여행일에는 배정하지 않는다 (collect_trip_nodes)
+    - return: {"days": [{"day", "visits", "path"}], "cost", "unassigned": 방문하지 못한 장소 이름}
+    """
+    started = time.perf_counter()
+    user = data["user"]
+    places, windows, owners, depots = collect_trip_nodes(data)
+    logger.info("여러 날 일정: %d일, 노드 %d개", len(depots), len(places))
+
+    day_matrices = build_day_matrices(places, use_mock=use_mock, mock_raw_path=mock_raw_path, windows=windows)
+    time_matrix, _, path_matrix = day_matrices.slice(places)
+
+    gs = time_to_minutes(user["start_time"])
+    ge = time_to_minutes(user["end_time"])
+
+    # 시작/종료 노드가 없는 날은 더미 노드 하나를 함께 사용
+    starts, ends = [], []
+    dummy_start = dummy_end = None
+    for start, end in depots:
+        if start is None:
+            if dummy_start is None:
+                dummy_start = add_dummy_node(places, windows, "start", gs, ge)
+                owners.append(None)
+            start = dummy_start
+        if end is None:
+            if dummy_end is None:
+                dummy_end = add_dummy_node(places, windows, "end", gs, ge)
+                owners.append(None)
+            end = dummy_end
+        starts.append(start)
+        ends.append(end)
+
+    svc_times = [p.get("service_time", 0) for p in places]
+
+    mgr, routing = create_routing_model(len(places), starts, ends)
+    transit_cb = register_transit(routing, mgr, time_matrix, svc_times, places)
+    meal_nodes = add_daily_meal_constraints(routing, mgr, places, windows, starts, ends)
+    add_disjunctions(routing, mgr, places, starts, ends, exclude=meal_nodes)
+    time_dim = add_time_constraints(routing, transit_cb, gs, ge, windows, mgr, starts, ends)
+
+    # 고정 장소는 그날 차량만, 휴무일이 있는 장소는 영업하는 날 차량만 방문
+    depot_nodes = set(starts) | set(ends)
+    for i, days in enumerate(owners):
+        if days is not None and i not in depot_nodes:
+            # -1: 선택 장소는 미방문 허용
+            routing.VehicleVar(mgr.NodeToIndex(i)).SetValues([-1, *days])
+    logger.debug("여러 날 라우팅 모델 구성 완료")
+
+    params = search_parameters_for(places, windows, gs, ge, profile, time_cap_sec=deadline_sec, depots=depot_nodes)
+    solution = routing.SolveWithParameters(params)
+    if not solution:
+        logger.error("여러 날 일정 탐색 실패")
+        return {"days": [], "cost": None, "unassigned": []}
+
+    days, visited = [], set()
+    for vehicle, (start, end) in enumerate(zip(starts, ends)):
+        ctx = build_context(
+            places, windows, time_matrix, svc_times,
+            start, end, gs, ge,
+            routing, mgr, transit_cb, time_dim,
+            path_matrix=path_matrix,
+            path_tolerance_m=path_tolerance_m,
+            path_format=path_format
+        )
+        visits, full_path = parse_solution(ctx, solution, vehicle)
+        days.append({"day": vehicle, "visits": visits, "path": full_path})
+        visited.update(visit["place"] for visit in visits)
+
+    # 분할 식당은 원래 장소 단위로 방문 여부 판단
+    orgs = {}
+    for p in places:
+        if not is_dummy_node(p["name"]):
+            orgs.setdefault(p.get("org_id", p["id"]), []).append(p["name"])
+    unassigned = [
+        names[0].rsplit(" (", 1)[0] if len(names) > 1 else names[0]
+        for names in orgs.values() if not visited.intersection(names)
+    ]
+
+    logger.info("여러 날 일정 완료: %.2f초, 미배정 %d곳", time.perf_counter() - started, len(unassigned))
+    return {"days": days, "cost": solution.ObjectiveValue(), "unassigned": unassigned}
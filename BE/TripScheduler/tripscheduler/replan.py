@@ -0,0 +1,55 @@
+import time
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from tripscheduler.core.preprocessing.closed_days import filter_closed_places
+from tripscheduler.core.preprocessing.timewindow import calculate_effective_time_windows
+from tripscheduler.core.preprocessing.restaurant import split_restaurant_nodes
+from tripscheduler.scheduler import build_day_matrices
+from tripscheduler.combinations import solve_meal_model
+from tripscheduler.api.matrix import DayMatrices
+
+logger = logging.getLogger(__name__)
+
+def replan_day(
+    data: Dict[str, Any],
+    previous_visits: List[Dict[str, Any]],
+    previous_matrices: Optional[DayMatrices] = None,
+    use_mock: bool = False,
+    mock_raw_path: Optional[str] = None,
+    profile: Optional[str] = "fast",
+    deadline_sec: Optional[float] = None
+) -> Tuple[Dict[str, Any], DayMatrices]:
+    """
+    사용자가 하루 일정을 편집(장소 추가/삭제, 시간 변경)했을 때의 재최적화.
+    - data: 편집 후 tc.json 형태의 dict
+    - previous_visits: 편집 전 결과의 visits (방문 순서를 초기해로 사용)
+    - previous_matrices: 편집 전 하루 매트릭스 (이미 계산된 장소 쌍은 재사용)
+    - return: ({"visits", "path", "cost"}, 이번 하루 매트릭스) — 다음 편집 때 다시 넘긴다
+    """
+    started = time.perf_counter()
+    places, user, day_info = data["places"], data["user"], data["day_info"]
+
+    places, _ = filter_closed_places(places, day_info)
+    eff_windows_map = calculate_effective_time_windows(places, user)
+    new_places, new_windows = split_restaurant_nodes(places, eff_windows_map)
+
+    day_matrices = build_day_matrices(
+        new_places, use_mock=use_mock, mock_raw_path=mock_raw_path,
+        windows=new_windows, previous=previous_matrices
+    )
+
+    results = solve_meal_model(
+        new_places, new_windows, user, day_info, day_matrices,
+        use_mock=use_mock,
+        mock_raw_path=mock_raw_path,
+        profile=profile,
+        deadline_sec=deadline_sec,
+        initial_order=[visit["place"] for visit in previous_visits]
+    )
+    result = next(iter(results.values()))
+    logger.info("재최적화 완료: %.2f초", time.perf_counter() - started)
+
+    if not result:
+        return {"visits": [], "path": [], "cost": None}, day_matrices
+    return {"visits": result["visits"], "path": result["path"], "cost": result["cost"]}, day_matrices
@@ -3,42 +3,96 @@ from tripscheduler.core.routing.components import (
     create_routing_model,
     register_transit,
     add_disjunctions,
-    add_time_constraints,
-    get_default_search_parameters
+    add_meal_disjunctions,
+    add_time_constraints
 )
+from tripscheduler.core.routing.profiles import search_parameters_for
 from tripscheduler.core.routing.dummy import add_dummy_node
-from tripscheduler.core.routing.context import build_context
-from tripscheduler.core.routing.parser import parse_solution
+from tripscheduler.core.routing.feasibility import check_feasibility
+from tripscheduler.core.routing.context import RoutingContext, build_context
+from tripscheduler.core.routing.heuristic import DEFAULT_BUDGET_MS, PENALTY, heuristic_route
+from tripscheduler.core.routing.reduction import reduce_nodes
+from tripscheduler.core.routing.parser import parse_route, parse_solution, solution_sequence
+from tripscheduler.core.routing.solver import order_to_route, solve_with_params
 from tripscheduler.api.prepare import prepare_matrices
+from tripscheduler.api.cache import load_route_cache_from_env
+from tripscheduler.api.matrix import DayMatrices, prepare_day_matrices
+from tripscheduler.solution_cache import canonical_problem_key, load_solution_cache_from_env
+from tripscheduler.utils.metrics import span
 from tripscheduler.utils.time import time_to_minutes
 
-import logging, os
+import logging, os, time
+from typing import Sequence, Union
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 load_dotenv()
 
-def run_scheduler(
+def load_latency_budget_from_env():
+    """MATRIX_LATENCY_BUDGET_SEC 환경변수(초). 없으면 예산 없이 모든 쌍을 기다린다"""
+    value = os.environ.get("MATRIX_LATENCY_BUDGET_SEC")
+    return float(value) if value else None
+
+def build_day_matrices(
+    places,
+    use_mock: bool,
+    mock_raw_path: str = None,
+    windows=None,
+    previous: Union[DayMatrices, Sequence[DayMatrices]] = None
+) -> DayMatrices:
+    """
+    분할 노드 전체에 대한 하루 매트릭스를 한 번 생성.
+    조합별 run_scheduler 호출에 matrices로 넘겨 재사용한다.
+    windows가 있으면 인접 불가능한 쌍은 API 조회를 생략한다.
+    MATRIX_LATENCY_BUDGET_SEC가 설정되면 예산 안에 받지 못한 쌍은 추정치로 채운다.
+    previous(편집 전 하루 매트릭스, 여러 개 가능)가 있으면 이미 계산된 쌍은 재사용한다.
+    """
+    return prepare_day_matrices(
+        places,
+        os.environ.get("NAVER_API_CLIENT_ID"),
+        os.environ.get("NAVER_API_CLIENT_SECRET"),
+        use_mock=use_mock,
+        mock_raw_path=mock_raw_path,
+        route_cache=load_route_cache_from_env(),
+        windows=windows,
+        road_graph_path=os.environ.get("ROAD_GRAPH_PATH"),
+        latency_budget_sec=load_latency_budget_from_env(),
+        catalogue_path=os.environ.get("CATALOGUE_MATRIX_PATH"),
+        previous=previous
+    )
+
+def prepare_problem(
     places,
     windows,
     user,
     day_info,
     use_mock: bool,
-    mock_raw_path: str = None
+    mock_raw_path: str = None,
+    matrices: DayMatrices = None
 ):
-    logger.info("run_scheduler() 시작")
-
-    # 1) API 키 로드
-    api_key_id = os.environ.get("NAVER_API_CLIENT_ID")
-    api_key    = os.environ.get("NAVER_API_CLIENT_SECRET")
-    logger.debug("API 키 로드 완료")
+    """
+    run_scheduler / run_heuristic 공통 입력 준비.
+    매트릭스, 시작/종료 노드(없으면 더미 노드를 places/windows에 추가), 전역 시간, 서비스 시간을 반환한다.
+    반환: (time_matrix, path_matrix, start_idx, end_idx, gs, ge, svc_times)
+    """
+    # 1~2) 매트릭스 준비: 하루 매트릭스가 있으면 슬라이스, 없으면 새로 생성
+    if matrices is not None:
+        time_matrix, raw, path_matrix = matrices.slice(places)
+        logger.debug("하루 매트릭스에서 슬라이스")
+    else:
+        api_key_id = os.environ.get("NAVER_API_CLIENT_ID")
+        api_key    = os.environ.get("NAVER_API_CLIENT_SECRET")
+        logger.debug("API 키 로드 완료")
 
-    # 2) 스냅 & 매트릭스 생성 (time_matrix, raw 응답)
-    time_matrix, raw, path_matrix = prepare_matrices(
-        places, api_key_id, api_key,
-        use_mock=use_mock,
-        mock_raw_path=mock_raw_path
-    )
+        time_matrix, raw, path_matrix = prepare_matrices(
+            places, api_key_id, api_key,
+            use_mock=use_mock,
+            mock_raw_path=mock_raw_path,
+            route_cache=load_route_cache_from_env(),
+            road_graph_path=os.environ.get("ROAD_GRAPH_PATH"),
+            latency_budget_sec=load_latency_budget_from_env(),
+            catalogue_path=os.environ.get("CATALOGUE_MATRIX_PATH")
+        )
     logger.debug(
         "거리 매트릭스 생성 완료: %dx%d",
         len(time_matrix), len(time_matrix[0])
@@ -64,19 +118,120 @@ def run_scheduler(
     # 6) 서비스 시간 리스트
     svc_times = [p.get("service_time", 0) for p in places]
 
-    # 7) OR-Tools 모델 빌드
+    return time_matrix, path_matrix, start_idx, end_idx, gs, ge, svc_times
+
+def build_model(places, windows, time_matrix, svc_times, start_idx, end_idx, gs, ge):
+    """하루 라우팅 모델 구성. 반환: (mgr, routing, transit_cb, time_dim)"""
     n = len(places)
-    mgr, routing = create_routing_model(n, start_idx, end_idx)
-    transit_cb = register_transit(routing, mgr, time_matrix, svc_times, places)
-    add_disjunctions(routing, mgr, places, start_idx, end_idx)
-    time_dim = add_time_constraints(
-        routing, transit_cb, gs, ge, windows, mgr, start_idx, end_idx
-    )
+    with span("build_model", nodes=n):
+        mgr, routing = create_routing_model(n, start_idx, end_idx)
+        transit_cb = register_transit(routing, mgr, time_matrix, svc_times, places)
+        meal_nodes = add_meal_disjunctions(routing, mgr, places, windows, start_idx, end_idx)
+        add_disjunctions(routing, mgr, places, start_idx, end_idx, exclude=meal_nodes)
+        time_dim = add_time_constraints(
+            routing, transit_cb, gs, ge, windows, mgr, start_idx, end_idx
+        )
     logger.debug("라우팅 모델 구성 완료")
+    return mgr, routing, transit_cb, time_dim
+
+def solve_route(places, windows, time_matrix, svc_times, start_idx, end_idx, gs, ge, profile=None, deadline=None):
+    """
+    시작/종료 노드와 시간 범위를 직접 지정해 모델을 풀고 방문 순서만 반환 (분할 풀이의 부분 문제용).
+    반환: ([(노드, 도착 시각), ...], objective). 해가 없으면 (None, None)
+    """
+    mgr, routing, _, time_dim = build_model(places, windows, time_matrix, svc_times, start_idx, end_idx, gs, ge)
+    time_cap = deadline - time.time() if deadline is not None else None
+    params = search_parameters_for(
+        places, windows, gs, ge, profile, time_cap_sec=time_cap, depots=(start_idx, end_idx)
+    )
+    with span("solve", nodes=len(places)) as attrs:
+        solution = routing.SolveWithParameters(params)
+        attrs["found"] = bool(solution)
+    if not solution:
+        return None, None
+    return solution_sequence(routing, mgr, time_dim, solution), solution.ObjectiveValue()
 
-    # 8) 파라미터 설정 후 Solve
-    params   = get_default_search_parameters()
-    solution = routing.SolveWithParameters(params)
+def check_day_feasibility(places, windows, user, day_info, matrices: DayMatrices) -> None:
+    """
+    하루 노드 전체(식당 후보 포함)에 대한 사전 검사. 필수 장소만 보므로 어떤 식사 조합에도 같은 결론이다.
+    해가 없으면 InfeasibleScheduleError (places/windows는 바꾸지 않는다)
+    """
+    places, windows = list(places), list(windows)
+    try:
+        time_matrix, _, start_idx, end_idx, gs, ge, _ = prepare_problem(
+            places, windows, user, day_info, use_mock=False, matrices=matrices
+        )
+    except ValueError:
+        # 입력 오류(시작/종료 노드 등)는 run_scheduler 실패로 기존과 같이 기록
+        return
+    with span("feasibility"):
+        check_feasibility(places, windows, time_matrix, start_idx, end_idx, gs, ge)
+
+def run_scheduler(
+    places,
+    windows,
+    user,
+    day_info,
+    use_mock: bool,
+    mock_raw_path: str = None,
+    matrices: DayMatrices = None,
+    path_tolerance_m: float = 0.0,
+    path_format: str = "coords",
+    profile: str = None,
+    deadline: float = None,
+    initial_order=None
+):
+    """
+    한 조합(places/windows)에 대해 경로를 풀어 (visits, objective, full_path)를 반환.
+    deadline(time.time() 기준 시각)이 있으면 탐색 시간을 남은 시간 이하로 제한한다.
+    initial_order(이전 해의 방문 장소 이름 순서)가 있으면 그 순서를 초기해로 탐색을 시작한다.
+    같은 문제(정규화한 입력 + 프로파일)를 이미 풀었으면 탐색 없이 캐시된 결과를 반환한다 (마감 없이 푼 해만 저장).
+    필수 장소 윈도우/도달 가능성 사전 검사에서 해가 없으면 모델을 만들지 않고 InfeasibleScheduleError.
+    방문할 수 없거나 같은 장소와 중복된 선택 노드는 모델에서 빼고(reduce_nodes) 해를 원래 인덱스로 펼쳐 파싱한다.
+    """
+    logger.info("run_scheduler() 시작")
+
+    time_matrix, path_matrix, start_idx, end_idx, gs, ge, svc_times = prepare_problem(
+        places, windows, user, day_info, use_mock, mock_raw_path, matrices
+    )
+
+    # 같은 문제를 이미 풀었으면 캐시된 결과 반환
+    cache = load_solution_cache_from_env()
+    cache_key = None
+    if cache is not None:
+        cache_key = canonical_problem_key(
+            places, windows, time_matrix, start_idx, end_idx, gs, ge, profile,
+            path_tolerance_m=path_tolerance_m, path_format=path_format
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info("해 캐시 적중: 탐색 생략")
+            return cached
+
+    # 해가 없음이 확실하면 solver 시간 제한까지 기다리지 않고 실패
+    with span("feasibility"):
+        check_feasibility(places, windows, time_matrix, start_idx, end_idx, gs, ge)
+
+    # 7) 방문할 수 없거나 중복된 선택 노드를 뺀 축소 노드로 OR-Tools 모델 빌드
+    reduction = reduce_nodes(places, windows, time_matrix, svc_times, start_idx, end_idx, gs, ge)
+    m_places, m_windows, m_matrix, m_svc = reduction.apply(places, windows, time_matrix, svc_times)
+    m_start, m_end = reduction.index_of(start_idx), reduction.index_of(end_idx)
+    mgr, routing, transit_cb, time_dim = build_model(
+        m_places, m_windows, m_matrix, m_svc, m_start, m_end, gs, ge
+    )
+
+    # 8) 프로파일(fast/balanced/quality)로 파라미터 설정 후 Solve
+    time_cap = deadline - time.time() if deadline is not None else None
+    params   = search_parameters_for(
+        m_places, m_windows, gs, ge, profile, time_cap_sec=time_cap, depots=(m_start, m_end)
+    )
+    initial_route = (
+        order_to_route(m_places, initial_order, m_matrix, m_start, m_end, m_windows, m_svc)
+        if initial_order else None
+    )
+    with span("solve", warm_start=initial_route is not None) as attrs:
+        solution = solve_with_params(routing, mgr, params, initial_route)
+        attrs["found"] = bool(solution)
 
     # 9) 결과 파싱 & 경로 추출
     if solution:
@@ -90,11 +245,62 @@ def run_scheduler(
             places, windows, time_matrix, svc_times,
             start_idx, end_idx, gs, ge,
             routing, mgr, transit_cb, time_dim,
-            path_matrix=path_matrix
+            path_matrix=path_matrix,
+            path_tolerance_m=path_tolerance_m,
+            path_format=path_format,
+            reduction=reduction
         )
-        visits, full_path = parse_solution(ctx, solution)
-        objective = solution.ObjectiveValue()
+        with span("parse_solution"):
+            visits, full_path = parse_solution(ctx, solution)
+        # 뺀 노드는 미방문과 같으므로 penalty를 더해 축소 전 모델과 같은 기준으로 맞춤
+        objective = solution.ObjectiveValue() + PENALTY * len(reduction.dropped)
+        # 마감으로 탐색이 잘린 해는 전체 예산 호출에 재사용되지 않도록 저장하지 않음
+        if cache is not None and deadline is None:
+            cache.put(cache_key, (visits, objective, full_path))
         return visits, objective, full_path
 
     logger.error("최적 경로 탐색 실패")
-    return [], None, []
\ No newline at end of file
+    return [], None, []
+
+def run_heuristic(
+    places,
+    windows,
+    user,
+    day_info,
+    use_mock: bool,
+    mock_raw_path: str = None,
+    matrices: DayMatrices = None,
+    path_tolerance_m: float = 0.0,
+    path_format: str = "coords",
+    budget_ms: float = DEFAULT_BUDGET_MS
+):
+    """
+    run_scheduler와 같은 입력/출력 형식의 빠른 휴리스틱 풀이 (OR-Tools 없이 NumPy 삽입 + 2-opt/Or-opt).
+    지도 미리보기처럼 즉시 보여줄 경로가 필요할 때 사용한다. (visits, objective, full_path)를 반환.
+    """
+    logger.info("run_heuristic() 시작")
+    time_matrix, path_matrix, start_idx, end_idx, gs, ge, svc_times = prepare_problem(
+        places, windows, user, day_info, use_mock, mock_raw_path, matrices
+    )
+
+    reduction = reduce_nodes(places, windows, time_matrix, svc_times, start_idx, end_idx, gs, ge)
+    m_places, m_windows, m_matrix, m_svc = reduction.apply(places, windows, time_matrix, svc_times)
+    sequence, objective = heuristic_route(
+        m_places, m_windows, m_matrix, m_svc, reduction.index_of(start_idx), reduction.index_of(end_idx),
+        gs, ge, budget_ms=budget_ms
+    )
+    if sequence is None:
+        logger.error("휴리스틱 경로 탐색 실패")
+        return [], None, []
+    sequence = reduction.expand(sequence)
+    objective += PENALTY * len(reduction.dropped)
+
+    ctx = RoutingContext(
+        places=places, windows=windows, matrix=time_matrix, service_times=svc_times,
+        start_idx=start_idx, end_idx=end_idx, global_start=gs, global_end=ge,
+        path_matrix=path_matrix or [],
+        path_tolerance_m=path_tolerance_m,
+        path_format=path_format
+    )
+    visits, full_path = parse_route(ctx, sequence)
+    return visits, objective, full_path
@@ -1,75 +1,222 @@
 import json
+import time
+import atexit
 import logging
-from typing import Dict, Any, Optional
-from tripscheduler.cli.utils import (
-    generate_valid_combinations,
-    build_selection_inputs
-)
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from tripscheduler.cli.utils import all_meal_nodes, build_selection_inputs
+from tripscheduler.core.preprocessing.closed_days import filter_closed_places
 from tripscheduler.core.preprocessing.timewindow import calculate_effective_time_windows
 from tripscheduler.core.preprocessing.restaurant import split_restaurant_nodes
-from tripscheduler.scheduler import run_scheduler
+from tripscheduler.scheduler import build_day_matrices, run_heuristic
+from tripscheduler.decomposition import schedule_decomposed
+from tripscheduler.combinations import CombinationReport, solve_day, solve_meal_model, rank_results
+from tripscheduler.utils.metrics import collect_spans, span
 
 logger = logging.getLogger(__name__)
 
+# 미리보기 후 OR-Tools 보정을 실행하는 백그라운드 프로세스 (solver가 GIL을 잡고 있어 스레드 대신 프로세스 사용)
+_refine_pool: Optional[ProcessPoolExecutor] = None
+
+def _refine_executor() -> ProcessPoolExecutor:
+    global _refine_pool
+    if _refine_pool is None:
+        _refine_pool = ProcessPoolExecutor(max_workers=1)
+    return _refine_pool
+
+def shutdown_refine_executor(wait: bool = True) -> None:
+    """백그라운드 보정 프로세스 종료 (프로세스 종료 시 atexit으로도 호출). 대기 중인 보정은 취소"""
+    global _refine_pool
+    if _refine_pool is not None:
+        _refine_pool.shutdown(wait=wait, cancel_futures=True)
+        _refine_pool = None
+
+atexit.register(shutdown_refine_executor)
+
 def schedule_trip(
     data: Dict[str, Any],
     use_mock: bool = False,
     mock_raw_path: Optional[str] = None,
-    output_path: Optional[str] = None
+    output_path: Optional[str] = None,
+    profile: Optional[str] = None,
+    top_k: int = 0,
+    max_workers: Optional[int] = None,
+    deadline_sec: Optional[float] = None,
+    meal_assignment: str = "enumerate",
+    decompose_above: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     외부에서 사용할 수 있는 파이프라인 wrapper.
     - data: tc.json 형태의 dict
     - output_path: 저장할 파일 경로 (예: "results.json")
-    - return: results.json의 dict 형태
+    - profile: solver 프로파일 (fast/balanced/quality, 기본 balanced)
+    - meal_assignment: enumerate(기본, 식사 조합별 풀이) / model(식당 후보 전체를 한 모델에서 배정)
+    - top_k: 0보다 크면 조합별로 풀어 objective 순 차선 조합 top_k개를 "alternatives"로,
+      풀이/가지치기 조합 수를 "combinations"로 함께 반환
+    - max_workers / deadline_sec: 조합 병렬 실행 프로세스 수(기본 코어 수)와 공유 마감(초)
+    - 여행일에 휴무인 선택 장소는 풀기 전에 제외하고 "closed"(장소 이름)로 반환, 필수 장소가 휴무면 ValueError
+    - decompose_above: 장소 수가 이보다 많으면 클러스터 분할 풀이(schedule_decomposed)로 대신 푼다 (top_k 미지원)
+    - return: results.json의 dict 형태 + "timings"(단계별 [{"name", "ms", ...}], 저장 파일에는 넣지 않음)
     """
 
     places, user, day_info = data["places"], data["user"], data["day_info"]
 
-    # 1. 시간 윈도우 계산
-    eff_windows_map = calculate_effective_time_windows(places, user)
+    if decompose_above is not None and len(places) > decompose_above:
+        logger.info("장소 %d곳 > %d: 클러스터 분할 풀이", len(places), decompose_above)
+        output_data = schedule_decomposed(
+            data, use_mock=use_mock, mock_raw_path=mock_raw_path, profile=profile or "fast",
+            max_workers=max_workers, deadline_sec=deadline_sec
+        )
+        output_data.pop("cost", None)
+        _save_output(output_data, output_path)
+        return output_data
 
-    # 2. 식당 노드 분리
-    new_places, new_windows = split_restaurant_nodes(places, eff_windows_map)
+    # 단계별 소요 시간은 "timings"로 반환 (metrics 훅에도 전달)
+    with collect_spans() as timings, span("schedule_trip"):
+        # 0. 여행일 휴무 장소 제외 (필수 장소가 휴무면 ValueError)
+        places, closed = filter_closed_places(places, day_info)
 
-    # 3. 유효한 조합 생성
-    valid_selections = generate_valid_combinations(new_places, new_windows)
-
-    # 4. 조합별 스케줄링 실행
-    results = {}
-    for sel in valid_selections:
-        sel_places, sel_windows, labels = build_selection_inputs(new_places, new_windows, sel)
-
-        logger.info("▶ 조합 %s 실행", labels)
-        try:
-            visits, cost, full_path = run_scheduler(
-                sel_places,
-                sel_windows,
-                user,
-                day_info,
-                use_mock=use_mock,
-                mock_raw_path=mock_raw_path
-            )
-            results[sel] = {
-                "cost": cost,
-                "visits": visits,
-                "path": full_path
-            }
-            logger.info("✔ 조합 %s 완료 (cost=%s)", labels, cost)
-        except Exception as e:
-            results[sel] = None
-            logger.error("✖ 조합 %s 실패: %s", labels, e)
+        # 1. 시간 윈도우 계산
+        eff_windows_map = calculate_effective_time_windows(places, user)
+
+        # 2. 식당 노드 분리
+        new_places, new_windows = split_restaurant_nodes(places, eff_windows_map)
 
-    # 5. 결과 저장 (최고 결과 or 첫 번째 결과)
-    first_value = next((v for v in results.values() if v), None)
+        # 3. 하루 매트릭스 1회 생성 (조합별로 슬라이스해 재사용)
+        day_matrices = build_day_matrices(
+            new_places, use_mock=use_mock, mock_raw_path=mock_raw_path, windows=new_windows
+        )
+        if day_matrices.report.estimated_pairs:
+            logger.warning("추정치로 채운 구간 %d쌍: %s",
+                           len(day_matrices.report.estimated_pairs), day_matrices.report.counts())
+
+        # 4. 스케줄링: 단일 모델 식사 배정, 차선 조합이 필요하면 조합별 병렬 실행 (공유 마감)
+        #    조합별 실행은 하한으로 상위 top_k + 1개에 들 수 없는 조합을 건너뛴다
+        report = CombinationReport()
+        results = solve_day(
+            new_places, new_windows, user, day_info, day_matrices,
+            meal_assignment="enumerate" if top_k else meal_assignment,
+            keep=top_k + 1,
+            report=report,
+            use_mock=use_mock,
+            mock_raw_path=mock_raw_path,
+            profile=profile,
+            max_workers=max_workers,
+            deadline_sec=deadline_sec
+        )
+
+    logger.info("조합 집계: %s", report.counts())
+
+    # 5. 결과 저장 (objective 최소 조합, top_k > 0이면 차선 조합도 포함)
+    ranked = rank_results(results)
+    best = ranked[0][1] if ranked else None
     output_data = {
-        "visits": first_value.get("visits", []) if first_value else [],
-        "path":   first_value.get("path", []) if first_value else []
+        "visits": best.get("visits", []) if best else [],
+        "path":   best.get("path", []) if best else []
     }
+    if top_k:
+        output_data["alternatives"] = [
+            {
+                "meals": {new_windows[i][2]: new_places[i]["name"] for i in sel},
+                "cost": out["cost"],
+                "visits": out["visits"],
+                "path": out["path"]
+            }
+            for sel, out in ranked[1:top_k + 1]
+        ]
+        output_data["combinations"] = report.counts()
+    if closed:
+        output_data["closed"] = closed
+    output_data["timings"] = timings
 
+    _save_output(output_data, output_path)
+    return output_data
+
+def _save_output(output_data: Dict[str, Any], output_path: Optional[str]) -> None:
+    """결과 저장. 단계별 소요 시간("timings")은 호출 측에만 반환하고 results.json 형식에는 넣지 않는다"""
     if output_path:
+        saved = {k: v for k, v in output_data.items() if k != "timings"}
         with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(output_data, f, indent=4, ensure_ascii=False)
+            json.dump(saved, f, indent=4, ensure_ascii=False)
         logger.info(f"✔ 결과 저장 완료: {output_path}")
 
+def _refine(
+    places: List[Dict[str, Any]],
+    windows: List[Tuple[int, int, Any]],
+    user: Dict[str, Any],
+    day_info: Dict[str, Any],
+    day_matrices,
+    initial_order: List[str],
+    options: Dict[str, Any],
+    output_path: Optional[str]
+) -> Dict[str, Any]:
+    """미리보기 경로를 초기해로 단일 모델(solve_meal_model)을 풀어 최종 결과를 만든다"""
+    results = solve_meal_model(
+        places, windows, user, day_info, day_matrices, initial_order=initial_order, **options
+    )
+    ranked = rank_results(results)
+    best = ranked[0][1] if ranked else None
+    output_data = {
+        "visits": best.get("visits", []) if best else [],
+        "path":   best.get("path", []) if best else []
+    }
+    _save_output(output_data, output_path)
     return output_data
+
+def schedule_trip_preview(
+    data: Dict[str, Any],
+    use_mock: bool = False,
+    mock_raw_path: Optional[str] = None,
+    output_path: Optional[str] = None,
+    profile: Optional[str] = None,
+    deadline_sec: Optional[float] = None,
+    on_refined: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Tuple[Dict[str, Any], "Future[Dict[str, Any]]"]:
+    """
+    지도 미리보기용: 휴리스틱(run_heuristic) 결과를 바로 반환하고,
+    OR-Tools 보정은 백그라운드 프로세스에서 미리보기 경로를 초기해로 실행한다.
+    - return: ({"visits", "path", "preview": True}, 보정 결과 {"visits", "path"}의 Future)
+    - on_refined: 보정이 끝나면 결과 dict로 호출 (output_path가 있으면 보정 결과를 저장)
+    """
+    started = time.perf_counter()
+    places, user, day_info = data["places"], data["user"], data["day_info"]
+
+    places, _ = filter_closed_places(places, day_info)
+    eff_windows_map = calculate_effective_time_windows(places, user)
+    new_places, new_windows = split_restaurant_nodes(places, eff_windows_map)
+    day_matrices = build_day_matrices(
+        new_places, use_mock=use_mock, mock_raw_path=mock_raw_path, windows=new_windows
+    )
+
+    # 1. 휴리스틱 미리보기 (식당 후보 전체를 한 번에)
+    sel_places, sel_windows, _ = build_selection_inputs(
+        new_places, new_windows, all_meal_nodes(new_places, new_windows)
+    )
+    visits, _, full_path = run_heuristic(
+        sel_places, sel_windows, user, day_info,
+        use_mock=use_mock, mock_raw_path=mock_raw_path, matrices=day_matrices
+    )
+    preview = {"visits": visits, "path": full_path, "preview": True}
+    logger.info("미리보기 경로 생성: %.1fms", (time.perf_counter() - started) * 1000)
+
+    # 2. OR-Tools 보정 (백그라운드)
+    future = _refine_executor().submit(
+        _refine, new_places, new_windows, user, day_info,
+        day_matrices.subset(new_places),
+        [visit["place"] for visit in visits],
+        {
+            "use_mock": use_mock,
+            "mock_raw_path": mock_raw_path,
+            "profile": profile,
+            "deadline_sec": deadline_sec,
+        },
+        output_path
+    )
+    if on_refined is not None:
+        def notify(done: Future):
+            if done.exception() is None:
+                on_refined(done.result())
+            else:
+                logger.error("✖ 백그라운드 보정 실패: %s", done.exception())
+        future.add_done_callback(notify)
+    return preview, future
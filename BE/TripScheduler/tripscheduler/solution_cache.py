@@ -0,0 +1,164 @@
+import os
+import json
+import pickle
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from tripscheduler.core.routing.profiles import get_profile
+
+logger = logging.getLogger(__name__)
+
+# SOLUTION_CACHE_PATH만 설정했을 때 메모리 LRU 크기
+DEFAULT_MAX_ENTRIES = 256
+
+Solution = Tuple[List[Dict[str, Any]], Any, Any]
+
+def canonical_problem_key(
+    places: List[Dict[str, Any]],
+    windows: List[Tuple[int, int, Any]],
+    time_matrix: List[List[int]],
+    start_idx: int,
+    end_idx: int,
+    global_start: int,
+    global_end: int,
+    profile: Optional[str],
+    path_tolerance_m: float = 0.0,
+    path_format: str = "coords"
+) -> str:
+    """
+    run_scheduler 입력을 정규화해 sha256 키로 만든다.
+    장소 id·이름·카테고리·필수 여부·서비스 시간·좌표, 윈도우, 시작/종료 노드, 전역 시간,
+    이동 시간 매트릭스와 solver 프로파일·경로 출력 옵션이 같으면 같은 문제로 본다.
+    경로(path_matrix)는 장소 좌표와 매트릭스 백엔드로 정해지므로 키에 넣지 않는다
+    (카탈로그/fixture의 지연 경로를 키 계산만을 위해 읽지 않도록).
+    """
+    h = hashlib.sha256()
+    header = {
+        "places": [
+            [str(p.get("id")), str(p.get("org_id", "")), p["name"], p.get("category"),
+             p.get("is_mandatory", True), p.get("service_time", 0), p.get("x_cord"), p.get("y_cord")]
+            for p in places
+        ],
+        "windows": [[o, c, tag] for o, c, tag in windows],
+        "depots": [start_idx, end_idx],
+        "global": [global_start, global_end],
+        "profile": get_profile(profile).name,
+        "path": [path_tolerance_m, path_format],
+    }
+    h.update(json.dumps(header, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"))
+    h.update(np.ascontiguousarray(time_matrix, dtype=np.int64).tobytes())
+    return h.hexdigest()
+
+class SolutionCache:
+    """
+    정규화된 문제 키 → (visits, objective, full_path) 캐시.
+    - 메모리: 최대 max_entries개 LRU
+    - path가 있으면 SQLite 디스크 계층을 함께 사용 (메모리에서 밀려나거나 프로세스가 바뀌어도 재사용)
+    값은 pickle 바이트로 보관해 꺼낼 때마다 독립된 사본을 돌려준다.
+    SQLite 연결은 처음 쓸 때 프로세스마다 새로 연다 (fork된 워커가 부모 연결을 공유하지 않도록).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """현재 프로세스의 SQLite 연결 (path가 없으면 None). self._lock 안에서 호출"""
+        if not self.path:
+            return None
+        if self._conn is None or self._conn_pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn_pid = os.getpid()
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS solutions ("
+                " key TEXT PRIMARY KEY,"
+                " payload BLOB NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key: str, payload: bytes) -> None:
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Solution]:
+        """캐시된 해를 반환. 메모리에 없으면 디스크 계층을 확인하고 메모리로 올린다"""
+        with self._lock:
+            payload = self._memory.get(key)
+            conn = self._connection() if payload is None else None
+            if payload is not None:
+                self._memory.move_to_end(key)
+            elif conn is not None:
+                row = conn.execute("SELECT payload FROM solutions WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    payload = row[0]
+                    self._remember(key, payload)
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return pickle.loads(payload)
+
+    def put(self, key: str, solution: Solution) -> None:
+        """해를 찾은 결과(objective가 있는 경우)만 저장"""
+        if solution[1] is None:
+            return
+        payload = pickle.dumps(solution, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, payload)
+            conn = self._connection()
+            if conn is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO solutions (key, payload) VALUES (?, ?)", (key, payload)
+                )
+                conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._memory)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            conn = self._connection()
+            if conn is not None:
+                conn.execute("DELETE FROM solutions")
+                conn.commit()
+
+_default_cache: Optional[SolutionCache] = None
+
+def load_solution_cache_from_env() -> Optional[SolutionCache]:
+    """
+    프로세스 공용 SolutionCache. 둘 다 설정하지 않으면 캐시를 쓰지 않는다 (None).
+    - SOLUTION_CACHE_MAX_ENTRIES: 메모리 LRU 크기 (0이면 캐시 사용 안 함)
+    - SOLUTION_CACHE_PATH: 있으면 SQLite 디스크 계층 사용 (크기 미설정 시 256)
+    """
+    global _default_cache
+    cap = os.environ.get("SOLUTION_CACHE_MAX_ENTRIES")
+    if not cap and not os.environ.get("SOLUTION_CACHE_PATH"):
+        return None
+    max_entries = int(cap) if cap else DEFAULT_MAX_ENTRIES
+    if max_entries <= 0:
+        return None
+    path = os.environ.get("SOLUTION_CACHE_PATH") or None
+    if _default_cache is None or _default_cache.path != path or _default_cache.max_entries != max_entries:
+        _default_cache = SolutionCache(max_entries, path)
+        if path:
+            logger.info("해 캐시 디스크 계층 사용: %s", path)
+    return _default_cache
@@ -0,0 +1,91 @@
+import math
+import numpy as np
+from typing import List, Optional, Sequence, Union
+
+PATH_FORMATS = ("coords", "polyline")
+
+# 위도 1도 ≒ 111,320m
+METERS_PER_DEGREE = 111_320.0
+
+def to_path_array(path: Optional[Sequence[Sequence[float]]]) -> Optional[np.ndarray]:
+    """[[x, y], ...] 경로를 (k, 2) float32 배열로 변환. 비어 있으면 None"""
+    if path is None or len(path) == 0:
+        return None
+    return np.asarray(path, dtype=np.float32).reshape(-1, 2)
+
+def simplify_path(points: np.ndarray, tolerance_m: float) -> np.ndarray:
+    """
+    Douglas–Peucker 단순화.
+    경도/위도 좌표를 중심 위도 기준 평면(m)으로 근사해 tolerance_m 이내의 점을 제거한다.
+    """
+    if tolerance_m <= 0 or len(points) < 3:
+        return points
+
+    lat0 = math.radians(float(np.mean(points[:, 1])))
+    xy = np.column_stack((
+        points[:, 0].astype(np.float64) * METERS_PER_DEGREE * math.cos(lat0),
+        points[:, 1].astype(np.float64) * METERS_PER_DEGREE,
+    ))
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        a, b = xy[first], xy[last]
+        seg = b - a
+        inner = xy[first + 1:last]
+        seg_len = math.hypot(seg[0], seg[1])
+        if seg_len == 0:
+            dists = np.hypot(inner[:, 0] - a[0], inner[:, 1] - a[1])
+        else:
+            dists = np.abs(seg[0] * (inner[:, 1] - a[1]) - seg[1] * (inner[:, 0] - a[0])) / seg_len
+        k = int(np.argmax(dists))
+        if dists[k] > tolerance_m:
+            mid = first + 1 + k
+            keep[mid] = True
+            stack.append((first, mid))
+            stack.append((mid, last))
+    return points[keep]
+
+def encode_polyline(points: np.ndarray, precision: int = 5) -> str:
+    """
+    Google Encoded Polyline 문자열로 인코딩.
+    입력은 [x(경도), y(위도)] 순서이며, 인코딩은 표준대로 (위도, 경도) 순서를 따른다.
+    """
+    factor = 10 ** precision
+    scaled = np.rint(np.asarray(points, dtype=np.float64)[:, ::-1] * factor).astype(np.int64)
+    deltas = np.diff(scaled, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+
+    chunks = []
+    for value in deltas.ravel().tolist():
+        value = ~(value << 1) if value < 0 else value << 1
+        while value >= 0x20:
+            chunks.append(chr((0x20 | (value & 0x1f)) + 63))
+            value >>= 5
+        chunks.append(chr(value + 63))
+    return "".join(chunks)
+
+def format_path(
+    segments: List[np.ndarray],
+    tolerance_m: float = 0.0,
+    path_format: str = "coords"
+) -> Union[List[List[List[float]]], List[str]]:
+    """
+    구간별 좌표 배열을 응답 형식으로 변환.
+    - coords: [[[x, y], ...], ...]
+    - polyline: 구간별 Encoded Polyline 문자열 리스트
+    """
+    if path_format not in PATH_FORMATS:
+        raise ValueError(f"지원하지 않는 경로 형식입니다: {path_format}")
+
+    formatted = []
+    for seg in segments:
+        seg = simplify_path(np.asarray(seg, dtype=np.float32).reshape(-1, 2), tolerance_m)
+        if path_format == "polyline":
+            formatted.append(encode_polyline(seg))
+        else:
+            formatted.append(np.round(seg.astype(np.float64), 5).tolist())
+    return formatted
@@ -0,0 +1,87 @@
+import time
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+Span = Dict[str, Any]
+
+class MetricsHook:
+    """
+    단계별 소요 시간을 받는 훅. 기본 구현은 아무것도 하지 않는다.
+    외부 모니터링(StatsD, Prometheus 등)에 보내려면 상속해 record를 구현하고 set_metrics_hook으로 등록.
+    """
+
+    def record(self, name: str, seconds: float, attrs: Dict[str, Any]) -> None:
+        pass
+
+_NOOP = MetricsHook()
+_hook: MetricsHook = _NOOP
+
+# 현재 수집 중인 span 목록 (collect_spans 안에서만 설정됨)
+_collector: ContextVar[Optional[List[Span]]] = ContextVar("tripscheduler_spans", default=None)
+
+def set_metrics_hook(hook: Optional[MetricsHook]) -> None:
+    """프로세스 공용 훅 등록. None이면 no-op으로 되돌린다"""
+    global _hook
+    _hook = hook if hook is not None else _NOOP
+
+def get_metrics_hook() -> MetricsHook:
+    return _hook
+
+@contextmanager
+def collect_spans() -> Iterator[List[Span]]:
+    """블록 안에서 기록된 span을 [{"name", "ms", ...attrs}] 리스트로 모은다 (중첩 시 가장 안쪽 블록에 기록)"""
+    spans: List[Span] = []
+    token = _collector.set(spans)
+    try:
+        yield spans
+    finally:
+        _collector.reset(token)
+
+def merge_spans(spans: Optional[List[Span]], from_worker: bool = False) -> None:
+    """
+    다른 실행 단위에서 모은 span을 현재 수집 목록에 합친다.
+    from_worker=True(워커 프로세스에서 기록된 span)이면 이 프로세스의 훅에도 전달한다.
+    같은 프로세스에서 기록된 span은 기록 시점에 이미 훅으로 보냈으므로 다시 보내지 않는다.
+    """
+    if not spans:
+        return
+    collector = _collector.get()
+    if collector is not None:
+        collector.extend(spans)
+    if from_worker and _hook is not _NOOP:
+        for entry in spans:
+            attrs = {k: v for k, v in entry.items() if k not in ("name", "ms")}
+            _hook.record(entry["name"], entry["ms"] / 1000, attrs)
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Dict[str, Any]]:
+    """
+    name 단계의 소요 시간을 기록. yield한 dict에 값을 넣으면 span 속성으로 함께 남는다.
+    수집 목록도 훅도 없으면 시간을 재지 않는다.
+    """
+    collector = _collector.get()
+    hook = _hook
+    if collector is None and hook is _NOOP:
+        yield attrs
+        return
+
+    started = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        seconds = time.perf_counter() - started
+        if collector is not None:
+            collector.append({"name": name, "ms": round(seconds * 1000, 3), **attrs})
+        hook.record(name, seconds, attrs)
+
+def timed(name: str):
+    """함수 전체를 span(name)으로 감싸는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
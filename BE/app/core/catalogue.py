@@ -0,0 +1,31 @@
+#core/catalogue.py
+# 카탈로그 이동 시간 배치(tripscheduler.api.catalogue)의 입력 JSON을 DB에서 추출
+# 사용법: python -m app.core.catalogue catalogue_places.json
+import sys
+import json
+from typing import Any, Dict, List
+from sqlalchemy.orm import Session
+
+from app.routers._utils import to_float
+from app.routers.schedules import MODEL_INFO
+
+def export_catalogue_places(db: Session) -> List[Dict[str, Any]]:
+    """좌표가 있는 전체 카탈로그 장소를 {category, id, x_cord, y_cord} 리스트로 반환 (category는 테이블 구분)"""
+    places = []
+    for div, (Model, id_field) in MODEL_INFO.items():
+        for row in db.query(Model).all():
+            x = to_float(row.x_cord); y = to_float(row.y_cord)
+            if x is None or y is None:
+                continue
+            places.append({"category": div, "id": getattr(row, id_field), "x_cord": x, "y_cord": y})
+    return places
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        with open(sys.argv[1], "w", encoding="utf-8") as f:
+            json.dump(export_catalogue_places(db), f, ensure_ascii=False)
+    finally:
+        db.close()